@@ -0,0 +1,55 @@
+"""Measure the overhead of the client itself (request building, JSON
+serialization, validation and dispatch) with a transport that answers from
+memory instead of the network.
+
+Run from the repository root: python -m benchmarks.client_overhead_benchmark
+"""
+import json
+import timeit
+from decimal import Decimal
+from uuid import uuid4
+
+from servicing import ServicingClient
+from servicing.web.classes.money import Money
+from servicing.web.classes.payment import Payment
+from servicing.web.transport import InMemoryTransport
+
+LOAN = json.dumps(
+    {
+        "loan_id": str(uuid4()),
+        "annual_rate": 0.0475,
+        "commitment": {"amount": "1000000", "currency": "USD"},
+        "origination_date": "2020-05-27",
+        "periods": {"count": 120, "frequency": "MONTHLY"},
+        "is_void": False,
+    }
+).encode("utf-8")
+
+
+def main(number: int = 20_000):
+    client = ServicingClient(transport=InMemoryTransport(body=LOAN), retry_policy=None)
+    loan_id = uuid4()
+    payment = Payment(date="2020-05-28", amount=Money(amount=Decimal("5000.00")))
+    cases = {
+        "loan.get": lambda: client.loan.get(loan_id=loan_id),
+        "loan.get + validate": lambda: client.loan.get(loan_id=loan_id).validate(),
+        "create_payment": lambda: client.loan.create_payment(
+            loan_id=loan_id, payment=payment
+        ),
+    }
+    print(f"{'call':<20} {'us/call':>8} {'calls/s':>10}")
+    for name, call in cases.items():
+        elapsed = timeit.timeit(call, number=number) / number
+        print(f"{name:<20} {elapsed * 1e6:>8.1f} {1 / elapsed:>10.0f}")
+
+    batch = [{"loan_id": uuid4()} for _ in range(number)]
+    elapsed = timeit.timeit(
+        lambda: list(client.batch(client.loan.get, batch, validate=True)), number=1
+    )
+    print(
+        f"{'batch(loan.get)':<20} {elapsed / number * 1e6:>8.1f} {number / elapsed:>10.0f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
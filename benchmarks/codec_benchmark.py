@@ -0,0 +1,50 @@
+"""Compare the JSON codecs available to BaseClient.
+
+Run from the repository root: python -m benchmarks.codec_benchmark
+"""
+import timeit
+from decimal import Decimal
+from uuid import uuid4
+
+from servicing.errors import ServicingClientError
+from servicing.web.codec import CODECS, get_codec
+
+PAYMENTS = [
+    {
+        "loan_id": uuid4(),
+        "date": "2020-05-28",
+        "amount": {"amount": Decimal("5000.00"), "currency": "USD"},
+    }
+    for _ in range(10_000)
+]
+
+LOANS = get_codec("json").dumps(
+    [
+        {
+            "loan_id": str(uuid4()),
+            "annual_rate": 0.0475,
+            "commitment": {"amount": "1000000", "currency": "USD"},
+            "origination_date": "2020-05-27",
+            "periods": {"count": 120, "frequency": "MONTHLY"},
+            "is_void": False,
+        }
+        for _ in range(10_000)
+    ]
+)
+
+
+def main(number: int = 20):
+    print(f"{'codec':<8} {'encode (ms)':>12} {'decode (ms)':>12}")
+    for name in CODECS:
+        try:
+            codec = get_codec(name)
+        except ServicingClientError:
+            print(f"{name:<8} {'not installed':>12}")
+            continue
+        encode = timeit.timeit(lambda: codec.dumps(PAYMENTS), number=number) / number
+        decode = timeit.timeit(lambda: codec.loads(LOANS), number=number) / number
+        print(f"{name:<8} {encode * 1000:>12.2f} {decode * 1000:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Measure the memory taken by model instances with __slots__, against the
+same classes with a per-instance __dict__ as they were before.
+
+Run from the repository root: python -m benchmarks.memory_benchmark
+"""
+import gc
+import tracemalloc
+from uuid import uuid4
+
+from servicing.web.classes.draw import Draw
+from servicing.web.classes.enums import Compounding, DayCount, Frequency
+from servicing.web.classes.institution import Address, Institution
+from servicing.web.classes.loan import FixedPayment, Loan, Periods
+from servicing.web.classes.money import Money
+from servicing.web.classes.payment import Payment
+from servicing.web.classes.user import User
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+CLASSES = (
+    Address,
+    Draw,
+    FixedPayment,
+    Institution,
+    Loan,
+    Money,
+    Payment,
+    Periods,
+    User,
+)
+
+
+def with_dict(cls: type) -> type:
+    """The same model with a per-instance __dict__ instead of __slots__."""
+    return type(cls.__name__, (), {"__init__": cls.__init__})
+
+
+def factories(c: dict) -> dict:
+    """Functions creating each model (and its nested models) from classes `c`."""
+    return {
+        "Money": lambda: c["Money"]("5000.00"),
+        "Payment": lambda: c["Payment"](
+            date="2020-05-28", amount=c["Money"]("5000.00")
+        ),
+        "Draw": lambda: c["Draw"](date="2020-05-28", amount=c["Money"]("250000.00")),
+        "Periods": lambda: c["Periods"](count=120, frequency=Frequency.MONTHLY),
+        "Loan": lambda: c["Loan"](
+            agent_id=uuid4(),
+            borrower_id=uuid4(),
+            lender_id=uuid4(),
+            annual_rate=0.0475,
+            commitment=c["Money"]("1000000"),
+            compounding=Compounding.SIMPLE,
+            day_count=DayCount.ACTUAL_360,
+            fixed_payment=c["FixedPayment"](amount=c["Money"]("10000")),
+            origination_date="2020-05-27",
+            periods=c["Periods"](count=120, frequency=Frequency.MONTHLY),
+            time_zone_id="America/New_York",
+        ),
+        "Institution": lambda: c["Institution"](
+            name="LoanStreet",
+            address=c["Address"](
+                street_one="1 Main St", street_two="", city="NY", state="NY", zip="1"
+            ),
+        ),
+        "User": lambda: c["User"](institution_id=uuid4(), email="a@b.c"),
+    }
+
+
+def traced_bytes(factory, n: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    instances = [factory() for _ in range(n)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del instances
+    return size / n
+
+
+def rss_bytes(factory, n: int) -> float:
+    gc.collect()
+    process = psutil.Process()
+    before = process.memory_info().rss
+    instances = [factory() for _ in range(n)]
+    size = process.memory_info().rss - before
+    del instances
+    return size / n
+
+
+def main(n: int = 100_000):
+    slotted = factories({cls.__name__: cls for cls in CLASSES})
+    unslotted = factories({cls.__name__: with_dict(cls) for cls in CLASSES})
+
+    print("bytes per instance, nested models included (tracemalloc)")
+    print(f"{'model':<12} {'__dict__':>9} {'__slots__':>10} {'saved':>7}")
+    for name in slotted:
+        before = traced_bytes(unslotted[name], n)
+        after = traced_bytes(slotted[name], n)
+        print(f"{name:<12} {before:>9.0f} {after:>10.0f} {1 - after / before:>7.0%}")
+
+    if psutil is not None:
+        count = 10 * n
+        before = rss_bytes(unslotted["Payment"], count)
+        after = rss_bytes(slotted["Payment"], count)
+        print(
+            f"\nRSS per Payment over {count} payments (psutil): {before:.0f} -> {after:.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Compare JsonObject.to_dict with the reflective implementation it replaced,
+which looked up the validators with dir() and getattr() on every call, both
+with its cache dropped before every call (compiled) and served from it
+(cached), and time the cached JSON encoding that the client sends.
+
+Run from the repository root: python -m benchmarks.model_benchmark
+"""
+import timeit
+from uuid import uuid4
+
+from servicing.web.classes import JsonObject
+from servicing.web.classes.draw import Draw
+from servicing.web.classes.enums import Compounding, DayCount, Frequency
+from servicing.web.classes.loan import FixedPayment, Loan, Periods
+from servicing.web.classes.money import Money
+from servicing.web.classes.payment import Payment
+
+
+def reflective_to_dict(obj) -> dict:
+    for attribute in (func for func in dir(obj) if not func.startswith("__")):
+        method = getattr(obj, attribute, None)
+        if callable(method) and hasattr(method, "validator"):
+            method()
+
+    def to_dict_compatible(value):
+        if isinstance(value, list):
+            return [to_dict_compatible(v) for v in value]
+        if callable(getattr(value, "to_dict", None)):
+            return {
+                k: to_dict_compatible(v) for k, v in reflective_to_dict(value).items()
+            }
+        return value
+
+    def is_not_empty(key: str) -> bool:
+        value = getattr(obj, key, None)
+        if value is None:
+            return False
+        if getattr(value, "__len__", None) is not None:
+            return len(value) > 0
+        return True
+
+    return {
+        key: to_dict_compatible(getattr(obj, key, None))
+        for key in sorted(obj.attributes)
+        if is_not_empty(key)
+    }
+
+
+def invalidate(obj: JsonObject) -> None:
+    """Drop the cache of `obj` and of every object nested in it."""
+    object.__setattr__(obj, "_cache", None)
+    for key in obj._fields:
+        value = getattr(obj, key, None)
+        if isinstance(value, JsonObject):
+            invalidate(value)
+
+
+def uncached_to_dict(obj: JsonObject) -> dict:
+    invalidate(obj)
+    return obj.to_dict()
+
+
+MODELS = {
+    "Payment": Payment(date="2020-05-28", amount=Money("5000.00")),
+    "Draw": Draw(date="2020-05-28", amount=Money("250000.00")),
+    "Loan": Loan(
+        agent_id=uuid4(),
+        borrower_id=uuid4(),
+        lender_id=uuid4(),
+        annual_rate=0.0475,
+        commitment=Money("1000000"),
+        compounding=Compounding.SIMPLE,
+        day_count=DayCount.ACTUAL_360,
+        fixed_payment=FixedPayment(amount=Money("10000")),
+        origination_date="2020-05-27",
+        periods=Periods(count=120, frequency=Frequency.MONTHLY),
+        time_zone_id="America/New_York",
+    ),
+}
+
+
+def main(number: int = 100_000):
+    print(
+        f"{'model':<8} {'reflective (us)':>16} {'compiled (us)':>14} {'speedup':>8} "
+        f"{'cached (us)':>12} {'to_json (us)':>13}"
+    )
+    for name, model in MODELS.items():
+        assert reflective_to_dict(model) == uncached_to_dict(model)
+        before = timeit.timeit(lambda: reflective_to_dict(model), number=number)
+        after = timeit.timeit(lambda: uncached_to_dict(model), number=number)
+        cached = timeit.timeit(model.to_dict, number=number)
+        encode = timeit.timeit(model.to_json, number=number)
+        print(
+            f"{name:<8} {before / number * 1e6:>16.2f} {after / number * 1e6:>14.2f} "
+            f"{before / after:>7.1f}x {cached / number * 1e6:>12.2f} "
+            f"{encode / number * 1e6:>13.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
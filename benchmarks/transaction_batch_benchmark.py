@@ -0,0 +1,63 @@
+"""Compare checking and building the request bodies of many payments from
+columns with PaymentBatch against creating a Payment per row.
+
+Run from the repository root: python -m benchmarks.transaction_batch_benchmark
+"""
+import time
+from datetime import date, timedelta
+from uuid import uuid4
+
+import numpy as np
+
+from servicing.web.classes.money import Money
+from servicing.web.classes.payment import Payment
+from servicing.web.classes.transaction_batch import PaymentBatch
+
+ROWS = 200_000
+
+
+def columns():
+    loan_ids = np.array([str(uuid4()) for _ in range(ROWS)])
+    start = date(2020, 1, 1)
+    dates = np.array(
+        [(start + timedelta(days=i % 365)).isoformat() for i in range(ROWS)]
+    )
+    amounts = np.round(np.random.default_rng(0).uniform(1, 10_000, ROWS), 2)
+    return loan_ids, dates, amounts
+
+
+def with_objects(loan_ids, dates, amounts) -> int:
+    bodies = 0
+    for loan_id, d, amount in zip(loan_ids, dates, amounts.tolist()):
+        payment = Payment(date=str(d), amount=Money(f"{amount:.2f}"))
+        payment.to_dict()
+        bodies += 1
+    return bodies
+
+
+def with_batch(loan_ids, dates, amounts) -> int:
+    batch = PaymentBatch(loan_ids=loan_ids, dates=dates, amounts=amounts)
+    return sum(1 for _ in batch.calls())
+
+
+def timed(func, *args) -> float:
+    started = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - started
+
+
+def main():
+    loan_ids, dates, amounts = columns()
+    before = timed(with_objects, loan_ids, dates, amounts)
+    after = timed(with_batch, loan_ids, dates, amounts)
+    checks = timed(
+        lambda: PaymentBatch(loan_ids=loan_ids, dates=dates, amounts=amounts)
+    )
+    print(f"{ROWS} payments")
+    print(f"{'Payment objects (ms)':>21} {'PaymentBatch (ms)':>18} {'speedup':>8}")
+    print(f"{before * 1000:>21.0f} {after * 1000:>18.0f} {before / after:>7.1f}x")
+    print(f"of which checking the columns: {checks * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
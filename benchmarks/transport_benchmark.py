@@ -0,0 +1,105 @@
+"""Compare the pooled HTTP/1.1 connections with the HTTP/2 transport on a
+high fan-out batch of loan.get calls against local servers that answer after
+a simulated latency.
+
+Run from the repository root: python -m benchmarks.transport_benchmark
+"""
+import json
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from uuid import uuid4
+
+from servicing import ServicingClient
+from servicing.errors import ServicingClientError
+
+try:
+    from servicing.web.http2 import Http2Transport
+    from tests.web.mock_http2_server import Http2Server
+except ImportError:
+    Http2Server = None
+
+CALLS = 2000
+MAX_WORKERS = 64
+LATENCY = 0.005
+
+
+class Http11Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        time.sleep(LATENCY)
+        body = json.dumps({"method": "GET", "path": self.path}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class Http11Server(socketserver.ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), Http11Handler)
+        self.connections = 0
+        self.url = f"http://127.0.0.1:{self.server_address[1]}"
+
+
+def run(name: str, client: ServicingClient, server) -> None:
+    calls = [{"loan_id": uuid4()} for _ in range(CALLS)]
+    started = time.perf_counter()
+    ok = sum(
+        result.ok for result in client.batch(client.loan.get, calls, validate=True)
+    )
+    elapsed = time.perf_counter() - started
+    client.close()
+    print(
+        f"{name:<10} {elapsed * 1000:>10.0f} {CALLS / elapsed:>10.0f} "
+        f"{server.connections:>12} {ok:>6}"
+    )
+
+
+def main():
+    print(
+        f"{CALLS} loan.get calls, {MAX_WORKERS} workers, {LATENCY * 1000:.0f}ms latency"
+    )
+    print(
+        f"{'transport':<10} {'time (ms)':>10} {'calls/s':>10} {'connections':>12} {'ok':>6}"
+    )
+
+    server = Http11Server()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    run(
+        "HTTP/1.1",
+        ServicingClient(base_url=server.url, max_workers=MAX_WORKERS),
+        server,
+    )
+    server.shutdown()
+    server.server_close()
+
+    if Http2Server is None:
+        print(f"{'HTTP/2':<10} {'h2 is not installed':>10}")
+        return
+    with Http2Server(delay=LATENCY) as server:
+        try:
+            client = ServicingClient(
+                base_url=server.url, max_workers=MAX_WORKERS, transport=Http2Transport()
+            )
+        except ServicingClientError as e:
+            print(f"{'HTTP/2':<10} {e}")
+            return
+        run("HTTP/2", client, server)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,5 +2,6 @@ import logging
 from logging import NullHandler
 
 from .web.client import ServicingClient  # noqa
+from .web.async_client import AsyncServicingClient  # noqa
 
 logging.getLogger(__name__).addHandler(NullHandler())
@@ -24,5 +24,38 @@ class ServicingObjectFormationError(ServicingClientError):
     pass
 
 
+class ServicingBatchFormationError(ServicingObjectFormationError):
+    """Error raised when rows of a transaction batch are not valid; `errors`
+    lists the messages of each invalid row by index."""
+
+    def __init__(self, errors):
+        self.errors = errors
+        rows = "; ".join(
+            f"row {i}: {', '.join(messages)}"
+            for i, messages in sorted(errors.items())[:5]
+        )
+        more = f" (and {len(errors) - 5} more)" if len(errors) > 5 else ""
+        super().__init__(f"{len(errors)} invalid rows: {rows}{more}")
+
+
 class ServicingInvalidPathParamError(ServicingClientError):
     pass
+
+
+class ServicingCircuitOpenError(ServicingClientError):
+    """Error raised without sending a request while the circuit breaker for its
+    endpoint family is open."""
+
+    def __init__(self, endpoint: str, retry_after: float):
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+        super().__init__(
+            f"Circuit for {endpoint} is open; "
+            f"requests are refused for another {retry_after:.1f}s"
+        )
+
+
+class ServicingTimeoutError(ServicingClientError):
+    """Error raised when the deadline of a call passes before it completed."""
+
+    pass
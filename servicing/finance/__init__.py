@@ -0,0 +1,3 @@
+from .business_day_calendar import BusinessDayCalendar  # noqa
+from .rate_store import BenchmarkRateStore, RateSeries  # noqa
+from .curve import Curve, CurveCache  # noqa
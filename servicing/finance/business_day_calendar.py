@@ -0,0 +1,239 @@
+import json
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from typing import Any, Iterable, List, Union
+
+from ..errors import ServicingClientError
+from ..util import parse_date
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+DateLike = Union[date, str]
+
+# date(1970, 1, 1).toordinal(), the ordinal of datetime64[D] zero
+_EPOCH_ORDINAL = 719163
+
+
+class BusinessDayCalendar:
+    """Answers business-day questions locally for a range of dates.
+
+    The business days are kept as a sorted array of date ordinals, so every
+    lookup is a binary search. Like the API, `next_business_day` and
+    `previous_business_day` return the date itself when it is a business day.
+
+    The `*_array` methods take many dates at once (dates, ISO strings or a
+    NumPy datetime64 array) and return NumPy arrays when NumPy is installed,
+    lists otherwise.
+    """
+
+    def __init__(
+        self, business_days: Iterable[DateLike], *, start: DateLike, end: DateLike
+    ):
+        """
+        Args:
+            business_days: The business days between `start` and `end`
+            start: The first date the calendar knows about
+            end: The last date the calendar knows about
+        """
+        self.start = parse_date(start)
+        self.end = parse_date(end)
+        lo, hi = self.start.toordinal(), self.end.toordinal()
+        ordinals = {parse_date(d).toordinal() for d in business_days}
+        self._days = array("i", sorted(o for o in ordinals if lo <= o <= hi))
+        self._array = None
+
+    @classmethod
+    def from_holidays(
+        cls,
+        holidays: Iterable[DateLike],
+        *,
+        start: DateLike,
+        end: DateLike,
+        weekend: Iterable[int] = (5, 6),
+    ) -> "BusinessDayCalendar":
+        """
+        Args:
+            holidays: Dates that are not business days besides the weekends
+            weekend: Weekdays that are never business days (Monday is 0)
+        """
+        start, end = parse_date(start), parse_date(end)
+        closed = {parse_date(d) for d in holidays}
+        weekend = frozenset(weekend)
+        return cls(
+            (
+                d
+                for d in cls._dates(start, end)
+                if d.weekday() not in weekend and d not in closed
+            ),
+            start=start,
+            end=end,
+        )
+
+    @classmethod
+    def from_file(cls, path: str) -> "BusinessDayCalendar":
+        """Load a holiday table written by `to_file`."""
+        with open(path) as f:
+            table = json.load(f)
+        return cls.from_holidays(
+            table["holidays"],
+            start=table["start"],
+            end=table["end"],
+            weekend=table.get("weekend", (5, 6)),
+        )
+
+    def to_file(self, path: str) -> None:
+        """Export the calendar as a holiday table (weekends are Saturday and
+        Sunday)."""
+        business = set(self._days)
+        holidays = [
+            d.isoformat()
+            for d in self._dates(self.start, self.end)
+            if d.weekday() < 5 and d.toordinal() not in business
+        ]
+        table = {
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "weekend": [5, 6],
+            "holidays": holidays,
+        }
+        with open(path, "w") as f:
+            json.dump(table, f, indent=2)
+
+    @classmethod
+    def from_client(cls, client, *, start: DateLike, end: DateLike):
+        """
+        Load the calendar from the API with one `next_business_day` lookup per
+        date, run concurrently through `client.batch`.
+
+        Args:
+            client: A ServicingClient
+        """
+        start, end = parse_date(start), parse_date(end)
+        calls = [{"date": d.isoformat()} for d in cls._dates(start, end)]
+        business_days = []
+        for result in client.batch(client.next_business_day, calls, validate=True):
+            if not result.ok:
+                raise result.error
+            business_days.append(parse_date(result.response["date"]))
+        # The answer for `end` tells which days after it are business days too
+        return cls(business_days, start=start, end=max(business_days + [end]))
+
+    def __len__(self):
+        return len(self._days)
+
+    def covers(self, d: DateLike) -> bool:
+        """Whether every lookup for `d` can be answered from the calendar."""
+        ordinal = parse_date(d).toordinal()
+        return bool(self._days) and self._days[0] <= ordinal <= self._days[-1]
+
+    def is_business_day(self, d: DateLike) -> bool:
+        ordinal = self._ordinal(d)
+        i = bisect_left(self._days, ordinal)
+        return i < len(self._days) and self._days[i] == ordinal
+
+    def next_business_day(self, d: DateLike) -> date:
+        """`d` if it is a business day, else the first business day after it."""
+        i = bisect_left(self._days, self._ordinal(d))
+        return self._date_at(i, d)
+
+    def previous_business_day(self, d: DateLike) -> date:
+        """`d` if it is a business day, else the last business day before it."""
+        i = bisect_right(self._days, self._ordinal(d)) - 1
+        return self._date_at(i, d)
+
+    def add_business_days(self, d: DateLike, n: int) -> date:
+        """The date `n` business days after `d` (before it if `n` is negative);
+        with `n` = 0 the same as `next_business_day`."""
+        ordinal = self._ordinal(d)
+        if n > 0:
+            i = bisect_right(self._days, ordinal) - 1 + n
+        elif n < 0:
+            i = bisect_left(self._days, ordinal) + n
+        else:
+            i = bisect_left(self._days, ordinal)
+        return self._date_at(i, d)
+
+    def business_days(self, start: DateLike, end: DateLike) -> List[date]:
+        """The business days from `start` to `end` inclusive."""
+        lo = bisect_left(self._days, self._ordinal(start))
+        hi = bisect_right(self._days, self._ordinal(end))
+        return [date.fromordinal(o) for o in self._days[lo:hi]]
+
+    def is_business_day_array(self, dates: Iterable[DateLike]) -> Any:
+        if np is None:
+            return [self.is_business_day(d) for d in dates]
+        ordinals = self._ordinals(dates)
+        days = self._numpy_days()
+        i = np.searchsorted(days, ordinals, side="left").clip(max=len(days) - 1)
+        return days[i] == ordinals
+
+    def next_business_day_array(self, dates: Iterable[DateLike]) -> Any:
+        if np is None:
+            return [self.next_business_day(d) for d in dates]
+        ordinals = self._ordinals(dates)
+        i = np.searchsorted(self._numpy_days(), ordinals, side="left")
+        return self._dates_at(i)
+
+    def previous_business_day_array(self, dates: Iterable[DateLike]) -> Any:
+        if np is None:
+            return [self.previous_business_day(d) for d in dates]
+        ordinals = self._ordinals(dates)
+        i = np.searchsorted(self._numpy_days(), ordinals, side="right") - 1
+        return self._dates_at(i)
+
+    def add_business_days_array(self, dates: Iterable[DateLike], n: int) -> Any:
+        if np is None:
+            return [self.add_business_days(d, n) for d in dates]
+        ordinals = self._ordinals(dates)
+        days = self._numpy_days()
+        if n > 0:
+            i = np.searchsorted(days, ordinals, side="right") - 1 + n
+        else:
+            i = np.searchsorted(days, ordinals, side="left") + n
+        return self._dates_at(i)
+
+    def _ordinal(self, d: DateLike) -> int:
+        d = parse_date(d)
+        if not self.start <= d <= self.end:
+            raise ServicingClientError(
+                f"{d} is outside the calendar ({self.start} to {self.end})"
+            )
+        return d.toordinal()
+
+    def _date_at(self, i: int, d: DateLike) -> date:
+        if not 0 <= i < len(self._days):
+            raise ServicingClientError(f"The calendar cannot answer for {d}")
+        return date.fromordinal(self._days[i])
+
+    def _numpy_days(self):
+        if self._array is None:
+            self._array = np.frombuffer(self._days, dtype=np.int32).astype(np.int64)
+        return self._array
+
+    def _ordinals(self, dates: Iterable[DateLike]):
+        if not isinstance(dates, np.ndarray):
+            dates = list(dates)
+        ordinals = np.asarray(dates, dtype="datetime64[D]").astype(np.int64)
+        ordinals += _EPOCH_ORDINAL
+        if ordinals.size and (
+            ordinals.min() < self.start.toordinal()
+            or ordinals.max() > self.end.toordinal()
+        ):
+            raise ServicingClientError(
+                f"Dates outside the calendar ({self.start} to {self.end})"
+            )
+        return ordinals
+
+    def _dates_at(self, i):
+        days = self._numpy_days()
+        if i.size and (i.min() < 0 or i.max() >= len(days)):
+            raise ServicingClientError("The calendar cannot answer for every date")
+        return (days[i] - _EPOCH_ORDINAL).astype("datetime64[D]")
+
+    @staticmethod
+    def _dates(start: date, end: date) -> Iterable[date]:
+        return (start + timedelta(days=n) for n in range((end - start).days + 1))
@@ -0,0 +1,207 @@
+import math
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..errors import ServicingClientError
+from ..util import format_date, parse_date
+from ..web.classes.enums import BenchmarkName
+from .business_day_calendar import DateLike
+from .rate_store import BenchmarkRateStore
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+# Time to maturity of each tenor in years
+TENORS: Dict[BenchmarkName, float] = {
+    BenchmarkName.LIBOR_OVERNIGHT: 1 / 360,
+    BenchmarkName.LIBOR_1_WEEK: 7 / 360,
+    BenchmarkName.LIBOR_1_MONTH: 1 / 12,
+    BenchmarkName.LIBOR_2_MONTH: 2 / 12,
+    BenchmarkName.LIBOR_3_MONTH: 3 / 12,
+    BenchmarkName.LIBOR_6_MONTH: 6 / 12,
+    BenchmarkName.LIBOR_12_MONTH: 1.0,
+    BenchmarkName.US_TREASURY_OTR_1_YEAR: 1.0,
+    BenchmarkName.US_TREASURY_OTR_2_YEAR: 2.0,
+    BenchmarkName.US_TREASURY_OTR_5_YEAR: 5.0,
+    BenchmarkName.US_TREASURY_OTR_10_YEAR: 10.0,
+    BenchmarkName.US_TREASURY_OTR_30_YEAR: 30.0,
+    BenchmarkName.US_TREASURY_CMT_1_YEAR: 1.0,
+    BenchmarkName.US_TREASURY_CMT_2_YEAR: 2.0,
+    BenchmarkName.US_TREASURY_CMT_5_YEAR: 5.0,
+    BenchmarkName.US_TREASURY_CMT_7_YEAR: 7.0,
+    BenchmarkName.US_TREASURY_CMT_10_YEAR: 10.0,
+    BenchmarkName.US_TREASURY_CMT_20_YEAR: 20.0,
+    BenchmarkName.US_TREASURY_CMT_30_YEAR: 30.0,
+}
+
+# Benchmark families whose tenors make up a curve
+FAMILIES: Dict[str, Tuple[BenchmarkName, ...]] = {
+    family: tuple(b for b in TENORS if b.value.startswith(f"{family}_"))
+    for family in ("LIBOR", "US_TREASURY_OTR", "US_TREASURY_CMT")
+}
+
+INTERPOLATIONS = ("linear", "log_linear")
+
+
+class Curve:
+    """A yield curve through the fixings of one benchmark family on one date.
+
+    "linear" interpolates the rates; "log_linear" interpolates the logarithm
+    of the discount factors exp(-r * t), i.e. r * t, which keeps forward rates
+    constant between tenors. Both extrapolate flat beyond the first and last
+    tenor. `rates` and `discount_factors` evaluate many maturities at once.
+    """
+
+    def __init__(
+        self,
+        tenors: Sequence[float],
+        rates: Sequence[float],
+        *,
+        interpolation: str = "linear",
+        as_of: Optional[DateLike] = None,
+    ):
+        """
+        Args:
+            tenors: Times to maturity in years
+            rates: The rate of each tenor, continuously compounded for the
+                discount factors
+            interpolation: "linear" or "log_linear"
+            as_of: The date of the fixings
+        """
+        if interpolation not in INTERPOLATIONS:
+            raise ServicingClientError(f"Unknown interpolation: {interpolation}")
+        points = sorted(zip(tenors, rates))
+        if not points:
+            raise ServicingClientError("A curve needs at least one point")
+        self.tenors: List[float] = [float(t) for t, _ in points]
+        self.values: List[float] = [float(r) for _, r in points]
+        self.interpolation = interpolation
+        self.as_of = None if as_of is None else parse_date(as_of)
+        self._arrays = None
+
+    @classmethod
+    def from_fixings(
+        cls,
+        fixings: Dict[BenchmarkName, float],
+        *,
+        interpolation: str = "linear",
+        as_of: Optional[DateLike] = None,
+    ) -> "Curve":
+        """Build a curve from the rates of benchmarks listed in TENORS."""
+        return cls(
+            [TENORS[name] for name in fixings],
+            list(fixings.values()),
+            interpolation=interpolation,
+            as_of=as_of,
+        )
+
+    @classmethod
+    def from_client(
+        cls, client, family: str, as_of: DateLike, *, interpolation: str = "linear"
+    ) -> "Curve":
+        """Fetch the fixings of every tenor of `family` through `client.batch`."""
+        calls = [
+            {"benchmark_name": name, "date": format_date(as_of)}
+            for name in FAMILIES[family]
+        ]
+        fixings = {}
+        for result in client.batch(client.get_benchmark_rate, calls, validate=True):
+            if not result.ok:
+                raise result.error
+            fixings[result.kwargs["benchmark_name"]] = float(result.response["rate"])
+        return cls.from_fixings(fixings, interpolation=interpolation, as_of=as_of)
+
+    @classmethod
+    def from_store(
+        cls,
+        store: BenchmarkRateStore,
+        family: str,
+        as_of: DateLike,
+        *,
+        interpolation: str = "linear",
+    ) -> "Curve":
+        """Build a curve from the latest fixings on or before `as_of`."""
+        fixings = {name: store.as_of(name, as_of) for name in FAMILIES[family]}
+        return cls.from_fixings(fixings, interpolation=interpolation, as_of=as_of)
+
+    def rate(self, t: float) -> float:
+        """The interpolated rate for a maturity of `t` years."""
+        tenors, values = self.tenors, self.values
+        if t <= tenors[0]:
+            return values[0]
+        if t >= tenors[-1]:
+            return values[-1]
+        i = bisect_right(tenors, t)
+        t0, t1 = tenors[i - 1], tenors[i]
+        w = (t - t0) / (t1 - t0)
+        if self.interpolation == "linear":
+            return values[i - 1] + w * (values[i] - values[i - 1])
+        return (values[i - 1] * t0 + w * (values[i] * t1 - values[i - 1] * t0)) / t
+
+    def discount_factor(self, t: float) -> float:
+        return math.exp(-self.rate(t) * t)
+
+    def rates(self, maturities: Iterable[float]) -> Any:
+        """`rate` for many maturities; a float64 array if NumPy is installed."""
+        if np is None:
+            return [self.rate(t) for t in maturities]
+        tenors, values = self._numpy_arrays()
+        t = np.clip(np.asarray(maturities, dtype=np.float64), tenors[0], tenors[-1])
+        if self.interpolation == "linear":
+            return np.interp(t, tenors, values)
+        return np.interp(t, tenors, values * tenors) / t
+
+    def discount_factors(self, maturities: Iterable[float]) -> Any:
+        if np is None:
+            return [self.discount_factor(t) for t in maturities]
+        t = np.asarray(maturities, dtype=np.float64)
+        return np.exp(-self.rates(t) * t)
+
+    def _numpy_arrays(self):
+        if self._arrays is None:
+            self._arrays = np.array(self.tenors), np.array(self.values)
+        return self._arrays
+
+    def __repr__(self):
+        return (
+            f"<servicing.Curve: as_of={self.as_of}, "
+            f"interpolation={self.interpolation}, points={len(self.tenors)}>"
+        )
+
+
+class CurveCache:
+    """Builds curves from a BenchmarkRateStore and keeps the most recently
+    used ones, keyed by family, as-of date and interpolation."""
+
+    def __init__(self, store: BenchmarkRateStore, *, maxsize: int = 256):
+        self.store = store
+        self.maxsize = maxsize
+        self._curves: "OrderedDict[tuple, Curve]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self, family: str, as_of: DateLike, *, interpolation: str = "linear"
+    ) -> Curve:
+        key = (family, parse_date(as_of), interpolation)
+        with self._lock:
+            curve = self._curves.get(key)
+            if curve is not None:
+                self._curves.move_to_end(key)
+                return curve
+
+        curve = Curve.from_store(
+            self.store, family, key[1], interpolation=interpolation
+        )
+        with self._lock:
+            self._curves[key] = curve
+            while len(self._curves) > self.maxsize:
+                self._curves.popitem(last=False)
+        return curve
+
+    def clear(self) -> None:
+        with self._lock:
+            self._curves.clear()
@@ -0,0 +1,271 @@
+import mmap as _mmap
+import os
+import struct
+from array import array
+from bisect import bisect_right
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from ..errors import ServicingApiError, ServicingClientError
+from ..util import parse_date
+from ..web.classes.enums import BenchmarkName
+from .business_day_calendar import _EPOCH_ORDINAL, BusinessDayCalendar, DateLike
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+# magic, number of fixings; followed by the int32 ordinals and float64 rates
+_HEADER = struct.Struct("8sQ")
+_MAGIC = b"SVCRATE1"
+
+
+class RateSeries:
+    """The fixings of one benchmark as two parallel arrays: date ordinals (int32)
+    and rates (float64), sorted by date.
+
+    A series loaded with `mmap=True` reads both arrays straight from the
+    page cache, so many processes can share one copy of a large history.
+    """
+
+    def __init__(self, dates: Iterable[int] = (), rates: Iterable[float] = ()):
+        """
+        Args:
+            dates: Sorted date ordinals
+            rates: The rate fixed on each date
+        """
+        self._dates = dates if isinstance(dates, memoryview) else array("i", dates)
+        self._rates = rates if isinstance(rates, memoryview) else array("d", rates)
+        if len(self._dates) != len(self._rates):
+            raise ValueError("dates and rates must have the same length")
+
+    @classmethod
+    def from_fixings(cls, fixings: Iterable[Tuple[DateLike, float]]) -> "RateSeries":
+        by_date = {parse_date(d).toordinal(): float(r) for d, r in fixings}
+        ordinals = sorted(by_date)
+        return cls(ordinals, (by_date[o] for o in ordinals))
+
+    def __len__(self):
+        return len(self._dates)
+
+    def __contains__(self, d: DateLike) -> bool:
+        ordinal = parse_date(d).toordinal()
+        i = bisect_right(self._dates, ordinal) - 1
+        return i >= 0 and self._dates[i] == ordinal
+
+    def fixings(self) -> Iterable[Tuple[date, float]]:
+        return ((date.fromordinal(o), r) for o, r in zip(self._dates, self._rates))
+
+    def as_of(self, d: DateLike) -> float:
+        """The rate of the latest fixing on or before `d`.
+
+        Raises:
+            ServicingClientError if there is no fixing on or before `d`
+        """
+        i = bisect_right(self._dates, parse_date(d).toordinal()) - 1
+        if i < 0:
+            raise ServicingClientError(f"No fixing on or before {d}")
+        return self._rates[i]
+
+    def as_of_array(self, dates: Iterable[DateLike]) -> Any:
+        """`as_of` for many dates; a float64 array if NumPy is installed."""
+        if np is None:
+            return [self.as_of(d) for d in dates]
+        if not isinstance(dates, np.ndarray):
+            dates = list(dates)
+        ordinals = np.asarray(dates, dtype="datetime64[D]").astype(np.int64)
+        ordinals += _EPOCH_ORDINAL
+        i = np.searchsorted(self.dates_array(), ordinals, side="right") - 1
+        if i.size and i.min() < 0:
+            raise ServicingClientError("No fixing on or before some of the dates")
+        return self.rates_array()[i]
+
+    def dates_array(self):
+        """The fixing dates as ordinals, without copying (requires NumPy)."""
+        return np.frombuffer(self._dates, dtype=np.int32)
+
+    def rates_array(self):
+        """The rates, without copying (requires NumPy)."""
+        return np.frombuffer(self._rates, dtype=np.float64)
+
+    def save(self, path: str) -> None:
+        """Write the series in native byte order, replacing `path` atomically."""
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, len(self)))
+            f.write(bytes(self._dates))
+            if len(self) % 2:
+                f.write(b"\0" * 4)  # keep the float64 array 8-byte aligned
+            f.write(bytes(self._rates))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str, *, mmap: bool = False) -> "RateSeries":
+        with open(path, "rb") as f:
+            if mmap and os.fstat(f.fileno()).st_size > _HEADER.size:
+                buffer = memoryview(_mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_READ))
+            else:
+                buffer = memoryview(f.read())
+
+        magic, n = _HEADER.unpack_from(buffer)
+        if magic != _MAGIC:
+            raise ServicingClientError(f"{path} is not a rate series file")
+        dates_start, dates_end = _HEADER.size, _HEADER.size + 4 * n
+        rates_start = _HEADER.size + 4 * (n + n % 2)
+        rates_end = rates_start + 8 * n
+        dates = buffer[dates_start:dates_end]
+        rates = buffer[rates_start:rates_end]
+        if mmap:
+            return cls(dates.cast("i"), rates.cast("d"))
+        return cls(array("i", dates.tobytes()), array("d", rates.tobytes()))
+
+
+class BenchmarkRateStore:
+    """Daily benchmark fixings for whole date ranges, fetched in bulk.
+
+    `prefetch` looks up every date of a range concurrently through
+    `client.batch` and keeps one RateSeries per benchmark; `as_of` and
+    `as_of_array` then answer from memory. With a `directory` the series are
+    also saved there and loaded again by later processes, together with the
+    dates already asked for.
+    """
+
+    def __init__(self, directory: Optional[str] = None, *, mmap: bool = False):
+        """
+        Args:
+            directory: Where the series are saved, one file per benchmark
+            mmap: Memory-map the saved series instead of reading them
+        """
+        self.directory = directory
+        self.mmap = mmap
+        self._series: Dict[BenchmarkName, RateSeries] = {}
+        self._queried: Dict[BenchmarkName, Set[int]] = {}
+
+    def __getitem__(self, benchmark_name: BenchmarkName) -> RateSeries:
+        series = self._series.get(benchmark_name)
+        if series is None:
+            path = self._path(benchmark_name)
+            if path is not None and os.path.exists(path):
+                series = RateSeries.load(path, mmap=self.mmap)
+            else:
+                series = RateSeries()
+            self._series[benchmark_name] = series
+        return series
+
+    def __setitem__(self, benchmark_name: BenchmarkName, series: RateSeries):
+        self._series[benchmark_name] = series
+
+    def as_of(self, benchmark_name: BenchmarkName, d: DateLike) -> float:
+        return self[benchmark_name].as_of(d)
+
+    def as_of_array(
+        self, benchmark_name: BenchmarkName, dates: Iterable[DateLike]
+    ) -> Any:
+        return self[benchmark_name].as_of_array(dates)
+
+    def prefetch(
+        self,
+        client,
+        benchmark_names: Iterable[BenchmarkName],
+        *,
+        start: DateLike,
+        end: DateLike,
+        calendar: Optional[BusinessDayCalendar] = None,
+    ) -> int:
+        """
+        Fetch the fixings of every business day from `start` to `end` that is
+        not stored yet. Dates without a fixing of their own (a holiday, or a
+        date before the first fixing) are remembered and not asked for again.
+
+        Args:
+            client: A ServicingClient
+            benchmark_names: The benchmarks to fetch
+            calendar: Gives the business days to fetch; without it every weekday
+                is fetched
+
+        Returns:
+            The number of requests sent
+
+        Raises:
+            The error of the first request that failed with anything but a
+            404, once the fixings of the others are stored
+        """
+        start, end = parse_date(start), parse_date(end)
+        if calendar is not None:
+            days = calendar.business_days(start, end)
+        else:
+            days = (start + timedelta(days=n) for n in range((end - start).days + 1))
+            days = [d for d in days if d.weekday() < 5]
+
+        calls = [
+            {"benchmark_name": name, "date": d.isoformat()}
+            for name in benchmark_names
+            for d in days
+            if d not in self[name] and d.toordinal() not in self._queried_dates(name)
+        ]
+        fixings: Dict[BenchmarkName, list] = {}
+        queried: Dict[BenchmarkName, list] = {}
+        error = None
+        results = client.batch(
+            client.get_benchmark_rate, calls, ordered=False, validate=True
+        )
+        for result in results:
+            name = result.kwargs["benchmark_name"]
+            if result.ok:
+                # The API answers with the latest fixing on or before the date
+                data = result.response.data
+                fixings.setdefault(name, []).append((data["date"], data["rate"]))
+            elif not (
+                isinstance(result.error, ServicingApiError)
+                and result.error.response.status == 404
+            ):
+                error = error or result.error
+                continue
+            queried.setdefault(name, []).append(
+                parse_date(result.kwargs["date"]).toordinal()
+            )
+
+        for name, new in fixings.items():
+            series = RateSeries.from_fixings(list(self[name].fixings()) + new)
+            self._series[name] = series
+            path = self._path(name)
+            if path is not None:
+                os.makedirs(self.directory, exist_ok=True)
+                series.save(path)
+                if self.mmap:
+                    self._series[name] = RateSeries.load(path, mmap=True)
+
+        for name, ordinals in queried.items():
+            dates = self._queried_dates(name)
+            dates.update(ordinals)
+            path = self._path(name, "queried")
+            if path is not None:
+                os.makedirs(self.directory, exist_ok=True)
+                tmp = f"{path}.{os.getpid()}.tmp"
+                with open(tmp, "wb") as f:
+                    f.write(bytes(array("i", sorted(dates))))
+                os.replace(tmp, path)
+
+        if error is not None:
+            raise error
+        return len(calls)
+
+    def _queried_dates(self, benchmark_name: BenchmarkName) -> Set[int]:
+        """The ordinals of the dates already asked for, fixed or not."""
+        dates = self._queried.get(benchmark_name)
+        if dates is None:
+            dates = set()
+            path = self._path(benchmark_name, "queried")
+            if path is not None and os.path.exists(path):
+                with open(path, "rb") as f:
+                    dates.update(array("i", f.read()))
+            self._queried[benchmark_name] = dates
+        return dates
+
+    def _path(
+        self, benchmark_name: BenchmarkName, extension: str = "rates"
+    ) -> Optional[str]:
+        if self.directory is None:
+            return None
+        return os.path.join(self.directory, f"{benchmark_name.value}.{extension}")
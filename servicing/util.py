@@ -1,4 +1,5 @@
-from datetime import date
+import re
+from datetime import date, datetime
 from functools import wraps
 from typing import Any, Callable, TypeVar, Generic, Union
 from uuid import UUID
@@ -36,3 +37,32 @@ class RequireUuid(Generic[T]):
 
 def format_date(d: Union[date, str]) -> str:
     return d.isoformat() if isinstance(d, date) else d
+
+
+def parse_date(d: Union[date, str]) -> date:
+    return d if isinstance(d, date) else datetime.strptime(d, "%Y-%m-%d").date()
+
+
+_PATH_PARAMS = (
+    (
+        re.compile(
+            "^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$",
+            re.IGNORECASE,
+        ),
+        "{id}",
+    ),
+    (re.compile("^\\d{4}-\\d{2}-\\d{2}$"), "{date}"),
+    (re.compile("^\\d+$"), "{n}"),
+)
+
+
+def path_template(path: str) -> str:
+    """Replace the ids, dates and numbers in an API path with placeholders, e.g.
+    /v1/private/loan/<uuid>/invoice/3 -> /v1/private/loan/{id}/invoice/{n}"""
+    segments = path.split("?", 1)[0].split("/")
+    for i, segment in enumerate(segments):
+        for pattern, placeholder in _PATH_PARAMS:
+            if pattern.match(segment):
+                segments[i] = placeholder
+                break
+    return "/".join(segments)
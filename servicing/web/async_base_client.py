@@ -0,0 +1,486 @@
+import asyncio
+import logging
+import time
+from functools import partial
+from ssl import SSLContext
+from typing import Any, AsyncIterator, Dict, Optional, Union
+
+from ..errors import ServicingClientError, ServicingTimeoutError
+from ..util import path_template
+from .async_connection_pool import AsyncConnectionPool
+from .base_client import STREAM_CHUNK_SIZE, BaseClient
+from .circuit_breaker import CircuitBreaker
+from .classes import JsonObject
+from .codec import JsonCodec
+from .concurrency import AdaptiveConcurrencyLimiter
+from .deadline import Deadline, DeadlineArg
+from .dns_cache import DnsCache
+from .hedging import HedgingPolicy
+from .http_cache import HttpCache
+from .json_stream import JsonArrayParser
+from .rate_limiter import RateLimiter
+from .reference_cache import ReferenceCache
+from .retry import RetryPolicy
+from .servicing_response import ServicingResponse
+from .transport import Transport
+
+
+class AsyncBaseClient(BaseClient):
+    def __init__(
+        self,
+        token=None,
+        base_url=BaseClient.BASE_URL,
+        headers: Optional[dict] = None,
+        ssl: Optional[SSLContext] = None,
+        pool: Optional[AsyncConnectionPool] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        codec: Union[str, JsonCodec] = "json",
+        http_cache: Optional[HttpCache] = None,
+        reference_cache: Optional[ReferenceCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        hedging_policy: Optional[HedgingPolicy] = None,
+        connect_timeout: Optional[float] = 10.0,
+        read_timeout: Optional[float] = 60.0,
+        transport: Optional[Transport] = None,
+    ):
+        """
+        Args:
+            transport: Sends the requests of `api_call` on the default thread
+                pool of the event loop instead of the asynchronous pool, e.g.
+                an InMemoryTransport
+        """
+        super().__init__(
+            token=token,
+            base_url=base_url,
+            headers=headers,
+            ssl=ssl,
+            pool=pool or AsyncConnectionPool(ssl=ssl, dns_cache=DnsCache()),
+            retry_policy=retry_policy,
+            circuit_breaker=circuit_breaker,
+            codec=codec,
+            http_cache=http_cache,
+            reference_cache=reference_cache,
+            rate_limiter=rate_limiter,
+            concurrency_limiter=concurrency_limiter,
+            hedging_policy=hedging_policy,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            transport=transport,
+        )
+        self.__logger = logging.getLogger(__name__)
+
+    async def api_call(
+        self,
+        *,
+        method: str,
+        path: str,
+        token: Optional[str] = None,
+        query_params: Optional[Dict[str, str]] = None,
+        data: Union[dict, JsonObject, None] = None,
+        additional_headers: Optional[Dict[str, str]] = None,
+        idempotent: Optional[bool] = None,
+        deadline: DeadlineArg = None,
+    ) -> ServicingResponse:
+        url, headers, body = self._prepare_request(
+            method=method,
+            path=path,
+            token=token,
+            query_params=query_params,
+            data=data,
+            additional_headers=additional_headers,
+        )
+
+        reference = self.reference_cache if method == "GET" else None
+        if reference is not None and not reference.matches(url):
+            reference = None
+        loop = asyncio.get_event_loop()
+        if reference is not None:
+            # Only the in-memory copies are read on the event loop; SQLite
+            # is queried on the default executor
+            cached = reference.get(url, blocking=False)
+            if cached is None:
+                cached = await loop.run_in_executor(None, reference.get, url)
+            if cached is not None:
+                return self._build_response(
+                    method=method,
+                    url=url,
+                    status=cached[0],
+                    headers=cached[1],
+                    body=cached[2],
+                )
+
+        endpoint = path_template(path)
+        cache = self.http_cache if method == "GET" else None
+        if cache is not None:
+            entry, fresh = cache.before_request(url, headers, endpoint)
+            if fresh:
+                return self._build_response(
+                    method=method,
+                    url=url,
+                    status=entry.status,
+                    headers=entry.headers,
+                    body=entry.body,
+                )
+
+        response = await self.__perform_http_request_with_retries(
+            method, url, body, headers, idempotent, endpoint, Deadline.coerce(deadline)
+        )
+        status, response_headers, response_body = response
+
+        if cache is not None:
+            status, response_headers, response_body = cache.after_response(
+                url, headers, entry, status, response_headers, response_body
+            )
+
+        if reference is not None:
+            await loop.run_in_executor(
+                None, reference.put, url, status, response_headers, response_body
+            )
+
+        return self._build_response(
+            method=method,
+            url=url,
+            status=status,
+            headers=response_headers,
+            body=response_body,
+        )
+
+    async def api_stream(
+        self,
+        *,
+        method: str = "GET",
+        path: str,
+        token: Optional[str] = None,
+        query_params: Optional[Dict[str, str]] = None,
+        data: Union[dict, JsonObject, None] = None,
+        additional_headers: Optional[Dict[str, str]] = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        deadline: DeadlineArg = None,
+    ) -> AsyncIterator[Any]:
+        """
+        Send a request whose response is a JSON array and yield its elements one
+        at a time while the body is still being received.
+
+        Raises:
+            ServicingApiError if the response status is not successful
+            ServicingTimeoutError if the deadline passes before the response
+                starts
+        """
+        url, headers, body = self._prepare_request(
+            method=method,
+            path=path,
+            token=token,
+            query_params=query_params,
+            data=data,
+            additional_headers=additional_headers,
+        )
+
+        endpoint = path_template(path)
+        deadline = Deadline.coerce(deadline)
+        breaker = self.circuit_breaker
+        if breaker is not None:
+            breaker.before_request(endpoint)
+        try:
+            await self.__wait_for_rate_limit(endpoint, deadline)
+            connect_timeout, read_timeout = self._timeouts(deadline)
+            if self.transport is not None:
+                open_stream = partial(
+                    self.transport.open,
+                    method,
+                    url,
+                    body,
+                    headers,
+                    connect_timeout=connect_timeout,
+                    read_timeout=read_timeout,
+                )
+                loop = asyncio.get_event_loop()
+                response = _ExecutorResponse(
+                    loop, *await loop.run_in_executor(None, open_stream)
+                )
+            else:
+                response = await self.pool.open(
+                    method,
+                    url,
+                    body=body,
+                    headers=headers,
+                    connect_timeout=connect_timeout,
+                    read_timeout=read_timeout,
+                )
+        except asyncio.CancelledError:
+            if breaker is not None:
+                breaker.release(endpoint)
+            raise
+        except ServicingTimeoutError as err:
+            if breaker is not None:
+                self._record_timeout(breaker, endpoint, err)
+            raise
+        except ServicingClientError:
+            if breaker is not None:
+                breaker.release(endpoint)
+            raise
+        except Exception as err:
+            if breaker is not None:
+                breaker.record(endpoint)
+            self._raise_if_expired(deadline, err)
+            raise
+        except BaseException:
+            if breaker is not None:
+                breaker.release(endpoint)
+            raise
+        if breaker is not None:
+            breaker.record(endpoint, response.status)
+
+        try:
+            if not 200 <= response.status < 300:
+                self._build_response(
+                    method=method,
+                    url=url,
+                    status=response.status,
+                    headers=response.headers,
+                    body=await response.read(),
+                ).validate()
+
+            parser = JsonArrayParser()
+            while True:
+                chunk = await response.read(chunk_size)
+                if not chunk:
+                    break
+                for item in parser.feed(chunk):
+                    yield item
+            parser.close()
+        finally:
+            response.close()
+
+    async def __perform_http_request_with_retries(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes],
+        headers: dict,
+        idempotent: Optional[bool],
+        endpoint: str,
+        deadline: Optional[Deadline],
+    ):
+        send = self.__send
+        hedging = self.hedging_policy
+        if hedging is not None and hedging.applies(method, endpoint):
+            send = self.__send_hedged
+
+        policy = self.retry_policy
+        if policy is None or not policy.allows(method, idempotent):
+            return await send(method, url, body, headers, endpoint, deadline)
+
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                response = await send(method, url, body, headers, endpoint, deadline)
+            except Exception as err:
+                delay = policy.delay_after_error(err, attempt, started)
+                if delay is None or not self._fits(delay, deadline):
+                    raise
+                reason = repr(err)
+            else:
+                delay = policy.delay_after_status(
+                    response[0], response[1], attempt, started
+                )
+                if delay is None or not self._fits(delay, deadline):
+                    return response
+                reason = f"status {response[0]}"
+
+            attempt += 1
+            self.__logger.debug(
+                f"Retrying {method} {url} in {delay:.2f}s (attempt {attempt}) "
+                f"after {reason}"
+            )
+            await asyncio.sleep(delay)
+
+    async def __wait_for_rate_limit(
+        self, endpoint: str, deadline: Optional[Deadline]
+    ) -> None:
+        if self.rate_limiter is not None:
+            delay = self.rate_limiter.reserve(endpoint, deadline)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    async def __send(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes],
+        headers: dict,
+        endpoint: str,
+        deadline: Optional[Deadline],
+    ):
+        breaker = self.circuit_breaker
+        if breaker is None:
+            await self.__wait_for_rate_limit(endpoint, deadline)
+            return await self.__perform_limited_request(
+                method, url, body, headers, deadline
+            )
+
+        # An open circuit refuses before a token is spent or waited for. Every
+        # trial taken by before_request is recorded or given back, also when a
+        # hedged request is cancelled
+        breaker.before_request(endpoint)
+        try:
+            await self.__wait_for_rate_limit(endpoint, deadline)
+            response = await self.__perform_limited_request(
+                method, url, body, headers, deadline
+            )
+        except asyncio.CancelledError:
+            breaker.release(endpoint)
+            raise
+        except ServicingTimeoutError as err:
+            self._record_timeout(breaker, endpoint, err)
+            raise
+        except ServicingClientError:
+            breaker.release(endpoint)
+            raise
+        except Exception:
+            breaker.record(endpoint)
+            raise
+        except BaseException:
+            breaker.release(endpoint)
+            raise
+        breaker.record(endpoint, response[0])
+        return response
+
+    async def __send_hedged(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes],
+        headers: dict,
+        endpoint: str,
+        deadline: Optional[Deadline],
+    ):
+        policy = self.hedging_policy
+        delay = policy.hedge_delay(endpoint)
+        started = time.monotonic()
+        primary = asyncio.ensure_future(
+            self.__send(method, url, body, headers, endpoint, deadline)
+        )
+        tasks = [primary]
+        if delay is not None:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done and policy.try_hedge():
+                hedge = self.__send(
+                    method, url, body, dict(headers), endpoint, deadline
+                )
+                tasks.append(asyncio.ensure_future(hedge))
+
+        error = None
+        try:
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        policy.record(
+                            endpoint, time.monotonic() - started, task is not primary
+                        )
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def __perform_limited_request(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes],
+        headers: dict,
+        deadline: Optional[Deadline],
+    ):
+        limiter = self.concurrency_limiter
+        if limiter is None:
+            return await self.__perform_http_request(
+                method, url, body, headers, deadline
+            )
+
+        await limiter.acquire_async(None if deadline is None else deadline.remaining())
+        started = time.monotonic()
+        status = None
+        try:
+            response = await self.__perform_http_request(
+                method, url, body, headers, deadline
+            )
+            status = response[0]
+            return response
+        finally:
+            limiter.release(time.monotonic() - started, status)
+
+    async def __perform_http_request(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes],
+        headers: dict,
+        deadline: Optional[Deadline],
+    ):
+        try:
+            connect_timeout, read_timeout = self._timeouts(deadline)
+            if self.transport is not None:
+                send = partial(
+                    self.transport.send,
+                    method,
+                    url,
+                    body,
+                    headers,
+                    connect_timeout=connect_timeout,
+                    read_timeout=read_timeout,
+                )
+                return await asyncio.get_event_loop().run_in_executor(None, send)
+            return await self.pool.urlopen(
+                method,
+                url,
+                body=body,
+                headers=headers,
+                connect_timeout=connect_timeout,
+                read_timeout=read_timeout,
+            )
+        except ServicingClientError:
+            raise
+        except Exception as err:
+            self.__logger.error(f"Failed to send a request to Servicing API: {err}")
+            self._raise_if_expired(deadline, err)
+            raise err
+
+    def _default_transport(self) -> Optional[Transport]:
+        return None
+
+    async def warm_up(self, n: Optional[int] = None) -> int:
+        return await self.pool.warm_up(
+            self.base_url, n, connect_timeout=self.connect_timeout
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class _ExecutorResponse:
+    """Reads the body of a streamed Transport response in the default
+    executor, with the interface of AsyncPooledResponse."""
+
+    def __init__(self, loop, status: int, headers, body):
+        self.status = status
+        self.headers = headers
+        self._loop = loop
+        self._body = body
+
+    async def read(self, amt: int = -1) -> bytes:
+        read = partial(self._body.read, None if amt < 0 else amt)
+        return await self._loop.run_in_executor(None, read)
+
+    def close(self) -> None:
+        self._body.close()
@@ -0,0 +1,214 @@
+import asyncio
+import inspect
+from functools import wraps
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+)
+
+from ..finance.business_day_calendar import BusinessDayCalendar
+from .async_base_client import AsyncBaseClient
+from .batch import BatchResult
+from .classes.transaction_batch import TransactionBatch
+from .client import (
+    InstitutionClient,
+    LoanClient,
+    ResourceClient,
+    ServicingClient,
+    TransactionClient,
+    UserClient,
+)
+from .deadline import Deadline, DeadlineArg
+from .retry import RetryPolicy
+
+
+def _coroutine(func: Callable) -> Callable:
+    @wraps(func)
+    async def wrapped_f(*args, **kwargs):
+        result = func(*args, **kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    return wrapped_f
+
+
+def coroutine_methods(
+    source: type, exclude: Iterable[str] = ()
+) -> Callable[[type], type]:
+    """
+    Copy the public methods of a blocking client onto the decorated class as
+    coroutines, so both flavours share the same validation and request building.
+    Streaming `iter_*` methods are copied unchanged; on an asynchronous client
+    they return an asynchronous iterator.
+
+    Args:
+        source: The blocking client class whose methods should be exposed
+        exclude: Names of methods that have no asynchronous counterpart
+    """
+
+    def decorate(cls: type) -> type:
+        for name, func in vars(source).items():
+            if name.startswith("_") or name in exclude:
+                continue
+            if inspect.isfunction(func):
+                setattr(
+                    cls, name, func if name.startswith("iter_") else _coroutine(func)
+                )
+        return cls
+
+    return decorate
+
+
+@coroutine_methods(InstitutionClient)
+class AsyncInstitutionClient(ResourceClient):
+    pass
+
+
+@coroutine_methods(LoanClient)
+class AsyncLoanClient(ResourceClient):
+    pass
+
+
+@coroutine_methods(TransactionClient)
+class AsyncTransactionClient(ResourceClient):
+    pass
+
+
+@coroutine_methods(UserClient)
+class AsyncUserClient(ResourceClient):
+    pass
+
+
+# Use asyncio.gather for fan-out instead of the thread-pool batch
+@coroutine_methods(ServicingClient, exclude=("batch", "submit", "warm_reference_cache"))
+class AsyncServicingClient(AsyncBaseClient):
+    _calendar_response = ServicingClient._calendar_response
+
+    def __init__(self, *, calendar: Optional[BusinessDayCalendar] = None, **kwargs):
+        if "retry_policy" not in kwargs:
+            kwargs["retry_policy"] = RetryPolicy()
+        super().__init__(**kwargs)
+        self.calendar = calendar
+        self.institution = AsyncInstitutionClient(client=self)
+        self.loan = AsyncLoanClient(client=self)
+        self.user = AsyncUserClient(client=self)
+        self.transaction = AsyncTransactionClient(client=self)
+
+    def submit(
+        self,
+        batch: TransactionBatch,
+        *,
+        ordered: bool = True,
+        validate: bool = True,
+        deadline: DeadlineArg = None,
+    ) -> AsyncIterator[BatchResult]:
+        """
+        Make the request of every row of a PaymentBatch, DrawBatch or
+        MiscFeeBatch concurrently, like the blocking client's `submit`, e.g.
+        `async for result in client.submit(batch)`.
+
+        Rows are built as they are sent; at most `pool.max_connections` are in
+        flight and at most twice that many results are held in memory.
+
+        Args:
+            batch: The rows to submit
+            ordered: Yield results in row order (True) or as they complete (False)
+            validate: Report unsuccessful responses as per-row errors
+            deadline: A Deadline, or seconds from now, shared by all the rows;
+                rows not sent by then fail with ServicingTimeoutError
+
+        Returns:
+            An async iterator of BatchResult, whose index is the row
+
+        Raises:
+            ServicingBatchFormationError if any row was not valid; nothing is
+            sent then
+        """
+        return self.__submit(
+            getattr(self.loan, batch.method),
+            batch.calls(),
+            ordered,
+            validate,
+            Deadline.coerce(deadline),
+        )
+
+    async def __submit(
+        self,
+        func: Callable[..., Awaitable[Any]],
+        calls: Iterator[Dict[str, Any]],
+        ordered: bool,
+        validate: bool,
+        deadline: Optional[Deadline],
+    ) -> AsyncIterator[BatchResult]:
+        calls = enumerate(calls)
+        limit = self.pool.max_connections
+        pending: Dict[asyncio.Future, Tuple[int, Dict[str, Any]]] = {}
+        buffered: Dict[int, BatchResult] = {}
+        next_index = 0
+        exhausted = False
+
+        try:
+            while True:
+                while (
+                    not exhausted
+                    and len(pending) < limit
+                    and len(pending) + len(buffered) < limit * 2
+                ):
+                    try:
+                        index, kwargs = next(calls)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    task = asyncio.ensure_future(
+                        self._submit_row(func, kwargs, validate, deadline)
+                    )
+                    pending[task] = (index, kwargs)
+
+                if not pending:
+                    break
+
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    index, kwargs = pending.pop(task)
+                    response, error = task.result()
+                    result = BatchResult(
+                        index=index, kwargs=kwargs, response=response, error=error
+                    )
+                    if ordered:
+                        buffered[index] = result
+                    else:
+                        yield result
+
+                while next_index in buffered:
+                    yield buffered.pop(next_index)
+                    next_index += 1
+        finally:
+            for task in pending:
+                task.cancel()
+
+    @staticmethod
+    async def _submit_row(
+        func: Callable[..., Awaitable[Any]],
+        kwargs: Dict[str, Any],
+        validate: bool,
+        deadline: Optional[Deadline],
+    ):
+        try:
+            if deadline is not None:
+                deadline.check()
+            response = await func(**kwargs, deadline=deadline)
+            if validate:
+                response.validate()
+            return response, None
+        except Exception as e:
+            return None, e
@@ -0,0 +1,388 @@
+import asyncio
+import io
+import logging
+import time
+from collections import deque
+from http.client import HTTPMessage, parse_headers
+from ssl import SSLContext, create_default_context
+from typing import Deque, Dict, Optional, Tuple
+
+from .connection_pool import IDEMPOTENT_METHODS, ConnectionPool, HostKey
+from .dns_cache import DnsCache
+
+_LINE_BREAKS = frozenset("\r\n")
+
+
+class _Connection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    def is_stale(self) -> bool:
+        return self.reader.at_eof() or self.writer.transport.is_closing()
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class AsyncConnectionPool:
+    """A non-blocking pool of persistent HTTP/1.1 connections for asyncio.
+
+    Connections are kept per (scheme, host, port). The number of sockets open
+    to a single host is capped by `max_connections`; coroutines beyond that
+    limit wait for a connection to be released instead of opening new ones.
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int = 100,
+        max_connections: int = 100,
+        idle_timeout: Optional[float] = 60.0,
+        ssl: Optional[SSLContext] = None,
+        dns_cache: Optional[DnsCache] = None,
+    ):
+        """
+        Args:
+            maxsize: Maximum number of idle connections kept per host
+            max_connections: Maximum number of connections open at once per host
+            idle_timeout: Seconds after which an idle connection is discarded
+                instead of being reused (None keeps them forever)
+            ssl: SSL context used for https connections
+            dns_cache: Resolves the host names of new connections
+        """
+        if maxsize < 1 or max_connections < 1:
+            raise ValueError("maxsize and max_connections must be greater than 0")
+        self.maxsize = maxsize
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self.ssl = ssl
+        self.dns_cache = dns_cache
+        self._idle: Dict[HostKey, Deque[Tuple[_Connection, float]]] = {}
+        self._slots: Dict[HostKey, asyncio.Semaphore] = {}
+        self.__logger = logging.getLogger(__name__)
+
+    async def urlopen(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes] = None,
+        headers: Optional[dict] = None,
+        *,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+    ) -> Tuple[int, HTTPMessage, bytes]:
+        """Send a request over a pooled connection and read the whole response.
+
+        Returns:
+            A (status, headers, body) tuple
+        """
+        response = await self.open(
+            method,
+            url,
+            body=body,
+            headers=headers,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+        )
+        try:
+            data = await asyncio.wait_for(response.read(), read_timeout)
+        finally:
+            response.close()
+        return response.status, response.headers, data
+
+    async def open(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes] = None,
+        headers: Optional[dict] = None,
+        *,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+    ) -> "AsyncPooledResponse":
+        """Send a request over a pooled connection without reading the body.
+
+        The connection (and its slot) is released when the returned response
+        is closed; it goes back to the pool if the body was read completely.
+
+        Args:
+            connect_timeout: Seconds allowed to open a new connection
+            read_timeout: Seconds allowed to send the request and receive the
+                response head (and, in `urlopen`, the body)
+        """
+        key, target = ConnectionPool._split_url(url)
+
+        slots = self._slots.get(key)
+        if slots is None:
+            slots = self._slots[key] = asyncio.Semaphore(self.max_connections)
+
+        await slots.acquire()
+        try:
+            conn, reused = await self._get_connection(key, connect_timeout)
+            try:
+                try:
+                    head = await asyncio.wait_for(
+                        self._send(conn, key, method, target, body, headers),
+                        read_timeout,
+                    )
+                except (ConnectionError, asyncio.IncompleteReadError) as e:
+                    conn.close()
+                    # As in ConnectionPool.open, a request that may have been
+                    # acted on is left to the RetryPolicy
+                    if not reused or method.upper() not in IDEMPOTENT_METHODS:
+                        raise
+                    self.__logger.debug(
+                        f"Reconnecting to {key[1]}:{key[2]} after: {e!r}"
+                    )
+                    conn = await asyncio.wait_for(
+                        self._new_connection(key), connect_timeout
+                    )
+                    head = await asyncio.wait_for(
+                        self._send(conn, key, method, target, body, headers),
+                        read_timeout,
+                    )
+            except BaseException:
+                conn.close()
+                raise
+        except BaseException:
+            slots.release()
+            raise
+
+        return AsyncPooledResponse(self, key, conn, slots, method, *head)
+
+    async def warm_up(
+        self,
+        url: str,
+        n: Optional[int] = None,
+        *,
+        connect_timeout: Optional[float] = None,
+    ) -> int:
+        """Open connections to the host of `url` ahead of time so that the
+        first requests skip the DNS lookup and the TCP and TLS handshakes.
+
+        Args:
+            n: Number of idle connections wanted (at most, and by default,
+                `maxsize`)
+
+        Returns:
+            The number of idle connections to the host
+        """
+        key, _ = ConnectionPool._split_url(url)
+        wanted = min(self.maxsize, self.max_connections if n is None else n)
+        missing = wanted - self.num_idle(url)
+        if missing > 0:
+            connections = await asyncio.gather(
+                *(
+                    asyncio.wait_for(self._new_connection(key), connect_timeout)
+                    for _ in range(missing)
+                )
+            )
+            for conn in connections:
+                self._put_connection(key, conn)
+        return self.num_idle(url)
+
+    def close(self) -> None:
+        """Close every idle connection held by the pool."""
+        idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn, _ in connections:
+                conn.close()
+
+    def num_idle(self, url: Optional[str] = None) -> int:
+        """Number of idle connections held for the host of `url` (or in total)."""
+        if url is None:
+            return sum(len(c) for c in self._idle.values())
+        return len(self._idle.get(ConnectionPool._split_url(url)[0], ()))
+
+    async def _send(
+        self,
+        conn: _Connection,
+        key: HostKey,
+        method: str,
+        target: str,
+        body: Optional[bytes],
+        headers: Optional[dict],
+    ) -> Tuple[str, int, HTTPMessage]:
+        scheme, host, port = key
+        default_port = 443 if scheme == "https" else 80
+        lines = [
+            f"{method} {target} HTTP/1.1",
+            f"Host: {host}" if port == default_port else f"Host: {host}:{port}",
+        ]
+        request_headers = dict(headers or {})
+        if body is not None or method in ("POST", "PUT", "PATCH"):
+            request_headers["Content-Length"] = str(len(body or b""))
+        for name, value in request_headers.items():
+            # Line breaks would let a value inject headers or a second request
+            # (http.client refuses them as well)
+            if _LINE_BREAKS.intersection(str(name)):
+                raise ValueError(f"Invalid header name {name!r}")
+            if _LINE_BREAKS.intersection(str(value)):
+                raise ValueError(f"Invalid header value {value!r}")
+            lines.append(f"{name}: {value}")
+        conn.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if body:
+            conn.writer.write(body)
+        await conn.writer.drain()
+
+        while True:
+            version, status, response_headers = await self._read_head(conn.reader)
+            # Interim responses such as 100 Continue precede the final one
+            if not 100 <= status < 200 or status == 101:
+                return version, status, response_headers
+
+    @staticmethod
+    async def _read_head(
+        reader: asyncio.StreamReader,
+    ) -> Tuple[str, int, HTTPMessage]:
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Remote end closed connection without response")
+        version, status, _ = (status_line.decode("latin-1").split(None, 2) + [""])[:3]
+
+        header_lines = []
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            header_lines.append(line)
+        response_headers = parse_headers(io.BytesIO(b"".join(header_lines) + b"\r\n"))
+        return version, int(status), response_headers
+
+    async def _get_connection(
+        self, key: HostKey, connect_timeout: Optional[float] = None
+    ) -> Tuple[_Connection, bool]:
+        connections = self._idle.get(key)
+        while connections:
+            conn, last_used = connections.pop()
+            if self._is_expired(last_used) or conn.is_stale():
+                conn.close()
+                continue
+            return conn, True
+
+        return await asyncio.wait_for(self._new_connection(key), connect_timeout), False
+
+    def _put_connection(self, key: HostKey, conn: _Connection) -> None:
+        connections = self._idle.setdefault(key, deque())
+        if len(connections) < self.maxsize:
+            connections.append((conn, time.monotonic()))
+        else:
+            conn.close()
+
+    async def _new_connection(self, key: HostKey) -> _Connection:
+        scheme, host, port = key
+        options = {}
+        if scheme == "https":
+            if self.ssl is None:
+                self.ssl = create_default_context()
+            options = {"ssl": self.ssl, "server_hostname": host}
+        if self.dns_cache is None:
+            reader, writer = await asyncio.open_connection(host, port, **options)
+            return _Connection(reader, writer)
+
+        error = None
+        for _, _, _, _, sockaddr in await self.dns_cache.resolve_async(host, port):
+            try:
+                reader, writer = await asyncio.open_connection(
+                    sockaddr[0], port, **options
+                )
+                return _Connection(reader, writer)
+            except OSError as e:
+                error = e
+        self.dns_cache.invalidate(host, port)
+        raise error or OSError(f"{host} did not resolve to any address")
+
+    def _is_expired(self, last_used: float) -> bool:
+        if self.idle_timeout is None:
+            return False
+        return time.monotonic() - last_used > self.idle_timeout
+
+
+class AsyncPooledResponse:
+    """A response whose body is read on demand from a pooled connection."""
+
+    def __init__(
+        self,
+        pool: AsyncConnectionPool,
+        key: HostKey,
+        conn: _Connection,
+        slots: asyncio.Semaphore,
+        method: str,
+        version: str,
+        status: int,
+        headers: HTTPMessage,
+    ):
+        self.status = status
+        self.headers = headers
+        self._pool = pool
+        self._key = key
+        self._conn = conn
+        self._slots = slots
+        self._reader = conn.reader
+        self._will_close = version == "HTTP/1.0" or (
+            headers.get("Connection", "").lower() == "close"
+        )
+        self._chunked = False
+        self._remaining: Optional[int] = None
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            self._remaining = 0
+        elif headers.get("Transfer-Encoding", "").lower() == "chunked":
+            self._chunked = True
+            self._remaining = 0
+        elif headers.get("Content-Length") is not None:
+            self._remaining = int(headers["Content-Length"])
+        else:
+            self._will_close = True
+        self._done = self._remaining == 0 and not self._chunked
+
+    async def read(self, amt: int = -1) -> bytes:
+        """Read up to `amt` bytes of the body (all of it if `amt` is negative)."""
+        if amt >= 0:
+            return await self._read_some(amt)
+        chunks = []
+        while not self._done:
+            chunks.append(await self._read_some(65536))
+        return b"".join(chunks)
+
+    async def _read_some(self, amt: int) -> bytes:
+        if self._done or amt == 0:
+            return b""
+        reader = self._reader
+
+        if self._chunked and self._remaining == 0:
+            size_line = await reader.readline()
+            size = int(size_line.split(b";", 1)[0].strip(), 16)
+            if size == 0:
+                # Skip trailers up to the terminating empty line.
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                self._done = True
+                return b""
+            self._remaining = size
+
+        if self._remaining is None:
+            data = await reader.read(amt)
+            self._done = not data
+            return data
+
+        data = await reader.readexactly(min(amt, self._remaining))
+        self._remaining -= len(data)
+        if self._remaining == 0:
+            if self._chunked:
+                await reader.readexactly(2)
+            else:
+                self._done = True
+        return data
+
+    def close(self) -> None:
+        """Return the connection to the pool, or close it if the body was not
+        read completely or the server asked to close it."""
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        if self._done and not self._will_close:
+            self._pool._put_connection(self._key, conn)
+        else:
+            conn.close()
+        self._slots.release()
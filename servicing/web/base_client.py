@@ -1,27 +1,37 @@
 import json
 import logging
 import platform
-from http.client import HTTPResponse
 from ssl import SSLContext
-from typing import Optional, Dict
-from urllib.error import HTTPError
+from typing import Any, Iterator, Optional, Dict, Tuple, Union
 from urllib.parse import urlencode, urljoin
-from urllib.request import Request, urlopen
-from uuid import UUID
 
 import sys
+import time
+from concurrent.futures import as_completed, wait
 
-from ..errors import ServicingRequestError
+from ..errors import (
+    ServicingClientError,
+    ServicingRequestError,
+    ServicingTimeoutError,
+)
+from ..util import path_template
 from ..version import __version__
+from .connection_pool import ConnectionPool
+from .deadline import Deadline, DeadlineArg
+from .circuit_breaker import CircuitBreaker
+from .classes import JsonObject
+from .codec import JSONEncoder, JsonCodec, get_codec
+from .concurrency import AdaptiveConcurrencyLimiter
+from .hedging import HedgingPolicy
+from .http_cache import HttpCache
+from .json_stream import JsonArrayParser
+from .rate_limiter import RateLimiter
+from .reference_cache import ReferenceCache
+from .retry import RetryPolicy
 from .servicing_response import ServicingResponse
+from .transport import PooledTransport, Transport, UrllibTransport
 
-
-class JSONEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, UUID):
-            return str(obj)
-        else:
-            return json.JSONEncoder.default(self, obj)
+STREAM_CHUNK_SIZE = 64 * 1024
 
 
 class BaseClient:
@@ -33,11 +43,35 @@ class BaseClient:
         base_url=BASE_URL,
         headers: Optional[dict] = None,
         ssl: Optional[SSLContext] = None,
+        pool: Optional[ConnectionPool] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        codec: Union[str, JsonCodec] = "json",
+        http_cache: Optional[HttpCache] = None,
+        reference_cache: Optional[ReferenceCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        hedging_policy: Optional[HedgingPolicy] = None,
+        connect_timeout: Optional[float] = 10.0,
+        read_timeout: Optional[float] = 60.0,
+        transport: Optional[Transport] = None,
     ):
         self.token = None if token is None else token.strip()
         self.base_url = base_url
         self.headers = headers or {}
         self.ssl = ssl
+        self.pool = pool
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.codec = get_codec(codec)
+        self.http_cache = http_cache
+        self.reference_cache = reference_cache
+        self.rate_limiter = rate_limiter
+        self.concurrency_limiter = concurrency_limiter
+        self.hedging_policy = hedging_policy
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.transport = transport or self._default_transport()
         self.__logger = logging.getLogger(__name__)
 
     def api_call(
@@ -47,13 +81,142 @@ class BaseClient:
         path: str,
         token: Optional[str] = None,
         query_params: Optional[Dict[str, str]] = None,
-        data: Optional[dict] = None,
+        data: Union[dict, JsonObject, None] = None,
         additional_headers: Optional[Dict[str, str]] = None,
+        idempotent: Optional[bool] = None,
+        deadline: DeadlineArg = None,
     ):
+        """
+        Args:
+            deadline: A Deadline, or seconds from now, by which the call
+                including its retries must complete
+
+        Raises:
+            ServicingTimeoutError if the deadline passes
+        """
+        url, headers, body = self._prepare_request(
+            method=method,
+            path=path,
+            token=token,
+            query_params=query_params,
+            data=data,
+            additional_headers=additional_headers,
+        )
+
+        reference = self.reference_cache if method == "GET" else None
+        if reference is not None:
+            cached = reference.get(url)
+            if cached is not None:
+                return self._build_response(
+                    method=method,
+                    url=url,
+                    status=cached[0],
+                    headers=cached[1],
+                    body=cached[2],
+                )
+
+        endpoint = path_template(path)
+        cache = self.http_cache if method == "GET" else None
+        if cache is not None:
+            entry, fresh = cache.before_request(url, headers, endpoint)
+            if fresh:
+                return self._build_response(
+                    method=method,
+                    url=url,
+                    status=entry.status,
+                    headers=entry.headers,
+                    body=entry.body,
+                )
+
+        response = self.__perform_http_request_with_retries(
+            method, url, body, headers, idempotent, endpoint, Deadline.coerce(deadline)
+        )
+        status, response_headers, response_body = response
+
+        if cache is not None:
+            status, response_headers, response_body = cache.after_response(
+                url, headers, entry, status, response_headers, response_body
+            )
+
+        if reference is not None:
+            reference.put(url, status, response_headers, response_body)
+
+        return self._build_response(
+            method=method,
+            url=url,
+            status=status,
+            headers=response_headers,
+            body=response_body,
+        )
+
+    def api_stream(
+        self,
+        *,
+        method: str = "GET",
+        path: str,
+        token: Optional[str] = None,
+        query_params: Optional[Dict[str, str]] = None,
+        data: Union[dict, JsonObject, None] = None,
+        additional_headers: Optional[Dict[str, str]] = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        deadline: DeadlineArg = None,
+    ) -> Iterator[Any]:
+        """
+        Send a request whose response is a JSON array and yield its elements one
+        at a time while the body is still being received.
+
+        Raises:
+            ServicingApiError if the response status is not successful
+            ServicingTimeoutError if the deadline passes before the response
+                starts
+        """
+        url, headers, body = self._prepare_request(
+            method=method,
+            path=path,
+            token=token,
+            query_params=query_params,
+            data=data,
+            additional_headers=additional_headers,
+        )
+
+        status, resp_headers, fp = self.__open_stream(
+            method, url, body, headers, path_template(path), Deadline.coerce(deadline)
+        )
+        try:
+            if not 200 <= status < 300:
+                self._build_response(
+                    method=method,
+                    url=url,
+                    status=status,
+                    headers=resp_headers,
+                    body=fp.read(),
+                ).validate()
+
+            parser = JsonArrayParser()
+            while True:
+                chunk = fp.read(chunk_size)
+                if not chunk:
+                    break
+                yield from parser.feed(chunk)
+            parser.close()
+        finally:
+            fp.close()
+
+    def _prepare_request(
+        self,
+        *,
+        method: str,
+        path: str,
+        token: Optional[str],
+        query_params: Optional[Dict[str, str]],
+        data: Union[dict, JsonObject, None],
+        additional_headers: Optional[Dict[str, str]],
+    ) -> Tuple[str, dict, Optional[bytes]]:
+        """Build the absolute URL, the request headers and the encoded body."""
         if additional_headers is None:
             additional_headers = {}
 
-        url = self.__get_url(path)
+        url = self._get_url(path)
 
         if self.__logger.level <= logging.DEBUG:
 
@@ -77,7 +240,7 @@ class BaseClient:
                 f"headers: {headers}"
             )
 
-        headers = self.__build_urllib_request_headers(
+        headers = self._build_request_headers(
             token=token or self.token, additional_headers=additional_headers
         )
 
@@ -85,40 +248,333 @@ class BaseClient:
             q = urlencode(query_params)
             url = f"{url}&{q}" if "?" in url else f"{url}?{q}"
 
-        (status, headers, body) = self.__perform_urllib_http_request(
-            method, url, data, headers
-        )
+        if isinstance(data, JsonObject):
+            body = data.to_json(self.codec)
+            headers["Content-Type"] = "application/json;charset=utf-8"
+        elif data:
+            body = self.codec.dumps(data)
+            headers["Content-Type"] = "application/json;charset=utf-8"
+        else:
+            body = None
+
+        return url, headers, body
 
+    def _build_response(
+        self, *, method: str, url: str, status: int, headers: dict, body: bytes
+    ) -> ServicingResponse:
         return ServicingResponse(
             method=method,
             url=url,
-            data=json.loads(body) if body else None,
             headers=headers,
             status=status,
+            body=body,
+            loads=self.codec.loads,
         )
 
-    def __perform_urllib_http_request(
-        self, method: str, url: str, data: Optional[dict], headers: dict
+    def __perform_http_request_with_retries(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes],
+        headers: dict,
+        idempotent: Optional[bool],
+        endpoint: str,
+        deadline: Optional[Deadline],
     ):
-        if data:
-            body = self._dumps(data).encode("utf-8")
-            headers["Content-Type"] = "application/json;charset=utf-8"
-        else:
-            body = None
+        send = self.__send
+        hedging = self.hedging_policy
+        if hedging is not None and hedging.applies(method, endpoint):
+            send = self.__send_hedged
+
+        policy = self.retry_policy
+        if policy is None or not policy.allows(method, idempotent):
+            return send(method, url, body, headers, endpoint, deadline)
 
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                response = send(method, url, body, headers, endpoint, deadline)
+            except Exception as err:
+                delay = policy.delay_after_error(err, attempt, started)
+                if delay is None or not self._fits(delay, deadline):
+                    raise
+                reason = repr(err)
+            else:
+                delay = policy.delay_after_status(
+                    response[0], response[1], attempt, started
+                )
+                if delay is None or not self._fits(delay, deadline):
+                    return response
+                reason = f"status {response[0]}"
+
+            attempt += 1
+            self.__logger.debug(
+                f"Retrying {method} {url} in {delay:.2f}s (attempt {attempt}) "
+                f"after {reason}"
+            )
+            time.sleep(delay)
+
+    def __send(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes],
+        headers: dict,
+        endpoint: str,
+        deadline: Optional[Deadline],
+    ):
+        breaker = self.circuit_breaker
+        if breaker is None:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(endpoint, deadline)
+            return self.__perform_limited_request(method, url, body, headers, deadline)
+
+        # An open circuit refuses before a token is spent or waited for. Every
+        # trial taken by before_request is recorded or given back
+        breaker.before_request(endpoint)
         try:
-            if url.lower().startswith("http"):
-                req = Request(method=method, url=url, data=body, headers=headers)
-                resp: HTTPResponse = urlopen(req, context=self.ssl)
-                return resp.status, resp.headers, resp.read().decode("utf-8")
-            raise ServicingRequestError(f"Invalid URL detected: {url}")
-        except HTTPError as e:
-            return e.code, e.headers, e.read().decode("utf-8")
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(endpoint, deadline)
+            response = self.__perform_limited_request(
+                method, url, body, headers, deadline
+            )
+        except ServicingTimeoutError as err:
+            self._record_timeout(breaker, endpoint, err)
+            raise
+        except ServicingClientError:
+            breaker.release(endpoint)
+            raise
+        except Exception:
+            breaker.record(endpoint)
+            raise
+        except BaseException:
+            breaker.release(endpoint)
+            raise
+        breaker.record(endpoint, response[0])
+        return response
+
+    def __open_stream(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes],
+        headers: dict,
+        endpoint: str,
+        deadline: Optional[Deadline],
+    ):
+        breaker = self.circuit_breaker
+        if breaker is not None:
+            breaker.before_request(endpoint)
+
+        try:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(endpoint, deadline)
+            if not url.lower().startswith("http"):
+                raise ServicingRequestError(f"Invalid URL detected: {url}")
+            connect_timeout, read_timeout = self._timeouts(deadline)
+            status, resp_headers, resp = self.transport.open(
+                method,
+                url,
+                body,
+                headers,
+                connect_timeout=connect_timeout,
+                read_timeout=read_timeout,
+            )
+        except ServicingTimeoutError as err:
+            if breaker is not None:
+                self._record_timeout(breaker, endpoint, err)
+            raise
+        except ServicingClientError:
+            if breaker is not None:
+                breaker.release(endpoint)
+            raise
         except Exception as err:
             self.__logger.error(f"Failed to send a request to Servicing API: {err}")
+            if breaker is not None:
+                breaker.record(endpoint)
+            self._raise_if_expired(deadline, err)
             raise err
+        except BaseException:
+            if breaker is not None:
+                breaker.release(endpoint)
+            raise
+
+        if breaker is not None:
+            breaker.record(endpoint, status)
+        return status, resp_headers, resp
+
+    def __send_hedged(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes],
+        headers: dict,
+        endpoint: str,
+        deadline: Optional[Deadline],
+    ):
+        policy = self.hedging_policy
+        args = (method, url, body, headers, endpoint, deadline)
+        delay = policy.hedge_delay(endpoint)
+        # Without a delay yet, or with every hedging thread busy, the request
+        # goes out unhedged on the caller's thread: queueing behind the
+        # hedging threads would cap the requests in flight
+        primary = None if delay is None else policy.submit(self.__send, *args)
+        if primary is None:
+            return self.__send(*args)
+        started = time.monotonic()
+        futures = [primary]
+        if not wait(futures, timeout=delay).done:
+            hedge = policy.submit(
+                self.__send,
+                method,
+                url,
+                body,
+                dict(headers),
+                endpoint,
+                deadline,
+                hedge=True,
+            )
+            if hedge is not None:
+                futures.append(hedge)
+
+        error = None
+        try:
+            for future in as_completed(futures):
+                if future.exception() is None:
+                    policy.record(
+                        endpoint, time.monotonic() - started, future is not primary
+                    )
+                    return future.result()
+                error = error or future.exception()
+            raise error
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def __perform_limited_request(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes],
+        headers: dict,
+        deadline: Optional[Deadline],
+    ):
+        limiter = self.concurrency_limiter
+        if limiter is None:
+            return self.__perform_urllib_http_request(
+                method, url, body, headers, deadline
+            )
+
+        limiter.acquire(None if deadline is None else deadline.remaining())
+        started = time.monotonic()
+        status = None
+        try:
+            response = self.__perform_urllib_http_request(
+                method, url, body, headers, deadline
+            )
+            status = response[0]
+            return response
+        finally:
+            limiter.release(time.monotonic() - started, status)
+
+    def __perform_urllib_http_request(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes],
+        headers: dict,
+        deadline: Optional[Deadline],
+    ):
+        try:
+            if not url.lower().startswith("http"):
+                raise ServicingRequestError(f"Invalid URL detected: {url}")
+            connect_timeout, read_timeout = self._timeouts(deadline)
+            return self.transport.send(
+                method,
+                url,
+                body,
+                headers,
+                connect_timeout=connect_timeout,
+                read_timeout=read_timeout,
+            )
+        except ServicingClientError:
+            raise
+        except Exception as err:
+            self.__logger.error(f"Failed to send a request to Servicing API: {err}")
+            self._raise_if_expired(deadline, err)
+            raise err
+
+    def _default_transport(self) -> Optional[Transport]:
+        if self.pool is not None:
+            return PooledTransport(self.pool)
+        return UrllibTransport(ssl=self.ssl)
+
+    def _timeouts(
+        self, deadline: Optional[Deadline]
+    ) -> Tuple[Optional[float], Optional[float]]:
+        """The connect and read timeouts of the next attempt.
+
+        Raises:
+            ServicingTimeoutError if the deadline has passed
+        """
+        if deadline is None:
+            return self.connect_timeout, self.read_timeout
+        return deadline.cap(self.connect_timeout), deadline.cap(self.read_timeout)
+
+    @staticmethod
+    def _raise_if_expired(deadline: Optional[Deadline], err: Exception) -> None:
+        """Report a failure caused by running out of time as a timeout."""
+        if deadline is not None and deadline.expired:
+            raise ServicingTimeoutError(
+                f"Deadline of {deadline.timeout}s exceeded"
+            ) from err
+
+    @staticmethod
+    def _record_timeout(
+        breaker: CircuitBreaker, endpoint: str, err: ServicingTimeoutError
+    ) -> None:
+        """Count a timeout against the endpoint only if it cut a request short.
+
+        _raise_if_expired chains the transport's error; a deadline that ran out
+        or a request slot that never freed up before sending is not the
+        endpoint's fault, so its trial is given back instead.
+        """
+        if err.__cause__ is not None:
+            breaker.record(endpoint)
+        else:
+            breaker.release(endpoint)
+
+    @staticmethod
+    def _fits(delay: float, deadline: Optional[Deadline]) -> bool:
+        """Whether a retry after `delay` seconds can start before the deadline."""
+        return deadline is None or delay < deadline.remaining()
+
+    def warm_up(self, n: Optional[int] = None) -> int:
+        """
+        Open `n` pooled connections to the API ahead of the first calls, so
+        that they skip the DNS lookup and the TCP and TLS handshakes.
+
+        Returns:
+            The number of idle connections to the API
+
+        Raises:
+            ServicingClientError if the client has no connection pool
+        """
+        if self.pool is None:
+            raise ServicingClientError("The client has no connection pool to warm up")
+        return self.pool.warm_up(self.base_url, n, connect_timeout=self.connect_timeout)
+
+    def close(self) -> None:
+        """Release the pooled connections held by this client."""
+        if self.pool is not None:
+            self.pool.close()
+        if self.hedging_policy is not None:
+            self.hedging_policy.close()
+        if self.transport is not None:
+            self.transport.close()
 
-    def __build_urllib_request_headers(self, token: str, additional_headers: dict):
+    def _build_request_headers(self, token: str, additional_headers: dict):
         headers = {"User-Agent": self._get_user_agent()}
 
         headers.update(self.headers)
@@ -129,7 +585,7 @@ class BaseClient:
 
         return headers
 
-    def __get_url(self, path: str):
+    def _get_url(self, path: str):
         """Joins the base URL and a path to form an absolute URL."""
         return urljoin(self.base_url, path)
 
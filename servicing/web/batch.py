@@ -0,0 +1,133 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from .deadline import Deadline
+
+
+class BatchResult:
+    """The outcome of a single call made as part of a batch."""
+
+    def __init__(
+        self,
+        *,
+        index: int,
+        kwargs: Dict[str, Any],
+        response: Any = None,
+        error: Optional[Exception] = None,
+    ):
+        self.index = index
+        self.kwargs = kwargs
+        self.response = response
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self):
+        outcome = f"error={self.error!r}" if self.error else f"response={self.response}"
+        return f"<servicing.BatchResult: index={self.index}, {outcome}>"
+
+
+class BatchExecutor:
+    """Fans calls out on a bounded thread pool.
+
+    At most `max_workers` calls run at once and at most twice that many results
+    are held in memory, so arbitrarily large (or lazy) inputs can be processed.
+    """
+
+    def __init__(self, *, max_workers: int = 16):
+        if max_workers < 1:
+            raise ValueError("max_workers must be greater than 0")
+        self.max_workers = max_workers
+
+    def run(
+        self,
+        func: Callable[..., Any],
+        calls: Iterable[Dict[str, Any]],
+        *,
+        ordered: bool = True,
+        validate: bool = False,
+        deadline: Optional[Deadline] = None,
+    ) -> Iterator[BatchResult]:
+        """
+        Call `func(**kwargs)` for each kwargs in `calls`.
+
+        Args:
+            func: The function to call, usually a resource client method
+            calls: The keyword arguments of each call
+            ordered: Yield results in input order (True) or as they complete (False)
+            validate: Call `validate()` on each response so that unsuccessful
+                responses are reported as errors
+            deadline: Passed to every call as its `deadline` keyword argument;
+                calls that have not started by then are not made and fail
+                with ServicingTimeoutError
+
+        Returns:
+            An iterator of BatchResult; failures never abort the batch
+        """
+        calls = enumerate(calls)
+        window = self.max_workers * 2
+        pending: Dict[Future, Tuple[int, Dict[str, Any]]] = {}
+        buffered: Dict[int, BatchResult] = {}
+        next_index = 0
+        exhausted = False
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            while True:
+                while not exhausted and len(pending) + len(buffered) < window:
+                    try:
+                        index, kwargs = next(calls)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    future = executor.submit(
+                        self._call, func, kwargs, validate, deadline
+                    )
+                    pending[future] = (index, kwargs)
+
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, kwargs = pending.pop(future)
+                    response, error = future.result()
+                    result = BatchResult(
+                        index=index,
+                        kwargs=kwargs,
+                        response=response,
+                        error=error,
+                    )
+                    if ordered:
+                        buffered[index] = result
+                    else:
+                        yield result
+
+                while next_index in buffered:
+                    yield buffered.pop(next_index)
+                    next_index += 1
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    @staticmethod
+    def _call(
+        func: Callable[..., Any],
+        kwargs: Dict[str, Any],
+        validate: bool,
+        deadline: Optional[Deadline],
+    ):
+        try:
+            if deadline is not None:
+                deadline.check()
+                if "deadline" not in kwargs:
+                    kwargs = dict(kwargs, deadline=deadline)
+            response = func(**kwargs)
+            if validate:
+                response.validate()
+            return response, None
+        except Exception as e:
+            return None, e
@@ -0,0 +1,148 @@
+import threading
+import time
+from enum import Enum
+from typing import Dict, Iterable, Optional
+
+from ..errors import ServicingCircuitOpenError
+
+
+class CircuitState(Enum):
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+
+class _Circuit:
+    def __init__(self):
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.successes = 0
+        self.trials = 0
+        self.opened_at = 0.0
+
+
+class CircuitBreaker:
+    """Fails fast for endpoint families that keep failing.
+
+    Each endpoint family (a path template such as /v1/private/loan/{id}/payment)
+    has its own circuit. After `failure_threshold` consecutive failures the
+    circuit opens and requests are refused with ServicingCircuitOpenError for
+    `recovery_timeout` seconds. It then lets `half_open_max_calls` trial
+    requests through; `success_threshold` successes close it again while any
+    failure re-opens it.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        success_threshold: int = 1,
+        failure_statuses: Iterable[int] = range(500, 600),
+    ):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open a circuit
+            recovery_timeout: Seconds an open circuit refuses requests
+            half_open_max_calls: Trial requests allowed at once while half-open
+            success_threshold: Successful trials needed to close a circuit
+            failure_statuses: Response statuses counted as failures (exceptions
+                raised while sending a request always are)
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.success_threshold = success_threshold
+        self.failure_statuses = frozenset(failure_statuses)
+        self._circuits: Dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def before_request(self, endpoint: str) -> None:
+        """
+        Raises:
+            ServicingCircuitOpenError if the circuit of `endpoint` is open
+        """
+        with self._lock:
+            circuit = self._circuits.get(endpoint)
+            if circuit is None or circuit.state is CircuitState.CLOSED:
+                return
+
+            if circuit.state is CircuitState.OPEN:
+                remaining = circuit.opened_at + self.recovery_timeout - time.monotonic()
+                if remaining > 0:
+                    raise ServicingCircuitOpenError(endpoint, remaining)
+                circuit.state = CircuitState.HALF_OPEN
+                circuit.successes = 0
+                circuit.trials = 0
+
+            if circuit.trials >= self.half_open_max_calls:
+                raise ServicingCircuitOpenError(endpoint, 0.0)
+            circuit.trials += 1
+
+    def record(self, endpoint: str, status: Optional[int] = None) -> None:
+        """Record the outcome of a request; a missing status means it raised."""
+        if status is not None and status not in self.failure_statuses:
+            self.record_success(endpoint)
+        else:
+            self.record_failure(endpoint)
+
+    def release(self, endpoint: str) -> None:
+        """Give back the trial of a request that ended without an outcome, e.g.
+        one that was cancelled or never sent."""
+        with self._lock:
+            circuit = self._circuits.get(endpoint)
+            if (
+                circuit is not None
+                and circuit.state is CircuitState.HALF_OPEN
+                and circuit.trials > 0
+            ):
+                circuit.trials -= 1
+
+    def record_success(self, endpoint: str) -> None:
+        with self._lock:
+            circuit = self._circuits.get(endpoint)
+            if circuit is None:
+                return
+            if circuit.state is CircuitState.HALF_OPEN:
+                circuit.trials -= 1
+                circuit.successes += 1
+                if circuit.successes < self.success_threshold:
+                    return
+            circuit.state = CircuitState.CLOSED
+            circuit.failures = 0
+
+    def record_failure(self, endpoint: str) -> None:
+        with self._lock:
+            circuit = self._circuits.setdefault(endpoint, _Circuit())
+            circuit.failures += 1
+            if (
+                circuit.state is CircuitState.HALF_OPEN
+                or circuit.failures >= self.failure_threshold
+            ):
+                circuit.state = CircuitState.OPEN
+                circuit.opened_at = time.monotonic()
+
+    def state(self, endpoint: str) -> CircuitState:
+        """Current state of the circuit of `endpoint`."""
+        with self._lock:
+            circuit = self._circuits.get(endpoint)
+            return self._current_state(circuit) if circuit else CircuitState.CLOSED
+
+    def states(self) -> Dict[str, CircuitState]:
+        """Current state of every endpoint family that has recorded a failure."""
+        with self._lock:
+            return {e: self._current_state(c) for e, c in self._circuits.items()}
+
+    def reset(self) -> None:
+        """Close every circuit."""
+        with self._lock:
+            self._circuits.clear()
+
+    def _current_state(self, circuit: _Circuit) -> CircuitState:
+        if (
+            circuit.state is CircuitState.OPEN
+            and time.monotonic() - circuit.opened_at >= self.recovery_timeout
+        ):
+            return CircuitState.HALF_OPEN
+        return circuit.state
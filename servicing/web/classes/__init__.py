@@ -1,16 +1,73 @@
 from abc import ABCMeta, abstractmethod
 from functools import wraps
-from typing import Callable, Iterable, Set, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Set, Tuple, Union
 
 from ...errors import ServicingObjectFormationError
+from ..codec import JsonCodec, StdlibJsonCodec, get_codec
+from ..json_writer import JsonWriter
+
+FIELD_COLLECTIONS = (set, frozenset, list, tuple)
+
+# Attribute values that are taken as they are by to_dict()
+SCALARS = frozenset((str, int, float, bool))
 
 
 class BaseObject:
+    __slots__ = ()
+
     def __str__(self):
         return f"<servicing.{self.__class__.__name__}>"
 
 
-class JsonObject(BaseObject, metaclass=ABCMeta):
+class JsonObjectMeta(ABCMeta):
+    """Gives each JsonObject subclass `__slots__` for the names in its
+    `attributes`, so that instances carry no per-instance `__dict__`.
+
+    Classes that declare `__slots__` themselves, or whose `attributes` is not
+    a plain collection, are left alone.
+    """
+
+    def __new__(mcs, name, bases, namespace, **kwargs):
+        if "__slots__" not in namespace:
+            attributes = namespace.get("attributes")
+            if attributes is None and bases:
+                attributes = getattr(bases[0], "attributes", None)
+            if isinstance(attributes, FIELD_COLLECTIONS):
+                inherited = {
+                    slot
+                    for base in bases
+                    for cls in base.__mro__
+                    for slot in cls.__dict__.get("__slots__", ())
+                }
+                namespace["__slots__"] = tuple(sorted(set(attributes) - inherited))
+        return super().__new__(mcs, name, bases, namespace, **kwargs)
+
+
+class JsonObject(BaseObject, metaclass=JsonObjectMeta):
+    # The _Cache of the results of to_dict() and to_json(), cleared whenever
+    # a public attribute is assigned
+    __slots__ = ("_cache",)
+
+    # Compiled once per subclass by __init_subclass__: the JsonValidator
+    # methods in name order, and the sorted attributes (None while
+    # `attributes` is not a plain collection)
+    _validators: Tuple[Callable[["JsonObject"], None], ...] = ()
+    _fields: Optional[Tuple[str, ...]] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        members = (getattr(cls, name, None) for name in dir(cls))
+        cls._validators = tuple(
+            member
+            for member in members
+            if callable(member) and hasattr(member, "validator")
+        )
+        attributes = getattr(cls, "attributes", None)
+        if isinstance(attributes, FIELD_COLLECTIONS):
+            cls._fields = tuple(sorted(attributes))
+        else:
+            cls._fields = None
+
     @property
     @abstractmethod
     def attributes(self) -> Set[str]:
@@ -22,57 +79,140 @@ class JsonObject(BaseObject, metaclass=ABCMeta):
         Raises:
           ServicingObjectFormationError if the object was not valid
         """
-        for attribute in (func for func in dir(self) if not func.startswith("__")):
-            method = getattr(self, attribute, None)
-            if callable(method) and hasattr(method, "validator"):
-                method()
+        for validator in self._validators:
+            validator(self)
 
     def get_non_null_attributes(self) -> dict:
         """
         Construct a dictionary out of non-null keys (from attributes property)
         present on this object
         """
+        return _copy_tree(self._non_null_attributes())
 
-        def to_dict_compatible(value: Union[dict, list, object]) -> Union[dict, list]:
-            if isinstance(value, list):
-                return [to_dict_compatible(v) for v in value]
-            else:
-                to_dict = getattr(value, "to_dict", None)
-                if to_dict and callable(to_dict):
-                    return {
-                        k: to_dict_compatible(v) for k, v in value.to_dict().items()
-                    }
-                else:
-                    return value
-
-        def is_not_empty(key: str) -> bool:
-            value = getattr(self, key, None)
-            if value is None:
-                return False
-            has_len = getattr(value, "__len__", None) is not None
-            if has_len:
-                return len(value) > 0
-            else:
-                return value is not None
-
+    def _non_null_attributes(self) -> dict:
+        """`get_non_null_attributes()` sharing the cached dictionaries of the
+        nested objects, which must not be modified."""
         return {
-            key: to_dict_compatible(getattr(self, key, None))
-            for key in sorted(self.attributes)
-            if is_not_empty(key)
+            key: _to_dict_compatible(value) for key, value in self._non_null_items()
         }
 
+    def _non_null_items(self) -> Iterator[Tuple[str, Any]]:
+        fields = self._fields
+        if fields is None:
+            fields = sorted(self.attributes)
+
+        for key in fields:
+            value = getattr(self, key, None)
+            if value is None:
+                continue
+            if getattr(value, "__len__", None) is not None and len(value) == 0:
+                continue
+            yield key, value
+
     def to_dict(self, *args) -> dict:
         """
         Extract this object as a JSON-compatible, Servicing-API-valid dictionary
 
+        The result is validated and built once, then copied from a cache until
+        an attribute of this object, or of an object nested in it, is assigned.
+        Lists and dictionaries can change in place, so objects holding any are
+        rebuilt every time.
+
         Args:
           *args: Any specific formatting args (rare; generally not required)
 
         Raises:
           ServicingObjectFormationError if the object was not valid
         """
+        return _copy_tree(self._dict())
+
+    def to_json(self, codec: Optional[JsonCodec] = None) -> bytes:
+        """
+        Encode `to_dict()` as JSON, caching the bytes like the dictionary
+
+        With the standard library codec the object is written straight to
+        bytes by JsonWriter, without building its dictionary.
+
+        Args:
+          codec: The codec to encode with (default: the standard library json)
+
+        Raises:
+          ServicingObjectFormationError if the object was not valid
+        """
+        if codec is None:
+            codec = _STDLIB_CODEC
+        cache = self._cached()
+        if cache is not None and codec.name in cache.encoded:
+            return cache.encoded[codec.name]
+
+        if type(codec) is StdlibJsonCodec:
+            body = _WRITER.dumps(self)
+        else:
+            body = codec.dumps(self._dict())
+        cache = self._cached() or self._new_cache()
+        if cache is not None:
+            cache.encoded[codec.name] = body
+        return body
+
+    def _dict(self) -> dict:
+        """The cached result of `to_dict()`, which must not be modified."""
+        cache = self._cached()
+        if cache is not None and cache.dict is not None:
+            return cache.dict
+
         self.validate_json()
-        return self.get_non_null_attributes()
+        data = self._non_null_attributes()
+        cache = cache or self._new_cache()
+        if cache is not None:
+            cache.dict = data
+        return data
+
+    def _write_json(self, writer: JsonWriter, out: bytearray) -> None:
+        cache = self._cached()
+        body = cache.encoded.get(_STDLIB_CODEC.name) if cache is not None else None
+        if body is not None:
+            out += body
+        elif type(self).to_dict is not JsonObject.to_dict:
+            writer.write(self.to_dict(), out)
+        else:
+            self.validate_json()
+            writer.write_items(self._non_null_items(), out)
+
+    def _cached(self) -> Optional["_Cache"]:
+        """The cache of this object, unless an object nested in it had an
+        attribute assigned since it was made."""
+        cache = getattr(self, "_cache", None)
+        if cache is not None:
+            for child, token in cache.children:
+                if child._cached() is not token:
+                    object.__setattr__(self, "_cache", None)
+                    return None
+        return cache
+
+    def _new_cache(self) -> Optional["_Cache"]:
+        """An empty cache for this object, or None if it holds values that can
+        change without an attribute being assigned."""
+        if type(self).to_dict is not JsonObject.to_dict:
+            return None
+        children = []
+        for _, value in self._non_null_items():
+            if type(value) in SCALARS:
+                continue
+            if isinstance(type(value), JsonObjectMeta):
+                token = value._cached() or value._new_cache()
+                if token is None:
+                    return None
+                children.append((value, token))
+            elif isinstance(value, (list, dict, set)) or hasattr(value, "to_dict"):
+                return None
+        cache = _Cache(tuple(children))
+        object.__setattr__(self, "_cache", cache)
+        return cache
+
+    def __setattr__(self, name: str, value) -> None:
+        object.__setattr__(self, name, value)
+        if name[0] != "_":
+            object.__setattr__(self, "_cache", None)
 
     def __repr__(self):
         dict_value = self.get_non_null_attributes()
@@ -82,6 +222,49 @@ class JsonObject(BaseObject, metaclass=ABCMeta):
             return self.__str__()
 
 
+_STDLIB_CODEC = get_codec("json")
+_WRITER = JsonWriter()
+
+
+class _Cache:
+    """The results of to_dict() and to_json() (by codec name) for an object,
+    with each nested object and its own _Cache at the time; they hold as long
+    as every nested object still has the same one."""
+
+    __slots__ = ("children", "dict", "encoded")
+
+    def __init__(self, children: Tuple[Tuple[JsonObject, "_Cache"], ...]):
+        self.children = children
+        self.dict: Optional[dict] = None
+        self.encoded: Dict[str, bytes] = {}
+
+
+def _copy_tree(value):
+    if type(value) in SCALARS:
+        return value
+    if isinstance(value, dict):
+        return {k: _copy_tree(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_tree(v) for v in value]
+    return value
+
+
+def _to_dict_compatible(value: Union[dict, list, object]) -> Union[dict, list]:
+    if isinstance(value, list):
+        return [_to_dict_compatible(v) for v in value]
+    if (
+        isinstance(type(value), JsonObjectMeta)
+        and type(value).to_dict is JsonObject.to_dict
+    ):
+        # Its dictionary is made of compatible values already; the parent's
+        # cache may share it since cached dictionaries are never modified
+        return value._dict()
+    to_dict = getattr(value, "to_dict", None)
+    if to_dict and callable(to_dict):
+        return {k: _to_dict_compatible(v) for k, v in to_dict().items()}
+    return value
+
+
 class JsonValidator:
     def __init__(self, message: str):
         """
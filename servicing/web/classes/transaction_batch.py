@@ -0,0 +1,260 @@
+import math
+from datetime import date, datetime, time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+from uuid import UUID
+
+from ...errors import ServicingBatchFormationError
+from ...util import parse_date
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+# Positions of the hyphens in the canonical text of a UUID
+_UUID_HYPHENS = (8, 13, 18, 23)
+
+
+class TransactionBatch:
+    """Transactions on many loans given as columns: a loan id, a date and an
+    amount per row, as NumPy arrays or Python sequences.
+
+    Every row is checked when the batch is created, column by column (with
+    NumPy, in vectorized passes); the rows that failed are listed in `errors`.
+    Request bodies are built one at a time as the batch is submitted, with
+    `ServicingClient.submit`, so that no model object is created per row.
+    """
+
+    # The LoanClient method that makes the request of a row, and the name of
+    # its argument taking the request body
+    method = ""
+    argument = ""
+
+    def __init__(
+        self,
+        *,
+        loan_ids: Sequence[Any],
+        dates: Sequence[Any],
+        amounts: Sequence[Any],
+        currency: Union[str, Sequence[str]] = "USD",
+        decimals: int = 2,
+    ):
+        """
+        Args:
+            loan_ids: The loan of each row, as UUIDs or strings
+            dates: The date of each row, as dates, "YYYY-MM-DD" strings or
+                datetime64 values; datetimes are accepted at midnight only
+            amounts: The amount of each row, as numbers, Decimals or strings;
+                strings and Decimals are sent as they are
+            currency: The currency of every row, or of each row
+            decimals: The number of decimals floating-point amounts are sent with
+
+        Raises:
+            ValueError if the columns do not have the same length
+        """
+        if isinstance(currency, str):
+            currency = [currency] * len(loan_ids)
+        if not len(loan_ids) == len(dates) == len(amounts) == len(currency):
+            raise ValueError("every column must have the same length")
+
+        self.decimals = decimals
+        self.errors: Dict[int, List[str]] = {}
+        self._loan_ids = self._column("loan_id", loan_ids, _vector_uuids, _uuid_text)
+        self._dates = self._column("date", dates, _vector_dates, _date_text)
+        self._amounts = self._column(
+            "amount",
+            amounts,
+            _vector_amounts,
+            lambda value: _amount_text(value, decimals),
+        )
+        self._currencies = self._column(
+            "currency", currency, _vector_currencies, _currency_text
+        )
+
+    def __len__(self):
+        return len(self._loan_ids)
+
+    def validate(self) -> None:
+        """
+        Raises:
+            ServicingBatchFormationError if any row was not valid
+        """
+        if self.errors:
+            raise ServicingBatchFormationError(self.errors)
+
+    def body(self, i: int) -> Dict[str, Any]:
+        """The request body of row `i`, as `to_dict()` of its model object."""
+        return {
+            "amount": {
+                "amount": _format_amount(self._amounts[i], self.decimals),
+                "currency": str(self._currencies[i]),
+            },
+            "date": str(self._dates[i]),
+        }
+
+    def calls(self) -> Iterator[Dict[str, Any]]:
+        """The keyword arguments of the `method` call of each row, built as
+        they are consumed.
+
+        Raises:
+            ServicingBatchFormationError if any row was not valid
+        """
+        self.validate()
+        return (
+            {"loan_id": str(self._loan_ids[i]), self.argument: self.body(i)}
+            for i in range(len(self))
+        )
+
+    def _column(self, name, values, vector, scalar):
+        """Convert a column to the text sent for each row, recording the rows
+        that cannot be; those rejected by `vector` get a second chance with
+        `scalar`, which accepts more forms than the fast path does."""
+        if np is None:
+            text: Any = [scalar(value) for value in values]
+            rejected = [i for i, t in enumerate(text) if t is None]
+        else:
+            values = np.asarray(values)
+            text, ok = vector(values)
+            rejected = []
+            failed = np.flatnonzero(~ok)
+            if failed.size:
+                text = text.astype(object)
+                for i in failed.tolist():
+                    text[i] = scalar(values[i])
+                    if text[i] is None:
+                        rejected.append(i)
+        for i in rejected:
+            value = values[i]
+            self.errors.setdefault(i, []).append(
+                f"{name} is required"
+                if _is_missing(value)
+                else f"{name} is not valid: {value!r}"
+            )
+        return text
+
+    def __repr__(self):
+        return (
+            f"<servicing.{self.__class__.__name__}: rows={len(self)}, "
+            f"invalid={len(self.errors)}>"
+        )
+
+
+class PaymentBatch(TransactionBatch):
+    method = "create_payment"
+    argument = "payment"
+
+
+class DrawBatch(TransactionBatch):
+    method = "draw_funds"
+    argument = "draw"
+
+
+class MiscFeeBatch(TransactionBatch):
+    method = "charge_misc_fee"
+    argument = "misc_fee"
+
+
+def _is_missing(value) -> bool:
+    # NaN and NaT are the missing values of NumPy columns
+    return value is None or value != value or isinstance(value, str) and not value
+
+
+def _uuid_text(value) -> Optional[str]:
+    if isinstance(value, UUID):
+        return str(value)
+    try:
+        return str(UUID(value))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def _vector_uuids(values):
+    text = values.astype(str)
+    ok = np.char.str_len(text) == 36
+    codes = text.astype("U36").view(np.uint32).reshape(len(text), 36)
+    hyphen = np.zeros(36, dtype=bool)
+    hyphen[list(_UUID_HYPHENS)] = True
+    digit = (codes >= ord("0")) & (codes <= ord("9"))
+    letter = (codes >= ord("a")) & (codes <= ord("f"))
+    ok &= np.where(hyphen, codes == ord("-"), digit | letter).all(axis=1)
+    return text, ok
+
+
+def _date_text(value) -> Optional[str]:
+    # A time of day is rejected rather than cut off, as in _vector_dates
+    if isinstance(value, datetime):
+        return value.date().isoformat() if value.time() == time() else None
+    if isinstance(value, date):
+        return date(value.year, value.month, value.day).isoformat()
+    if np is not None and isinstance(value, np.datetime64):
+        days = value.astype("datetime64[D]")
+        return None if np.isnat(value) or days != value else str(days)
+    try:
+        return parse_date(value).isoformat()
+    except (TypeError, ValueError):
+        return None
+
+
+def _vector_dates(values):
+    try:
+        days = values.astype("datetime64[D]")
+    except (TypeError, ValueError):
+        return values.astype(str), np.zeros(len(values), dtype=bool)
+    text = np.datetime_as_string(days, unit="D")
+    ok = ~np.isnat(days)
+    if values.dtype.kind == "M":
+        ok &= days == values
+    else:
+        # NumPy also reads "2020" and "2020-01-01T10:00" as days
+        ok &= text == values.astype(str)
+    return text, ok
+
+
+def _format_amount(value, decimals: int) -> str:
+    # Numeric columns are kept as numbers until their rows are sent
+    if isinstance(value, str):
+        return value
+    if isinstance(value, float) or np is not None and isinstance(value, np.floating):
+        return f"{value:.{decimals}f}"
+    return str(value)
+
+
+def _amount_text(value, decimals: int) -> Optional[str]:
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, float) or np is not None and isinstance(value, np.floating):
+        return f"{value:.{decimals}f}" if math.isfinite(value) else None
+    if isinstance(value, int) or np is not None and isinstance(value, np.integer):
+        return str(int(value))
+    text = str(value)
+    try:
+        return text if math.isfinite(float(text)) else None
+    except ValueError:
+        return None
+
+
+def _vector_amounts(values):
+    kind = values.dtype.kind
+    if kind in "iu":
+        return values, np.ones(len(values), dtype=bool)
+    if kind == "f":
+        return values, np.isfinite(values)
+    text = values.astype(str)
+    if kind not in "US":
+        # Decimals and mixed types are formatted one by one
+        return text, np.zeros(len(values), dtype=bool)
+    try:
+        return text, np.isfinite(text.astype(np.float64))
+    except ValueError:
+        return text, np.zeros(len(values), dtype=bool)
+
+
+def _currency_text(value) -> Optional[str]:
+    return value if isinstance(value, str) and value else None
+
+
+def _vector_currencies(values):
+    text = values.astype(str)
+    if values.dtype.kind not in "US":
+        return text, np.zeros(len(values), dtype=bool)
+    return text, np.char.str_len(text) > 0
@@ -1,9 +1,14 @@
-from datetime import date
-from typing import Optional, Union
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Union
 
 import abc
 
 from .base_client import BaseClient
+from .batch import BatchExecutor, BatchResult
+from .connection_pool import ConnectionPool
+from .deadline import Deadline, DeadlineArg
+from .dns_cache import DnsCache
+from .retry import RetryPolicy
 from .classes.enums import BenchmarkName, TrackerType, TransactionType, ViewType
 from .classes.forgiveness import Forgiveness
 from .classes.institution import Institution
@@ -12,47 +17,68 @@ from .classes.draw import Draw
 from .classes.fund import Fund
 from .classes.misc_fee import MiscFee
 from .classes.payment import Payment
+from .classes.transaction_batch import TransactionBatch
 from .classes.user import User
 from .servicing_response import ServicingResponse
 from uuid import UUID
+from ..finance.business_day_calendar import BusinessDayCalendar
 from ..util import is_uuid, RequireUuid, format_date
-from ..errors import ServicingInvalidPathParamError
+from ..errors import ServicingClientError, ServicingInvalidPathParamError
 
 
 class ResourceClient(abc.ABC):
     def __init__(self, *, client: BaseClient):
         self.api_call = client.api_call
+        self.api_stream = client.api_stream
 
 
 class InstitutionClient(ResourceClient):
-    def register(self, *, institution: Institution) -> ServicingResponse:
+    def register(
+        self, *, institution: Institution, deadline: DeadlineArg = None
+    ) -> ServicingResponse:
         return self.api_call(
-            method="POST", path="/v1/private/institution", data=institution.to_dict()
+            method="POST",
+            path="/v1/private/institution",
+            data=institution,
+            deadline=deadline,
         )
 
-    def get(self, *, institution_id: UUID) -> ServicingResponse:
+    def get(
+        self, *, institution_id: UUID, deadline: DeadlineArg = None
+    ) -> ServicingResponse:
         if not is_uuid(institution_id):
             raise ServicingInvalidPathParamError
         return self.api_call(
-            method="GET", path=f"/v1/private/institution/{institution_id}"
+            method="GET",
+            path=f"/v1/private/institution/{institution_id}",
+            deadline=deadline,
         )
 
-    def get_all(self):
-        return self.api_call(method="GET", path="/v1/private/institution")
+    def get_all(self, *, deadline: DeadlineArg = None):
+        return self.api_call(
+            method="GET", path="/v1/private/institution", deadline=deadline
+        )
 
-    def create_fund(self, *, institution_id: UUID, fund: Fund) -> ServicingResponse:
+    def create_fund(
+        self, *, institution_id: UUID, fund: Fund, deadline: DeadlineArg = None
+    ) -> ServicingResponse:
         if not is_uuid(institution_id):
             raise ServicingInvalidPathParamError
         return self.api_call(
             method="POST",
             path=f"/v1/private/institution/{institution_id}/fund",
-            data=fund.to_dict(),
+            data=fund,
+            deadline=deadline,
         )
 
-    def get_fund(self, *, fund_id: UUID) -> ServicingResponse:
+    def get_fund(
+        self, *, fund_id: UUID, deadline: DeadlineArg = None
+    ) -> ServicingResponse:
         if not is_uuid(fund_id):
             raise ServicingInvalidPathParamError
-        return self.api_call(method="GET", path=f"/v1/private/fund/{fund_id}")
+        return self.api_call(
+            method="GET", path=f"/v1/private/fund/{fund_id}", deadline=deadline
+        )
 
     def list_loans(
         self,
@@ -60,6 +86,7 @@ class InstitutionClient(ResourceClient):
         institution_id: UUID,
         view: ViewType = ViewType.BASIC,
         include_voided: bool = False,
+        deadline: DeadlineArg = None,
     ) -> ServicingResponse:
         if not is_uuid(institution_id):
             raise ServicingInvalidPathParamError
@@ -67,17 +94,46 @@ class InstitutionClient(ResourceClient):
             method="GET",
             path=f"/v1/private/institution/{institution_id}/loan",
             query_params={"view": view.value, "includeVoided": include_voided},
+            deadline=deadline,
+        )
+
+    def iter_loans(
+        self,
+        *,
+        institution_id: UUID,
+        view: ViewType = ViewType.BASIC,
+        include_voided: bool = False,
+        deadline: DeadlineArg = None,
+    ) -> Iterator[dict]:
+        """Like `list_loans`, but yields each loan as soon as it has been received
+        instead of reading the whole list into memory."""
+        if not is_uuid(institution_id):
+            raise ServicingInvalidPathParamError
+        return self.api_stream(
+            method="GET",
+            path=f"/v1/private/institution/{institution_id}/loan",
+            query_params={"view": view.value, "includeVoided": include_voided},
+            deadline=deadline,
         )
 
 
 class LoanClient(ResourceClient):
-    def register(self, *, loan: Loan) -> ServicingResponse:
+    def register(
+        self, *, loan: Loan, deadline: DeadlineArg = None
+    ) -> ServicingResponse:
         return self.api_call(
-            method="POST", path="/v1/private/loan", data=loan.to_dict()
+            method="POST",
+            path="/v1/private/loan",
+            data=loan,
+            deadline=deadline,
         )
 
     def get(
-        self, *, loan_id: UUID, view: Optional[ViewType] = None
+        self,
+        *,
+        loan_id: UUID,
+        view: Optional[ViewType] = None,
+        deadline: DeadlineArg = None,
     ) -> ServicingResponse:
         if not is_uuid(loan_id):
             raise ServicingInvalidPathParamError
@@ -88,25 +144,41 @@ class LoanClient(ResourceClient):
             query_params["view"] = view.value
 
         return self.api_call(
-            method="GET", path=f"/v1/private/loan/{loan_id}", query_params=query_params
+            method="GET",
+            path=f"/v1/private/loan/{loan_id}",
+            query_params=query_params,
+            deadline=deadline,
         )
 
-    def update(self, *, loan_id: UUID, loan: Loan) -> ServicingResponse:
+    def update(
+        self, *, loan_id: UUID, loan: Loan, deadline: DeadlineArg = None
+    ) -> ServicingResponse:
         if not is_uuid(loan_id):
             raise ServicingInvalidPathParamError
         return self.api_call(
-            method="PUT", path=f"/v1/private/loan/{loan_id}", data=loan.to_dict()
+            method="PUT",
+            path=f"/v1/private/loan/{loan_id}",
+            data=loan,
+            deadline=deadline,
         )
 
-    def get_invoice(self, *, loan_id: UUID, period_number: int):
+    def get_invoice(
+        self, *, loan_id: UUID, period_number: int, deadline: DeadlineArg = None
+    ):
         if not is_uuid(loan_id):
             raise ServicingInvalidPathParamError
         return self.api_call(
-            method="GET", path=f"/v1/private/loan/{loan_id}/invoice/{period_number}"
+            method="GET",
+            path=f"/v1/private/loan/{loan_id}/invoice/{period_number}",
+            deadline=deadline,
         )
 
     def list_transactions(
-        self, *, loan_id: UUID, transaction_type: Optional[TransactionType] = None
+        self,
+        *,
+        loan_id: UUID,
+        transaction_type: Optional[TransactionType] = None,
+        deadline: DeadlineArg = None,
     ):
         if not is_uuid(loan_id):
             raise ServicingInvalidPathParamError
@@ -120,6 +192,31 @@ class LoanClient(ResourceClient):
             method="GET",
             path=f"/v1/private/loan/{loan_id}/transaction",
             query_params=query_params,
+            deadline=deadline,
+        )
+
+    def iter_transactions(
+        self,
+        *,
+        loan_id: UUID,
+        transaction_type: Optional[TransactionType] = None,
+        deadline: DeadlineArg = None,
+    ) -> Iterator[dict]:
+        """Like `list_transactions`, but yields each transaction as soon as it has
+        been received instead of reading the whole list into memory."""
+        if not is_uuid(loan_id):
+            raise ServicingInvalidPathParamError
+
+        query_params = {}
+
+        if transaction_type is not None:
+            query_params["type"] = transaction_type.value
+
+        return self.api_stream(
+            method="GET",
+            path=f"/v1/private/loan/{loan_id}/transaction",
+            query_params=query_params,
+            deadline=deadline,
         )
 
     @RequireUuid("loan_id")
@@ -129,6 +226,7 @@ class LoanClient(ResourceClient):
         loan_id: UUID,
         end_date: Optional[Union[date, str]] = None,
         tracker_type: Optional[TrackerType] = None,
+        deadline: DeadlineArg = None,
     ):
         query_params = {}
 
@@ -141,117 +239,309 @@ class LoanClient(ResourceClient):
             method="GET",
             path=f"/v1/private/loan/{loan_id}/tracker",
             query_params=query_params,
+            deadline=deadline,
         )
 
-    def draw_funds(self, *, loan_id: UUID, draw: Draw) -> ServicingResponse:
+    def draw_funds(
+        self, *, loan_id: UUID, draw: Union[Draw, dict], deadline: DeadlineArg = None
+    ) -> ServicingResponse:
         if not is_uuid(loan_id):
             raise ServicingInvalidPathParamError
         return self.api_call(
-            method="POST", path=f"/v1/private/loan/{loan_id}/draw", data=draw.to_dict()
+            method="POST",
+            path=f"/v1/private/loan/{loan_id}/draw",
+            data=draw,
+            deadline=deadline,
         )
 
-    def create_payment(self, *, loan_id: UUID, payment: Payment) -> ServicingResponse:
+    def create_payment(
+        self,
+        *,
+        loan_id: UUID,
+        payment: Union[Payment, dict],
+        deadline: DeadlineArg = None,
+    ) -> ServicingResponse:
         if not is_uuid(loan_id):
             raise ServicingInvalidPathParamError
         return self.api_call(
             method="POST",
             path=f"/v1/private/loan/{loan_id}/payment",
-            data=payment.to_dict(),
+            data=payment,
+            deadline=deadline,
         )
 
-    def charge_misc_fee(self, *, loan_id: UUID, misc_fee: MiscFee):
+    def charge_misc_fee(
+        self,
+        *,
+        loan_id: UUID,
+        misc_fee: Union[MiscFee, dict],
+        deadline: DeadlineArg = None,
+    ):
         if not is_uuid(loan_id):
             raise ServicingInvalidPathParamError
         return self.api_call(
             method="POST",
             path=f"/v1/private/loan/{loan_id}/fee",
-            data=misc_fee.to_dict(),
+            data=misc_fee,
+            deadline=deadline,
         )
 
-    def forgive_principal(self, *, loan_id: UUID, forgiveness: Forgiveness):
+    def forgive_principal(
+        self, *, loan_id: UUID, forgiveness: Forgiveness, deadline: DeadlineArg = None
+    ):
         if not is_uuid(loan_id):
             raise ServicingInvalidPathParamError
         return self.api_call(
             method="POST",
             path=f"/v1/private/loan/{loan_id}/forgiveness",
-            data=forgiveness.to_dict(),
+            data=forgiveness,
+            deadline=deadline,
         )
 
-    def void(self, *, loan_id: UUID) -> ServicingResponse:
+    def void(self, *, loan_id: UUID, deadline: DeadlineArg = None) -> ServicingResponse:
         if not is_uuid(loan_id):
             raise ServicingInvalidPathParamError
-        return self.api_call(method="POST", path=f"/v1/private/loan/{loan_id}/void",)
+        return self.api_call(
+            method="POST", path=f"/v1/private/loan/{loan_id}/void", deadline=deadline
+        )
 
 
 class TransactionClient(ResourceClient):
-    def get(self, *, transaction_id: UUID):
+    def get(self, *, transaction_id: UUID, deadline: DeadlineArg = None):
         if not is_uuid(transaction_id):
             raise ServicingInvalidPathParamError
 
         return self.api_call(
-            method="GET", path=f"/v1/private/transaction/{transaction_id}"
+            method="GET",
+            path=f"/v1/private/transaction/{transaction_id}",
+            deadline=deadline,
         )
 
-    def void(self, *, transaction_id: UUID):
+    def void(self, *, transaction_id: UUID, deadline: DeadlineArg = None):
         if not is_uuid(transaction_id):
             raise ServicingInvalidPathParamError
 
         return self.api_call(
-            method="POST", path=f"/v1/private/transaction/{transaction_id}/void"
+            method="POST",
+            path=f"/v1/private/transaction/{transaction_id}/void",
+            deadline=deadline,
         )
 
 
 class UserClient(ResourceClient):
-    def get_all(self):
-        return self.api_call(method="GET", path="/v1/private/user")
+    def get_all(self, *, deadline: DeadlineArg = None):
+        return self.api_call(method="GET", path="/v1/private/user", deadline=deadline)
 
-    def create(self, *, user: User):
+    def create(self, *, user: User, deadline: DeadlineArg = None):
         return self.api_call(
-            method="POST", path="/v1/private/user", data=user.to_dict()
+            method="POST",
+            path="/v1/private/user",
+            data=user,
+            deadline=deadline,
         )
 
-    def get(self, *, user_id: UUID):
+    def get(self, *, user_id: UUID, deadline: DeadlineArg = None):
         if not is_uuid(user_id):
             raise ServicingInvalidPathParamError
-        return self.api_call(method="POST", path=f"/v1/private/user/{user_id}")
+        return self.api_call(
+            method="POST", path=f"/v1/private/user/{user_id}", deadline=deadline
+        )
 
 
 class ServicingClient(BaseClient):
-    def __init__(self, **kwargs):
+    def __init__(
+        self,
+        *,
+        max_workers: int = 16,
+        calendar: Optional[BusinessDayCalendar] = None,
+        **kwargs,
+    ):
+        """
+        Args:
+            max_workers: Number of calls run at once by `batch`; also the number
+                of idle connections kept by the default connection pool and
+                half the hedging threads of a `hedging_policy` without its own
+            calendar: Answers `next_business_day` and `previous_business_day`
+                locally for the dates it covers
+            **kwargs: Passed on to BaseClient
+        """
+        if "pool" not in kwargs:
+            kwargs["pool"] = ConnectionPool(
+                maxsize=max_workers, ssl=kwargs.get("ssl"), dns_cache=DnsCache()
+            )
+        if "retry_policy" not in kwargs:
+            kwargs["retry_policy"] = RetryPolicy()
         super().__init__(**kwargs)
+        if self.hedging_policy is not None and self.hedging_policy.max_workers is None:
+            # A primary and a hedge for each of the calls run at once
+            self.hedging_policy.max_workers = 2 * max_workers
+        self.batch_executor = BatchExecutor(max_workers=max_workers)
+        self.calendar = calendar
         self.institution = InstitutionClient(client=self)
         self.loan = LoanClient(client=self)
         self.user = UserClient(client=self)
         self.transaction = TransactionClient(client=self)
 
-    def status(self) -> ServicingResponse:
-        return self.api_call(method="GET", path="/v1/public/status")
+    def batch(
+        self,
+        func: Callable[..., Any],
+        calls: Iterable[Dict[str, Any]],
+        *,
+        ordered: bool = True,
+        validate: bool = False,
+        deadline: DeadlineArg = None,
+    ) -> Iterator[BatchResult]:
+        """
+        Run many calls of a resource client method concurrently, e.g.
+        `client.batch(client.loan.get, ({"loan_id": i} for i in loan_ids))`.
+
+        Args:
+            func: The method to call
+            calls: The keyword arguments of each call
+            ordered: Yield results in input order (True) or as they complete (False)
+            validate: Report unsuccessful responses as per-item errors
+            deadline: A Deadline, or seconds from now, shared by all the calls;
+                calls not started by then fail with ServicingTimeoutError
+
+        Returns:
+            An iterator of BatchResult, one per call
+        """
+        return self.batch_executor.run(
+            func,
+            calls,
+            ordered=ordered,
+            validate=validate,
+            deadline=Deadline.coerce(deadline),
+        )
+
+    def submit(
+        self,
+        batch: TransactionBatch,
+        *,
+        ordered: bool = True,
+        validate: bool = True,
+        deadline: DeadlineArg = None,
+    ) -> Iterator[BatchResult]:
+        """
+        Make the request of every row of a PaymentBatch, DrawBatch or
+        MiscFeeBatch concurrently, like `batch`.
+
+        Args:
+            batch: The rows to submit
+            ordered: Yield results in row order (True) or as they complete (False)
+            validate: Report unsuccessful responses as per-row errors
+            deadline: A Deadline, or seconds from now, shared by all the rows
+
+        Returns:
+            An iterator of BatchResult, whose index is the row
+
+        Raises:
+            ServicingBatchFormationError if any row was not valid; nothing is
+            sent then
+        """
+        return self.batch(
+            getattr(self.loan, batch.method),
+            batch.calls(),
+            ordered=ordered,
+            validate=validate,
+            deadline=deadline,
+        )
+
+    def warm_reference_cache(
+        self,
+        *,
+        start: date,
+        end: date,
+        benchmark_names: Iterable[BenchmarkName] = tuple(BenchmarkName),
+        business_days: bool = True,
+    ) -> int:
+        """
+        Fetch the benchmark rates and business-day answers of every date from
+        `start` to `end` (inclusive) into the reference cache, so that later
+        lookups, in this or any other process sharing the cache, need no
+        request. Dates that are already cached are not fetched again.
+
+        Returns:
+            The number of successful lookups
+
+        Raises:
+            ServicingClientError if the client has no reference cache
+        """
+        if self.reference_cache is None:
+            raise ServicingClientError("The client has no reference cache to warm up")
+
+        days = [
+            (start + timedelta(days=n)).isoformat()
+            for n in range((end - start).days + 1)
+        ]
+        rates = [
+            {"benchmark_name": name, "date": day}
+            for name in benchmark_names
+            for day in days
+        ]
+        batches = [(self.get_benchmark_rate, rates)]
+        if business_days:
+            batches.append((self.next_business_day, [{"date": d} for d in days]))
+            batches.append((self.previous_business_day, [{"date": d} for d in days]))
+
+        return sum(
+            result.ok
+            for func, calls in batches
+            for result in self.batch(func, calls, ordered=False, validate=True)
+        )
 
-    def get_acl(self, oid: UUID):
+    def status(self, *, deadline: DeadlineArg = None) -> ServicingResponse:
+        return self.api_call(method="GET", path="/v1/public/status", deadline=deadline)
+
+    def get_acl(self, oid: UUID, *, deadline: DeadlineArg = None):
         if not is_uuid(oid):
             raise ServicingInvalidPathParamError
-        return self.api_call(method="GET", path=f"/v1/private/acl{oid}")
+        return self.api_call(
+            method="GET", path=f"/v1/private/acl{oid}", deadline=deadline
+        )
 
-    def login(self, *, email: str, password: str) -> ServicingResponse:
+    def login(
+        self, *, email: str, password: str, deadline: DeadlineArg = None
+    ) -> ServicingResponse:
         return self.api_call(
             method="POST",
             path="/v1/public/token",
             data={"email": email, "password": password},
+            deadline=deadline,
         )
 
     def get_benchmark_rate(
-        self, *, benchmark_name: BenchmarkName, date: str
+        self, *, benchmark_name: BenchmarkName, date: str, deadline: DeadlineArg = None
     ) -> ServicingResponse:
         return self.api_call(
-            method="GET", path=f"/v1/public/benchmark/{benchmark_name.value}/{date}"
+            method="GET",
+            path=f"/v1/public/benchmark/{benchmark_name.value}/{date}",
+            deadline=deadline,
         )
 
-    def next_business_day(self, *, date: str) -> ServicingResponse:
-        return self.api_call(
-            method="GET", path=f"/v1/public/finance/next-business-day/{date}"
-        )
+    def next_business_day(
+        self, *, date: str, deadline: DeadlineArg = None
+    ) -> ServicingResponse:
+        path = f"/v1/public/finance/next-business-day/{date}"
+        if self.calendar is not None and self.calendar.covers(date):
+            return self._calendar_response(path, self.calendar.next_business_day(date))
+        return self.api_call(method="GET", path=path, deadline=deadline)
 
-    def previous_business_day(self, *, date: str) -> ServicingResponse:
-        return self.api_call(
-            method="GET", path=f"/v1/public/finance/previous-business-day/{date}"
+    def previous_business_day(
+        self, *, date: str, deadline: DeadlineArg = None
+    ) -> ServicingResponse:
+        path = f"/v1/public/finance/previous-business-day/{date}"
+        if self.calendar is not None and self.calendar.covers(date):
+            return self._calendar_response(
+                path, self.calendar.previous_business_day(date)
+            )
+        return self.api_call(method="GET", path=path, deadline=deadline)
+
+    def _calendar_response(self, path: str, day) -> ServicingResponse:
+        return ServicingResponse(
+            method="GET",
+            url=self._get_url(path),
+            headers={},
+            status=200,
+            data={"date": day.isoformat()},
         )
@@ -0,0 +1,117 @@
+import json
+from abc import ABCMeta, abstractmethod
+from decimal import Decimal
+from typing import Any, Union
+from uuid import UUID
+
+from ..errors import ServicingClientError
+
+
+class JSONEncoder(json.JSONEncoder):
+    def default(self, obj):
+        if isinstance(obj, UUID):
+            return str(obj)
+        elif isinstance(obj, Decimal):
+            return str(obj)
+        else:
+            return json.JSONEncoder.default(self, obj)
+
+
+def _default(obj):
+    """Fallback used by the third-party encoders for types they do not know."""
+    if isinstance(obj, (UUID, Decimal)):
+        return str(obj)
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
+
+class JsonCodec(metaclass=ABCMeta):
+    """Encodes request bodies and decodes response bodies.
+
+    UUIDs and Decimals (money amounts) are encoded as strings by every codec.
+    """
+
+    name = ""
+
+    @abstractmethod
+    def dumps(self, value: Any) -> bytes:
+        """Encode a JSON-compatible value as UTF-8 bytes"""
+
+    @abstractmethod
+    def loads(self, data: bytes) -> Any:
+        """Decode UTF-8 JSON bytes"""
+
+    def __repr__(self):
+        return f"<servicing.{self.__class__.__name__}>"
+
+
+class StdlibJsonCodec(JsonCodec):
+    name = "json"
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, cls=JSONEncoder).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._dumps = orjson.dumps
+        self._loads = orjson.loads
+
+    def dumps(self, value: Any) -> bytes:
+        return self._dumps(value, default=_default)
+
+    def loads(self, data: bytes) -> Any:
+        return self._loads(data)
+
+
+class UjsonCodec(JsonCodec):
+    name = "ujson"
+
+    def __init__(self):
+        import ujson
+
+        self._dumps = ujson.dumps
+        self._loads = ujson.loads
+
+    def dumps(self, value: Any) -> bytes:
+        return self._dumps(value, default=_default, ensure_ascii=False).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        return self._loads(data)
+
+
+CODECS = {c.name: c for c in (StdlibJsonCodec, OrjsonCodec, UjsonCodec)}
+
+# Fastest first; "auto" picks the first one that is installed
+AUTO_PREFERENCE = ("orjson", "ujson", "json")
+
+
+def get_codec(codec: Union[str, JsonCodec] = "json") -> JsonCodec:
+    """
+    Args:
+        codec: A JsonCodec instance, one of "json", "orjson" and "ujson", or
+            "auto" for the fastest one installed
+
+    Raises:
+        ServicingClientError if the requested codec is unknown or not installed
+    """
+    if isinstance(codec, JsonCodec):
+        return codec
+    if codec == "auto":
+        for name in AUTO_PREFERENCE:
+            try:
+                return CODECS[name]()
+            except ImportError:
+                continue
+    if codec not in CODECS:
+        raise ServicingClientError(f"Unknown JSON codec: {codec}")
+    try:
+        return CODECS[codec]()
+    except ImportError as e:
+        raise ServicingClientError(f"JSON codec {codec} is not installed") from e
@@ -0,0 +1,181 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import List, Optional
+
+from ..errors import ServicingTimeoutError
+
+
+class LimitSnapshot:
+    """The state of an AdaptiveConcurrencyLimiter after one sample window."""
+
+    __slots__ = ("time", "limit", "p50", "p95", "p99", "error_rate")
+
+    def __init__(self, *, time, limit, p50, p95, p99, error_rate):
+        self.time = time
+        self.limit = limit
+        self.p50 = p50
+        self.p95 = p95
+        self.p99 = p99
+        self.error_rate = error_rate
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return (
+            f"<servicing.LimitSnapshot: limit={self.limit}, p95={self.p95:.3f}s, "
+            f"error_rate={self.error_rate:.2%}>"
+        )
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class AdaptiveConcurrencyLimiter:
+    """Finds the number of requests to keep in flight with AIMD.
+
+    Requests wait for a slot while `limit` of them are in flight. After every
+    `window` completed requests the limit grows by `increase` if the window
+    looked healthy, and is multiplied by `decrease` if more than
+    `max_error_rate` of the requests failed (429, 5xx or an exception) or if
+    its p95 latency exceeded `latency_tolerance` times the best p95 of the
+    recent windows.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        window: int = 50,
+        increase: int = 1,
+        decrease: float = 0.5,
+        max_error_rate: float = 0.05,
+        latency_tolerance: float = 2.0,
+        history_size: int = 1000,
+    ):
+        """
+        Args:
+            initial_limit: Requests in flight at first
+            min_limit: The limit never drops below this
+            max_limit: The limit never grows above this
+            window: Completed requests per adjustment
+            increase: Added to the limit after a healthy window
+            decrease: Factor applied to the limit after an unhealthy window
+            max_error_rate: Highest healthy share of failed requests
+            latency_tolerance: Highest healthy ratio of p95 to the baseline p95
+            history_size: Number of snapshots kept in `history`
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.window = window
+        self.increase = increase
+        self.decrease = decrease
+        self.max_error_rate = max_error_rate
+        self.latency_tolerance = latency_tolerance
+        self._limit = max(min_limit, min(max_limit, initial_limit))
+        self._in_flight = 0
+        self._latencies: List[float] = []
+        self._errors = 0
+        self._history = deque(maxlen=history_size)
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._async_waiters = []
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def history(self) -> List[LimitSnapshot]:
+        with self._lock:
+            return list(self._history)
+
+    def acquire(self, timeout: Optional[float] = None) -> None:
+        """Block until a request may be sent.
+
+        Raises:
+            ServicingTimeoutError if no slot frees up within `timeout` seconds
+        """
+        with self._available:
+            if not self._available.wait_for(
+                lambda: self._in_flight < self._limit, timeout
+            ):
+                raise ServicingTimeoutError(
+                    f"No request slot freed up within {timeout:.3f}s"
+                )
+            self._in_flight += 1
+
+    async def acquire_async(self, timeout: Optional[float] = None) -> None:
+        loop = asyncio.get_event_loop()
+        expires_at = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                if self._in_flight < self._limit:
+                    self._in_flight += 1
+                    return
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            remaining = None if expires_at is None else expires_at - time.monotonic()
+            try:
+                await asyncio.wait_for(waiter, remaining)
+            except asyncio.TimeoutError:
+                raise ServicingTimeoutError(
+                    f"No request slot freed up within {timeout:.3f}s"
+                ) from None
+
+    def release(self, latency: float, status: Optional[int] = None) -> None:
+        """Record a completed request; a missing status means it raised."""
+        with self._lock:
+            self._in_flight -= 1
+            self._latencies.append(latency)
+            if status is None or status == 429 or status >= 500:
+                self._errors += 1
+            if len(self._latencies) >= self.window:
+                self._adjust()
+            self._notify()
+
+    def _adjust(self) -> None:
+        ordered = sorted(self._latencies)
+        p50, p95, p99 = (_percentile(ordered, q) for q in (0.5, 0.95, 0.99))
+        error_rate = self._errors / len(ordered)
+        self._latencies = []
+        self._errors = 0
+
+        recent = list(self._history)[-20:]
+        # Against the same percentile, so that a steady heavy tail is healthy
+        baseline = min([s.p95 for s in recent] + [p95])
+        if error_rate > self.max_error_rate or p95 > self.latency_tolerance * baseline:
+            limit = int(self._limit * self.decrease)
+        else:
+            limit = self._limit + self.increase
+        self._limit = max(self.min_limit, min(self.max_limit, limit))
+        self._history.append(
+            LimitSnapshot(
+                time=time.time(),
+                limit=self._limit,
+                p50=p50,
+                p95=p95,
+                p99=p99,
+                error_rate=error_rate,
+            )
+        )
+
+    def _notify(self) -> None:
+        self._available.notify_all()
+        waiters, self._async_waiters = self._async_waiters, []
+        for loop, waiter in waiters:
+            loop.call_soon_threadsafe(_wake, waiter)
+
+
+def _wake(waiter: "asyncio.Future") -> None:
+    if not waiter.done():
+        waiter.set_result(None)
@@ -0,0 +1,367 @@
+import logging
+import select
+import threading
+import time
+from collections import deque
+from http.client import (
+    BadStatusLine,
+    HTTPConnection,
+    HTTPMessage,
+    HTTPResponse,
+    HTTPSConnection,
+)
+from concurrent.futures import ThreadPoolExecutor
+from ssl import (
+    SSLContext,
+    SSLSession,
+    SSLSocket,
+    SSLWantReadError,
+    create_default_context,
+)
+from typing import Deque, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from ..errors import ServicingRequestError
+from .dns_cache import DnsCache
+
+HostKey = Tuple[str, str, int]
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Methods whose requests may be resent without asking (RFC 7231, 4.2.2)
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "TRACE", "PUT", "DELETE"})
+
+
+class ConnectionPool:
+    """A thread-safe pool of persistent (keep-alive) HTTP connections.
+
+    Connections are kept per (scheme, host, port) so that consecutive requests
+    to the Servicing API reuse the same TCP connection and TLS session instead
+    of paying for a new handshake every time. New connections to a host resume
+    the TLS session of an earlier one, which saves most of the handshake.
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int = 10,
+        idle_timeout: Optional[float] = 60.0,
+        ssl: Optional[SSLContext] = None,
+        dns_cache: Optional[DnsCache] = None,
+    ):
+        """
+        Args:
+            maxsize: Maximum number of idle connections kept per host
+            idle_timeout: Seconds after which an idle connection is discarded
+                instead of being reused (None keeps them forever)
+            ssl: SSL context used for https connections
+            dns_cache: Resolves the host names of new connections
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be greater than 0")
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self.ssl = ssl
+        self.dns_cache = dns_cache
+        self._idle: Dict[HostKey, Deque[Tuple[HTTPConnection, float]]] = {}
+        self._tls_sessions: Dict[HostKey, SSLSession] = {}
+        self._lock = threading.Lock()
+        self.__logger = logging.getLogger(__name__)
+
+    def urlopen(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes] = None,
+        headers: Optional[dict] = None,
+        *,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+    ) -> Tuple[int, HTTPMessage, bytes]:
+        """Send a request over a pooled connection and read the whole response.
+
+        Returns:
+            A (status, headers, body) tuple
+        """
+        response = self.open(
+            method,
+            url,
+            body=body,
+            headers=headers,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+        )
+        try:
+            data = response.read()
+        finally:
+            response.close()
+        return response.status, response.headers, data
+
+    def open(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes] = None,
+        headers: Optional[dict] = None,
+        *,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+    ) -> "PooledResponse":
+        """Send a request over a pooled connection without reading the body.
+
+        The connection goes back to the pool when the returned response is
+        closed after its body has been read completely. Requests with an
+        idempotent method are sent once more on a new connection if a reused
+        one turns out to have been closed by the server.
+
+        Args:
+            connect_timeout: Seconds allowed to open a new connection
+            read_timeout: Seconds allowed for each read from the socket,
+                including while the response body is read
+        """
+        timeouts = connect_timeout, read_timeout
+        key, target = self._split_url(url)
+
+        conn, reused = self._get_connection(key)
+        try:
+            try:
+                response = self._send(conn, method, target, body, headers, *timeouts)
+            except (ConnectionError, BadStatusLine) as e:
+                conn.close()
+                if not reused or method.upper() not in IDEMPOTENT_METHODS:
+                    raise
+                # The server closed the keep-alive connection between our
+                # stale check and the request; reconnect once transparently.
+                # Other requests may have been acted on, so whether to send
+                # them again is left to the RetryPolicy.
+                self.__logger.debug(f"Reconnecting to {key[1]}:{key[2]} after: {e}")
+                conn = self._new_connection(key)
+                response = self._send(conn, method, target, body, headers, *timeouts)
+        except BaseException:
+            conn.close()
+            raise
+
+        return PooledResponse(self, key, conn, response)
+
+    def warm_up(
+        self,
+        url: str,
+        n: Optional[int] = None,
+        *,
+        connect_timeout: Optional[float] = None,
+    ) -> int:
+        """Open connections to the host of `url` ahead of time so that the
+        first requests skip the DNS lookup and the TCP and TLS handshakes.
+
+        The first connection is opened alone so that the others can resume
+        its TLS session.
+
+        Args:
+            n: Number of idle connections wanted (at most, and by default,
+                `maxsize`)
+
+        Returns:
+            The number of idle connections to the host
+        """
+        key, _ = self._split_url(url)
+        wanted = self.maxsize if n is None else min(n, self.maxsize)
+        missing = wanted - self.num_idle(url)
+        if missing <= 0:
+            return self.num_idle(url)
+
+        def connect(_=None):
+            conn = self._new_connection(key)
+            if connect_timeout is not None:
+                conn.timeout = connect_timeout
+            conn.connect()
+            # Also takes in the session tickets a TLS 1.3 server sends after
+            # the handshake, which makes the session resumable.
+            if self._is_stale(conn):
+                conn.close()
+            else:
+                self._put_connection(key, conn)
+
+        connect()
+        if missing > 1:
+            with ThreadPoolExecutor(max_workers=missing - 1) as executor:
+                list(executor.map(connect, range(missing - 1)))
+        return self.num_idle(url)
+
+    def close(self) -> None:
+        """Close every idle connection held by the pool."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn, _ in connections:
+                conn.close()
+
+    def num_idle(self, url: Optional[str] = None) -> int:
+        """Number of idle connections held for the host of `url` (or in total)."""
+        with self._lock:
+            if url is None:
+                return sum(len(c) for c in self._idle.values())
+            return len(self._idle.get(self._split_url(url)[0], ()))
+
+    @staticmethod
+    def _send(
+        conn: HTTPConnection,
+        method: str,
+        target: str,
+        body: Optional[bytes],
+        headers: Optional[dict],
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+    ) -> HTTPResponse:
+        if conn.sock is None:
+            if connect_timeout is not None:
+                conn.timeout = connect_timeout
+            conn.connect()
+        conn.sock.settimeout(read_timeout)
+        conn.request(method, target, body=body, headers=headers or {})
+        return conn.getresponse()
+
+    @staticmethod
+    def _split_url(url: str) -> Tuple[HostKey, str]:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in DEFAULT_PORTS or not parts.hostname:
+            raise ServicingRequestError(f"Invalid URL detected: {url}")
+        port = parts.port or DEFAULT_PORTS[scheme]
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+        return (scheme, parts.hostname, port), target
+
+    def _get_connection(self, key: HostKey) -> Tuple[HTTPConnection, bool]:
+        while True:
+            with self._lock:
+                connections = self._idle.get(key)
+                if not connections:
+                    break
+                conn, last_used = connections.pop()
+
+            if self._is_expired(last_used) or self._is_stale(conn):
+                conn.close()
+                continue
+            return conn, True
+
+        return self._new_connection(key), False
+
+    def _put_connection(self, key: HostKey, conn: HTTPConnection) -> None:
+        if isinstance(conn.sock, SSLSocket) and conn.sock.session is not None:
+            self._tls_sessions[key] = conn.sock.session
+        with self._lock:
+            connections = self._idle.setdefault(key, deque())
+            if len(connections) < self.maxsize:
+                connections.append((conn, time.monotonic()))
+                return
+        conn.close()
+
+    def _new_connection(self, key: HostKey) -> HTTPConnection:
+        scheme, host, port = key
+        if scheme == "https":
+            if self.ssl is None:
+                self.ssl = create_default_context()
+            conn = _ResumingHTTPSConnection(
+                host, port, context=self.ssl, session=self._tls_sessions.get(key)
+            )
+        else:
+            conn = HTTPConnection(host, port)
+        if self.dns_cache is not None:
+            conn._create_connection = self.dns_cache.create_connection
+        return conn
+
+    def _is_expired(self, last_used: float) -> bool:
+        if self.idle_timeout is None:
+            return False
+        return time.monotonic() - last_used > self.idle_timeout
+
+    @staticmethod
+    def _is_stale(conn: HTTPConnection) -> bool:
+        """An idle socket that is readable has either been closed by the server
+        or has unexpected data pending; neither can be reused safely."""
+        sock = conn.sock
+        if sock is None:
+            return True
+        try:
+            if hasattr(select, "poll"):
+                poller = select.poll()
+                poller.register(sock, select.POLLIN)
+                readable = bool(poller.poll(0))
+            else:
+                readable = bool(select.select([sock], [], [], 0)[0])
+            if readable and isinstance(sock, SSLSocket):
+                return _has_application_data(sock)
+            return readable
+        except (OSError, ValueError):
+            return True
+
+
+def _has_application_data(sock: SSLSocket) -> bool:
+    """Whether a readable TLS socket has data or EOF pending, rather than only
+    TLS records such as the session tickets sent after a TLS 1.3 handshake."""
+    timeout = sock.gettimeout()
+    sock.settimeout(0)
+    try:
+        sock.recv(1)
+        return True
+    except SSLWantReadError:
+        return False
+    finally:
+        sock.settimeout(timeout)
+
+
+class _ResumingHTTPSConnection(HTTPSConnection):
+    """An HTTPSConnection that resumes an earlier TLS session."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        *,
+        context: Optional[SSLContext] = None,
+        session: Optional[SSLSession] = None,
+    ):
+        super().__init__(host, port, context=context)
+        self.session = session
+
+    def connect(self) -> None:
+        HTTPConnection.connect(self)
+        server_hostname = self._tunnel_host or self.host
+        self.sock = self._context.wrap_socket(
+            self.sock, server_hostname=server_hostname, session=self.session
+        )
+
+
+class PooledResponse:
+    """A response whose body is read on demand from a pooled connection."""
+
+    def __init__(
+        self,
+        pool: ConnectionPool,
+        key: HostKey,
+        conn: HTTPConnection,
+        response: HTTPResponse,
+    ):
+        self.status = response.status
+        self.headers = response.headers
+        self._pool = pool
+        self._key = key
+        self._conn = conn
+        self._response = response
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        return self._response.read(amt)
+
+    def close(self) -> None:
+        """Return the connection to the pool, or close it if the body was not
+        read completely or the server asked to close it."""
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        response = self._response
+        if response.isclosed() and not response.will_close:
+            self._pool._put_connection(self._key, conn)
+        else:
+            response.close()
+            conn.close()
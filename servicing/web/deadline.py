@@ -0,0 +1,55 @@
+import time
+from typing import Optional, Union
+
+from ..errors import ServicingTimeoutError
+
+
+class Deadline:
+    """The point in time by which a call, including all of its retries, must
+    have completed."""
+
+    def __init__(self, timeout: float):
+        """
+        Args:
+            timeout: Seconds from now
+        """
+        self.timeout = timeout
+        self.expires_at = time.monotonic() + timeout
+
+    @classmethod
+    def coerce(cls, deadline: Union[None, float, "Deadline"]) -> Optional["Deadline"]:
+        """Accept a Deadline or a number of seconds from now."""
+        if deadline is None or isinstance(deadline, Deadline):
+            return deadline
+        return cls(deadline)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def check(self) -> None:
+        """
+        Raises:
+            ServicingTimeoutError if the deadline has passed
+        """
+        if self.expired:
+            raise ServicingTimeoutError(f"Deadline of {self.timeout}s exceeded")
+
+    def cap(self, timeout: Optional[float]) -> float:
+        """The smaller of `timeout` and the time remaining.
+
+        Raises:
+            ServicingTimeoutError if the deadline has passed
+        """
+        self.check()
+        remaining = self.remaining()
+        return remaining if timeout is None else min(timeout, remaining)
+
+    def __repr__(self):
+        return f"<servicing.Deadline: remaining={self.remaining():.3f}s>"
+
+
+DeadlineArg = Union[None, float, Deadline]
@@ -0,0 +1,88 @@
+import asyncio
+import socket
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+AddrInfo = Tuple[int, int, int, str, tuple]
+
+
+class DnsCache:
+    """Remembers the addresses a host name resolves to for `ttl` seconds.
+
+    Saves the DNS lookup of every new connection, which dominates the first
+    calls of short-lived processes. An entry is dropped as soon as none of its
+    addresses accepts a connection, so a moved host is looked up again.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float = 300.0,
+        resolver: Callable[..., List[AddrInfo]] = socket.getaddrinfo,
+    ):
+        """
+        Args:
+            ttl: Seconds for which a lookup is reused
+            resolver: Function with the signature of socket.getaddrinfo
+        """
+        self.ttl = ttl
+        self.resolver = resolver
+        self._entries: Dict[Tuple[str, int], Tuple[float, List[AddrInfo]]] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, host: str, port: int) -> List[AddrInfo]:
+        addresses = self._cached(host, port)
+        if addresses is None:
+            addresses = self.resolver(host, port, 0, socket.SOCK_STREAM)
+            self._store(host, port, addresses)
+        return addresses
+
+    async def resolve_async(self, host: str, port: int) -> List[AddrInfo]:
+        addresses = self._cached(host, port)
+        if addresses is None:
+            loop = asyncio.get_event_loop()
+            addresses = await loop.run_in_executor(
+                None, self.resolver, host, port, 0, socket.SOCK_STREAM
+            )
+            self._store(host, port, addresses)
+        return addresses
+
+    def invalidate(self, host: str, port: int) -> None:
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def create_connection(
+        self,
+        address: Tuple[str, int],
+        timeout=socket._GLOBAL_DEFAULT_TIMEOUT,
+        source_address: Optional[Tuple[str, int]] = None,
+    ) -> socket.socket:
+        """Drop-in replacement for socket.create_connection that connects to
+        the cached addresses in turn."""
+        host, port = address
+        error = None
+        for _, _, _, _, sockaddr in self.resolve(host, port):
+            try:
+                return socket.create_connection(
+                    (sockaddr[0], port), timeout, source_address
+                )
+            except OSError as e:
+                error = e
+        self.invalidate(host, port)
+        raise error or OSError(f"{host} did not resolve to any address")
+
+    def _cached(self, host: str, port: int) -> Optional[List[AddrInfo]]:
+        with self._lock:
+            entry = self._entries.get((host, port))
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    def _store(self, host: str, port: int, addresses: List[AddrInfo]) -> None:
+        with self._lock:
+            self._entries[(host, port)] = (time.monotonic() + self.ttl, addresses)
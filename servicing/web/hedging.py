@@ -0,0 +1,137 @@
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterable, Optional
+
+DEFAULT_MAX_WORKERS = 32
+
+
+class HedgingPolicy:
+    """Sends a second copy of a slow GET request and uses whichever answers
+    first.
+
+    A copy (hedge) is sent when the first request has not completed after
+    `delay` seconds, or by default after the `percentile` latency observed
+    for its endpoint family. Every request earns `budget` of a hedge, so
+    hedges never exceed that fraction of the traffic. The losing request is
+    cancelled if it has not started yet; otherwise its response is
+    discarded. Blocking clients send hedged requests from a pool of
+    `max_workers` threads; when all of them are busy a request is sent
+    from the caller's thread without a hedge instead of waiting for one.
+    """
+
+    def __init__(
+        self,
+        *,
+        delay: Optional[float] = None,
+        percentile: float = 0.95,
+        min_samples: int = 20,
+        budget: float = 0.05,
+        endpoints: Optional[Iterable[str]] = None,
+        max_workers: Optional[int] = None,
+        sample_size: int = 1000,
+    ):
+        """
+        Args:
+            delay: Fixed seconds to wait before hedging; None to use the
+                observed latency percentile
+            percentile: Latency percentile used as the delay
+            min_samples: Requests observed for an endpoint family before it
+                is hedged with the percentile delay
+            budget: Highest fraction of requests that are hedged
+            endpoints: Path templates to hedge, e.g.
+                {"/v1/private/loan/{id}"}; None for every GET
+            max_workers: Threads sending the requests of blocking clients;
+                None for two per `max_workers` of the ServicingClient it is
+                given to
+            sample_size: Latencies remembered per endpoint family
+        """
+        self.delay = delay
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.budget = budget
+        self.endpoints = None if endpoints is None else frozenset(endpoints)
+        self.max_workers = max_workers
+        self.sample_size = sample_size
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._credit = 0.0
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._executor = None
+        self._busy = 0
+        self._lock = threading.Lock()
+
+    def applies(self, method: str, endpoint: str) -> bool:
+        return method == "GET" and (
+            self.endpoints is None or endpoint in self.endpoints
+        )
+
+    def hedge_delay(self, endpoint: str) -> Optional[float]:
+        """Seconds to wait before hedging a request (None: do not hedge)."""
+        with self._lock:
+            self.requests += 1
+            self._credit = min(self._credit + self.budget, 10.0)
+            if self.delay is not None:
+                return self.delay
+            latencies = self._latencies.get(endpoint)
+            if latencies is None or len(latencies) < self.min_samples:
+                return None
+            ordered = sorted(latencies)
+        return ordered[min(len(ordered) - 1, int(self.percentile * len(ordered)))]
+
+    def try_hedge(self) -> bool:
+        """Take a hedge from the budget if there is one left."""
+        with self._lock:
+            return self._take_hedge()
+
+    def _take_hedge(self) -> bool:
+        if self._credit < 1.0 - 1e-9:
+            return False
+        self._credit -= 1.0
+        self.hedges += 1
+        return True
+
+    def record(self, endpoint: str, latency: float, hedge_won: bool) -> None:
+        with self._lock:
+            latencies = self._latencies.get(endpoint)
+            if latencies is None:
+                latencies = self._latencies[endpoint] = deque(maxlen=self.sample_size)
+            latencies.append(latency)
+            if hedge_won:
+                self.hedge_wins += 1
+
+    def submit(
+        self, fn: Callable[..., Any], *args: Any, hedge: bool = False
+    ) -> Optional[Future]:
+        """Run `fn(*args)` on a hedging thread; None if every thread is busy,
+        or if `hedge` and there is no hedge left in the budget."""
+        with self._lock:
+            max_workers = self.max_workers or DEFAULT_MAX_WORKERS
+            if self._busy >= max_workers:
+                return None
+            if hedge and not self._take_hedge():
+                return None
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix="servicing-hedge"
+                )
+            self._busy += 1
+            executor = self._executor
+        try:
+            future = executor.submit(fn, *args)
+        except BaseException:
+            self._release_worker(None)
+            raise
+        future.add_done_callback(self._release_worker)
+        return future
+
+    def _release_worker(self, future: Optional[Future]) -> None:
+        with self._lock:
+            self._busy -= 1
+
+    def close(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self._executor = None
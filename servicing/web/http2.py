@@ -0,0 +1,336 @@
+import logging
+import socket
+import threading
+import time
+from http.client import HTTPMessage
+from ssl import SSLContext, create_default_context
+from typing import Dict, List, Mapping, Optional
+
+from ..errors import ServicingClientError
+from .connection_pool import DEFAULT_PORTS, ConnectionPool, HostKey
+from .dns_cache import DnsCache
+from .transport import Response, Transport
+
+try:
+    from h2 import events as h2_events
+    from h2.config import H2Configuration
+    from h2.connection import H2Connection
+    from h2.errors import ErrorCodes
+except ImportError:  # pragma: no cover
+    H2Connection = None
+
+# Headers that are specific to HTTP/1.1 connections and forbidden in HTTP/2
+CONNECTION_HEADERS = frozenset(
+    ("connection", "host", "keep-alive", "proxy-connection", "transfer-encoding")
+)
+
+
+class _Stream:
+    def __init__(self):
+        self.status = None
+        self.headers = HTTPMessage()
+        self.chunks: List[bytes] = []
+        self.error: Optional[Exception] = None
+        self.done = threading.Event()
+
+    def fail(self, error: Exception) -> None:
+        self.error = error
+        self.done.set()
+
+
+class _Http2Connection:
+    """One HTTP/2 connection whose streams are shared by many threads.
+
+    Requests are written by the calling threads; a reader thread receives the
+    frames of every stream and wakes up the thread waiting for each response.
+    """
+
+    def __init__(self, sock: socket.socket, authority: str, scheme: str):
+        self.sock = sock
+        self.authority = authority
+        self.scheme = scheme
+        self.closed = False
+        self._h2 = H2Connection(
+            config=H2Configuration(client_side=True, header_encoding="utf-8")
+        )
+        self._streams: Dict[int, _Stream] = {}
+        self._lock = threading.Lock()
+        self._writable = threading.Condition(self._lock)
+        self.__logger = logging.getLogger(__name__)
+
+        with self._lock:
+            self._h2.initiate_connection()
+            self._flush()
+        self._reader = threading.Thread(
+            target=self._read_forever, name="servicing-h2-reader", daemon=True
+        )
+        self._reader.start()
+
+    def request(
+        self,
+        method: str,
+        target: str,
+        body: Optional[bytes],
+        headers: Mapping[str, str],
+        read_timeout: Optional[float],
+    ) -> Response:
+        request_headers = [
+            (":method", method),
+            (":scheme", self.scheme),
+            (":authority", self.authority),
+            (":path", target),
+        ]
+        request_headers.extend(
+            (name.lower(), value)
+            for name, value in headers.items()
+            if name.lower() not in CONNECTION_HEADERS
+        )
+
+        expires_at = None if read_timeout is None else time.monotonic() + read_timeout
+        stream = _Stream()
+        with self._writable:
+            while self._h2.open_outbound_streams >= self._max_streams():
+                self._check_open()
+                if not self._wait(expires_at):
+                    raise socket.timeout(f"No free stream within {read_timeout}s")
+            self._check_open()
+            stream_id = self._h2.get_next_available_stream_id()
+            self._streams[stream_id] = stream
+            self._h2.send_headers(stream_id, request_headers, end_stream=not body)
+            self._flush()
+        if body and not self._send_body(stream_id, body, expires_at):
+            self._reset(stream_id)
+            raise socket.timeout(f"Request body not sent within {read_timeout}s")
+
+        if not stream.done.wait(read_timeout):
+            self._reset(stream_id)
+            raise socket.timeout(f"No response within {read_timeout}s")
+        if stream.error is not None:
+            raise stream.error
+        return stream.status, stream.headers, b"".join(stream.chunks)
+
+    def close(self) -> None:
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            try:
+                self._h2.close_connection()
+                self._flush()
+            except Exception:
+                pass
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+    def _send_body(
+        self, stream_id: int, body: bytes, expires_at: Optional[float]
+    ) -> bool:
+        """Send `body` as flow control allows; False if the server's window
+        stayed closed until `expires_at`."""
+        view = memoryview(body)
+        with self._writable:
+            while view:
+                self._check_open()
+                size = min(
+                    len(view),
+                    self._h2.local_flow_control_window(stream_id),
+                    self._h2.max_outbound_frame_size,
+                )
+                if size <= 0:
+                    if not self._wait(expires_at):
+                        return False
+                    continue
+                chunk, view = view[:size], view[size:]
+                self._h2.send_data(stream_id, chunk.tobytes(), end_stream=not view)
+                self._flush()
+        return True
+
+    def _wait(self, expires_at: Optional[float]) -> bool:
+        """Wait for frames from the server, holding `_writable`; False once
+        `expires_at` has passed."""
+        if expires_at is None:
+            return self._writable.wait()
+        remaining = expires_at - time.monotonic()
+        return remaining > 0 and self._writable.wait(remaining)
+
+    def _reset(self, stream_id: int) -> None:
+        with self._lock:
+            self._streams.pop(stream_id, None)
+            try:
+                self._h2.reset_stream(stream_id, ErrorCodes.CANCEL)
+                self._flush()
+            except Exception:
+                pass
+
+    def _max_streams(self) -> int:
+        return self._h2.remote_settings.max_concurrent_streams
+
+    def _check_open(self) -> None:
+        if self.closed:
+            raise ConnectionError(f"HTTP/2 connection to {self.authority} is closed")
+
+    def _flush(self) -> None:
+        data = self._h2.data_to_send()
+        if data:
+            self.sock.sendall(data)
+
+    def _read_forever(self) -> None:
+        error: Exception = ConnectionResetError(
+            f"HTTP/2 connection to {self.authority} was closed by the server"
+        )
+        try:
+            while True:
+                data = self.sock.recv(65536)
+                if not data:
+                    break
+                with self._writable:
+                    if not self._handle(self._h2.receive_data(data)):
+                        break
+                    self._flush()
+                    self._writable.notify_all()
+        except Exception as e:
+            if not self.closed:
+                self.__logger.debug(
+                    f"HTTP/2 connection to {self.authority} failed: {e}"
+                )
+            error = e if isinstance(e, OSError) else ConnectionError(str(e))
+        finally:
+            with self._writable:
+                self.closed = True
+                streams, self._streams = self._streams, {}
+                self._writable.notify_all()
+            for stream in streams.values():
+                stream.fail(error)
+
+    def _handle(self, events) -> bool:
+        """Apply received events to their streams; False once the server has
+        ended the connection."""
+        for event in events:
+            if isinstance(event, h2_events.ResponseReceived):
+                stream = self._streams.get(event.stream_id)
+                if stream is not None:
+                    for name, value in event.headers:
+                        if name == ":status":
+                            stream.status = int(value)
+                        else:
+                            stream.headers[name] = value
+            elif isinstance(event, h2_events.DataReceived):
+                self._h2.acknowledge_received_data(
+                    event.flow_controlled_length, event.stream_id
+                )
+                stream = self._streams.get(event.stream_id)
+                if stream is not None:
+                    stream.chunks.append(event.data)
+            elif isinstance(event, h2_events.StreamEnded):
+                stream = self._streams.pop(event.stream_id, None)
+                if stream is not None:
+                    stream.done.set()
+            elif isinstance(event, h2_events.StreamReset):
+                stream = self._streams.pop(event.stream_id, None)
+                if stream is not None:
+                    stream.fail(
+                        ConnectionResetError(f"Stream reset: {event.error_code!r}")
+                    )
+            elif isinstance(event, h2_events.ConnectionTerminated):
+                return False
+        return True
+
+
+class Http2Transport(Transport):
+    """Multiplexes concurrent requests as HTTP/2 streams over a single
+    connection per host, with HPACK header compression.
+
+    Requires the optional `h2` package. https hosts must offer HTTP/2 through
+    ALPN; http hosts are spoken to in HTTP/2 directly (prior knowledge).
+    Responses are received whole, so `api_stream` and the `iter_*` methods
+    are refused with ServicingClientError.
+    """
+
+    def __init__(
+        self, *, ssl: Optional[SSLContext] = None, dns_cache: Optional[DnsCache] = None
+    ):
+        """
+        Args:
+            ssl: SSL context used for https connections, as it is; it must
+                offer "h2" with `set_alpn_protocols`. By default the transport
+                makes a context of its own that does
+            dns_cache: Resolves the host names of new connections
+        """
+        if H2Connection is None:
+            raise ServicingClientError("HTTP/2 support needs the h2 package")
+        self.ssl = ssl
+        self.dns_cache = dns_cache
+        self._connections: Dict[HostKey, _Http2Connection] = {}
+        self._connecting: Dict[HostKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._ssl = ssl
+        if ssl is None:
+            self._ssl = create_default_context()
+            self._ssl.set_alpn_protocols(["h2", "http/1.1"])
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes],
+        headers: Mapping[str, str],
+        *,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+    ) -> Response:
+        key, target = ConnectionPool._split_url(url)
+        conn = self._get_connection(key, connect_timeout)
+        return conn.request(method, target, body, headers, read_timeout)
+
+    def num_connections(self) -> int:
+        with self._lock:
+            return sum(not c.closed for c in self._connections.values())
+
+    def close(self) -> None:
+        with self._lock:
+            connections, self._connections = self._connections, {}
+        for conn in connections.values():
+            conn.close()
+
+    def _get_connection(
+        self, key: HostKey, connect_timeout: Optional[float]
+    ) -> _Http2Connection:
+        with self._lock:
+            conn = self._connections.get(key)
+            if conn is not None and not conn.closed:
+                return conn
+            connecting = self._connecting.setdefault(key, threading.Lock())
+
+        # Connect to each host once at a time, while the streams of the other
+        # connections go on
+        with connecting:
+            with self._lock:
+                conn = self._connections.get(key)
+            if conn is None or conn.closed:
+                conn = self._connect(key, connect_timeout)
+                with self._lock:
+                    self._connections[key] = conn
+            return conn
+
+    def _connect(
+        self, key: HostKey, connect_timeout: Optional[float]
+    ) -> _Http2Connection:
+        scheme, host, port = key
+        create_connection = socket.create_connection
+        if self.dns_cache is not None:
+            create_connection = self.dns_cache.create_connection
+        sock = create_connection((host, port), connect_timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if scheme == "https":
+            sock = self._ssl.wrap_socket(sock, server_hostname=host)
+            if sock.selected_alpn_protocol() != "h2":
+                sock.close()
+                raise ServicingClientError(
+                    f"{host}:{port} did not agree to HTTP/2 through ALPN"
+                )
+        sock.settimeout(None)
+        authority = host if port == DEFAULT_PORTS[scheme] else f"{host}:{port}"
+        return _Http2Connection(sock, authority, scheme)
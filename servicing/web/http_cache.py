@@ -0,0 +1,142 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Mapping, Optional, Tuple
+
+
+class CacheEntry:
+    __slots__ = ("status", "headers", "body", "etag", "last_modified", "stored_at")
+
+    def __init__(self, *, status: int, headers, body: bytes):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.etag = headers.get("ETag")
+        self.last_modified = headers.get("Last-Modified")
+        self.stored_at = time.monotonic()
+
+    @property
+    def size(self) -> int:
+        return len(self.body)
+
+
+class HttpCache:
+    """An in-memory HTTP cache for GET responses based on validators.
+
+    Responses carrying an ETag or Last-Modified header are kept in a bounded
+    LRU. Within their TTL they are served without contacting the server; after
+    it they are revalidated with If-None-Match / If-Modified-Since and a
+    304 Not Modified is answered from the cached body.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int = 32 * 1024 * 1024,
+        default_ttl: float = 0.0,
+        ttl_overrides: Optional[Mapping[str, float]] = None,
+    ):
+        """
+        Args:
+            max_bytes: Total size of the cached bodies; least recently used
+                entries are evicted beyond it
+            default_ttl: Seconds a response is served without revalidation
+            ttl_overrides: TTLs per path template, e.g.
+                {"/v1/private/loan/{id}/tracker": 300}
+        """
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.ttl_overrides = dict(ttl_overrides or {})
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, str], CacheEntry]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def before_request(
+        self, url: str, headers: dict, endpoint: str
+    ) -> Tuple[Optional[CacheEntry], bool]:
+        """Look up a cached response and add the conditional headers to `headers`.
+
+        Returns:
+            The cached entry (if any) and whether it is fresh enough to be
+            served without sending the request
+        """
+        key = (headers.get("Authorization", ""), url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, False
+            self._entries.move_to_end(key)
+            if time.monotonic() - entry.stored_at < self.ttl(endpoint):
+                self.hits += 1
+                return entry, True
+
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return entry, False
+
+    def after_response(
+        self,
+        url: str,
+        headers: dict,
+        entry: Optional[CacheEntry],
+        status: int,
+        response_headers,
+        body: bytes,
+    ) -> Tuple[int, object, bytes]:
+        """Store a new response or answer a 304 from the cache.
+
+        Returns:
+            The (status, headers, body) to hand to the caller
+        """
+        key = (headers.get("Authorization", ""), url)
+        if status == 304 and entry is not None:
+            with self._lock:
+                self.revalidations += 1
+                entry.stored_at = time.monotonic()
+            return entry.status, entry.headers, entry.body
+
+        if status == 200 and self._is_cacheable(response_headers, body):
+            self._store(
+                key, CacheEntry(status=status, headers=response_headers, body=body)
+            )
+        return status, response_headers, body
+
+    def ttl(self, endpoint: str) -> float:
+        return self.ttl_overrides.get(endpoint, self.default_ttl)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """Total size in bytes of the cached bodies."""
+        return self._size
+
+    def _is_cacheable(self, headers, body: bytes) -> bool:
+        if headers is None or len(body) > self.max_bytes:
+            return False
+        if "no-store" in headers.get("Cache-Control", "").lower():
+            return False
+        return bool(headers.get("ETag") or headers.get("Last-Modified"))
+
+    def _store(self, key: Tuple[str, str], entry: CacheEntry) -> None:
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous.size
+            self._entries[key] = entry
+            self._size += entry.size
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
@@ -0,0 +1,136 @@
+import codecs
+import json
+import re
+from typing import Any, List
+
+from ..errors import ServicingClientError
+
+_WHITESPACE = " \t\n\r"
+
+# Characters that may continue a number decoded at the end of the buffer
+_NUMBER_TAIL = frozenset("0123456789.eE+-")
+
+# Values that the decoder fails on while only a prefix of them has arrived
+_LITERALS = ("true", "false", "null", "NaN", "Infinity", "-Infinity")
+
+# The text of a \u escape, possibly the high half of a surrogate pair, cut
+# short by the end of the buffer
+_PARTIAL_ESCAPE = re.compile(r"u[0-9a-fA-F]{0,4}(\\(u[0-9a-fA-F]{0,4})?)?")
+
+# Default cap on the text buffered for one element
+MAX_ELEMENT_SIZE = 16 * 1024 * 1024
+
+
+class JsonArrayParser:
+    """Incrementally parses a top-level JSON array fed in arbitrary chunks.
+
+    Each element is decoded as soon as it is complete and only the text of the
+    element currently being received is buffered, so memory is bounded by the
+    largest element rather than by the whole array.
+    """
+
+    def __init__(self, max_element_size: int = MAX_ELEMENT_SIZE):
+        """
+        Args:
+            max_element_size: Characters an element may take before the body
+                is rejected
+        """
+        self.max_element_size = max_element_size
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._started = False
+        self._finished = False
+        self._expect_value = True
+        self._count = 0
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """Add the next chunk of the body and return the elements it completed.
+
+        Raises:
+            ServicingClientError if the body is not valid JSON, or an element
+                is larger than `max_element_size`
+        """
+        self._buffer += self._text.decode(chunk)
+        items = self._parse()
+        if len(self._buffer) > self.max_element_size:
+            raise ServicingClientError(
+                f"JSON array element exceeds {self.max_element_size} characters"
+            )
+        return items
+
+    def close(self) -> None:
+        """
+        Raises:
+            ServicingClientError if the body ended before the array did
+        """
+        self._buffer += self._text.decode(b"", final=True)
+        self._parse()
+        if not self._finished or self._buffer.strip(_WHITESPACE):
+            raise ServicingClientError("Response body is not a complete JSON array")
+
+    def _parse(self) -> List[Any]:
+        items = []
+        buffer = self._buffer
+        pos = 0
+        while True:
+            pos = self._skip_whitespace(buffer, pos)
+            if pos == len(buffer) or self._finished:
+                break
+
+            char = buffer[pos]
+            if not self._started:
+                if char != "[":
+                    raise ServicingClientError("Response body is not a JSON array")
+                self._started = True
+                pos += 1
+            elif char == "]" and (not self._expect_value or not self._count):
+                self._finished = True
+                pos += 1
+            elif not self._expect_value:
+                if char != ",":
+                    raise ServicingClientError(f"Unexpected {char!r} in JSON array")
+                self._expect_value = True
+                pos += 1
+            else:
+                try:
+                    item, end = self._decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError as e:
+                    if self._incomplete(buffer, e):
+                        break  # wait for more data
+                    raise ServicingClientError(
+                        f"Invalid JSON in array: {e.msg} at character "
+                        f"{e.pos - pos} of element {self._count}"
+                    ) from e
+                # A number at the end of the buffer may still be growing
+                if self._skip_whitespace(buffer, end) == len(buffer) or (
+                    isinstance(item, (int, float))
+                    and _NUMBER_TAIL.issuperset(buffer[end:])
+                ):
+                    break
+                items.append(item)
+                self._count += 1
+                self._expect_value = False
+                pos = end
+
+        self._buffer = buffer[pos:]
+        return items
+
+    @staticmethod
+    def _incomplete(buffer: str, error: json.JSONDecodeError) -> bool:
+        """Whether `error` may go away once more of the body has arrived."""
+        pos = error.pos
+        rest = buffer[pos:]
+        if not rest.strip(_WHITESPACE) or error.msg.startswith("Unterminated"):
+            return True
+        if error.msg == "Expecting value":
+            return any(literal.startswith(rest) for literal in _LITERALS)
+        if error.msg == "Invalid \\uXXXX escape":
+            return _PARTIAL_ESCAPE.fullmatch(rest) is not None
+        return False
+
+    @staticmethod
+    def _skip_whitespace(buffer: str, pos: int) -> int:
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+        return pos
@@ -0,0 +1,106 @@
+from decimal import Decimal
+from json.encoder import encode_basestring_ascii
+from typing import Any, Iterable, Tuple
+from uuid import UUID
+
+INFINITY = float("inf")
+
+
+class JsonWriter:
+    """Encodes request bodies as UTF-8 JSON straight into a bytearray.
+
+    The output is byte for byte what StdlibJsonCodec makes of the same value
+    once model objects are replaced by their `to_dict()`; model objects are
+    instead written field by field, without building their dictionaries or an
+    intermediate str.
+    """
+
+    def dumps(self, value: Any) -> bytes:
+        """The JSON of `value` as bytes.
+
+        The buffer is copied once into an immutable bytes object, which is
+        what JsonObject.to_json caches and hands out; use `write` to keep the
+        bytearray instead.
+        """
+        out = bytearray()
+        self.write(value, out)
+        return bytes(out)
+
+    def write(self, value: Any, out: bytearray) -> None:
+        """Append the JSON of `value` to `out`, e.g. to build the body of a
+        bulk request in one buffer, or to reuse a buffer across requests."""
+        if isinstance(value, str):
+            out += encode_basestring_ascii(value).encode("ascii")
+        elif value is None:
+            out += b"null"
+        elif value is True:
+            out += b"true"
+        elif value is False:
+            out += b"false"
+        elif isinstance(value, int):
+            out += int.__repr__(value).encode("ascii")
+        elif isinstance(value, float):
+            out += _float(value)
+        elif isinstance(value, dict):
+            self.write_items(value.items(), out)
+        elif isinstance(value, (list, tuple)):
+            out += b"["
+            for i, item in enumerate(value):
+                if i:
+                    out += b", "
+                self.write(item, out)
+            out += b"]"
+        elif hasattr(value, "_write_json"):
+            # JsonObject, which may have its bytes cached
+            value._write_json(self, out)
+        elif callable(getattr(value, "to_dict", None)):
+            self.write_items(value.to_dict().items(), out)
+        elif isinstance(value, (UUID, Decimal)):
+            out += encode_basestring_ascii(str(value)).encode("ascii")
+        else:
+            raise TypeError(
+                f"Object of type {value.__class__.__name__} is not JSON serializable"
+            )
+
+    def write_items(self, items: Iterable[Tuple[Any, Any]], out: bytearray) -> None:
+        """Append a JSON object with the given (key, value) pairs to `out`."""
+        out += b"{"
+        first = True
+        for key, value in items:
+            if first:
+                first = False
+            else:
+                out += b", "
+            out += encode_basestring_ascii(_key(key)).encode("ascii")
+            out += b": "
+            self.write(value, out)
+        out += b"}"
+
+
+def _float(value: float) -> bytes:
+    if value != value:
+        return b"NaN"
+    if value == INFINITY:
+        return b"Infinity"
+    if value == -INFINITY:
+        return b"-Infinity"
+    return float.__repr__(value).encode("ascii")
+
+
+def _key(key: Any) -> str:
+    """Convert a dictionary key to a string as json.dumps does."""
+    if isinstance(key, str):
+        return key
+    if isinstance(key, float):
+        return _float(key).decode("ascii")
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    if isinstance(key, int):
+        return int.__repr__(key)
+    raise TypeError(
+        f"keys must be str, int, float, bool or None, not {key.__class__.__name__}"
+    )
@@ -0,0 +1,170 @@
+import hashlib
+import os
+import struct
+import threading
+import time
+from typing import Dict, Mapping, Optional, Tuple, Union
+
+from ..errors import ServicingClientError, ServicingTimeoutError
+from .deadline import Deadline
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+# tokens, time of the last update
+_STATE = struct.Struct("dd")
+
+
+class TokenBucket:
+    """Hands out `rate` tokens per second with bursts of up to `capacity`.
+
+    Callers are never rejected: `reserve` takes a token even when none is left
+    (the balance goes negative) and returns how long the caller must wait for
+    it, so concurrent callers are served in order at exactly `rate`.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take `tokens` and return the seconds to wait before using them."""
+        with self._lock:
+            self._tokens, self._updated = self._take(
+                self._tokens, self._updated, time.monotonic(), tokens
+            )
+            return max(0.0, -self._tokens / self.rate)
+
+    def refund(self, tokens: float = 1.0) -> None:
+        """Give back `tokens` taken by a request that will not be sent."""
+        self.reserve(-tokens)
+
+    def _take(
+        self, balance: float, updated: float, now: float, tokens: float
+    ) -> Tuple[float, float]:
+        balance = min(self.capacity, balance + (now - updated) * self.rate)
+        return balance - tokens, now
+
+
+class SharedTokenBucket(TokenBucket):
+    """A TokenBucket whose state lives in a file, so that every process on the
+    host using the same file shares one budget. Updates are serialized with
+    an exclusive flock on the file (POSIX only)."""
+
+    def __init__(self, path: str, rate: float, capacity: Optional[float] = None):
+        if fcntl is None:
+            raise ServicingClientError("Shared rate limits need fcntl (POSIX only)")
+        super().__init__(rate, capacity)
+        self.path = path
+        self._fd = None
+        self._pid = None
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        with self._lock:
+            fd = self._file()
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                state = os.pread(fd, _STATE.size, 0)
+                now = time.time()
+                if len(state) == _STATE.size:
+                    balance, updated = _STATE.unpack(state)
+                else:
+                    balance, updated = self.capacity, now
+                balance, updated = self._take(balance, updated, now, tokens)
+                os.pwrite(fd, _STATE.pack(balance, updated), 0)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            return max(0.0, -balance / self.rate)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fd is not None and self._pid == os.getpid():
+                os.close(self._fd)
+            self._fd = None
+
+    def _file(self) -> int:
+        # A descriptor inherited through fork shares its lock with the parent
+        if self._fd is None or self._pid != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            self._pid = os.getpid()
+        return self._fd
+
+
+Limit = Union[float, Tuple[float, float]]
+
+
+class RateLimiter:
+    """Keeps the request rate of a client under the server's limits.
+
+    Every request takes a token from the client-wide bucket and, if its path
+    template has a limit of its own, from that bucket too; it waits until both
+    allow it to go.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[Limit] = None,
+        *,
+        endpoints: Optional[Mapping[str, Limit]] = None,
+        shared_dir: Optional[str] = None,
+    ):
+        """
+        Args:
+            rate: Requests per second for the whole client, or a
+                (rate, burst) tuple; None for no client-wide limit
+            endpoints: Limits per path template, e.g.
+                {"/v1/private/loan/{id}/payment": 2}
+            shared_dir: Keep the buckets in files in this directory so that all
+                processes on the host using it share the limits
+        """
+        self.shared_dir = shared_dir
+        self._client = None if rate is None else self._bucket("client", rate)
+        self._endpoints: Dict[str, TokenBucket] = {
+            endpoint: self._bucket(endpoint, limit)
+            for endpoint, limit in (endpoints or {}).items()
+        }
+
+    def reserve(self, endpoint: str, deadline: Optional[Deadline] = None) -> float:
+        """Take the tokens for a request and return the seconds to wait.
+
+        Raises:
+            ServicingTimeoutError if the wait would outlast `deadline`; the
+                tokens are then given back
+        """
+        buckets = [self._client, self._endpoints.get(endpoint)]
+        buckets = [bucket for bucket in buckets if bucket is not None]
+        delay = max([bucket.reserve() for bucket in buckets], default=0.0)
+        if deadline is not None and delay > 0 and delay >= deadline.remaining():
+            for bucket in buckets:
+                bucket.refund()
+            raise ServicingTimeoutError(
+                f"Deadline of {deadline.timeout}s exceeded waiting {delay:.3f}s "
+                f"for the rate limit of {endpoint}"
+            )
+        return delay
+
+    def acquire(self, endpoint: str, deadline: Optional[Deadline] = None) -> None:
+        """Block until a request to `endpoint` may be sent.
+
+        Raises:
+            ServicingTimeoutError if the wait would outlast `deadline`
+        """
+        delay = self.reserve(endpoint, deadline)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _bucket(self, name: str, limit: Limit) -> TokenBucket:
+        rate, capacity = limit if isinstance(limit, tuple) else (limit, None)
+        if self.shared_dir is None:
+            return TokenBucket(rate, capacity)
+        digest = hashlib.sha1(name.encode("utf-8")).hexdigest()[:16]
+        path = os.path.join(self.shared_dir, f"{digest}.bucket")
+        return SharedTokenBucket(path, rate, capacity)
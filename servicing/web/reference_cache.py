@@ -0,0 +1,192 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import date, datetime
+from http.client import HTTPMessage
+from typing import Callable, Dict, Iterable, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .transport import _message
+
+REFERENCE_PATH = re.compile(
+    "^/v1/public/(benchmark/[A-Z0-9_]+|finance/(next|previous)-business-day)/"
+    "(\\d{4}-\\d{2}-\\d{2})$"
+)
+
+
+def default_path() -> str:
+    """~/.cache/servicingclient/reference.sqlite3 (or under $XDG_CACHE_HOME)"""
+    root = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(root, "servicingclient", "reference.sqlite3")
+
+
+class ReferenceCache:
+    """A persistent cache for the public reference data endpoints.
+
+    Benchmark rates and business-day answers for past dates never change, so
+    the responses of GET /v1/public/benchmark/<name>/<date> and
+    /v1/public/finance/{next,previous}-business-day/<date> are kept in an SQLite
+    database that every process on the host can share. Responses for today
+    and for future dates are only cached when a TTL is configured for them.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        *,
+        today_ttl: Optional[float] = None,
+        future_ttl: Optional[float] = None,
+        statuses: Iterable[int] = (200,),
+        today: Callable[[], date] = date.today,
+    ):
+        """
+        Args:
+            path: The database file, shared by every client using it;
+                defaults to `default_path()`. ":memory:" keeps it in-process.
+            today_ttl: Seconds a response for today's date is kept (None: never
+                cached)
+            future_ttl: Seconds a response for a future date is kept (None:
+                never cached)
+            statuses: Response statuses that are cached, e.g. (200, 404) to
+                also remember dates without a fixing
+            today: Returns the current date
+        """
+        self.path = path or default_path()
+        self.today_ttl = today_ttl
+        self.future_ttl = future_ttl
+        self.statuses = frozenset(statuses)
+        self.today = today
+        self.hits = 0
+        self.misses = 0
+        self._memory: Dict[str, Tuple[int, HTTPMessage, bytes]] = {}
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def matches(self, url: str) -> bool:
+        """Whether `url` is a reference data URL, whose response may be cached."""
+        return self._key(url) is not None
+
+    def get(
+        self, url: str, *, blocking: bool = True
+    ) -> Optional[Tuple[int, HTTPMessage, bytes]]:
+        """The cached (status, headers, body) of a reference data URL, if any.
+
+        Args:
+            blocking: Also read the database; otherwise only the responses
+                held in memory are looked at, and a miss is not counted
+        """
+        key = self._key(url)
+        if key is None:
+            return None
+
+        response = self._memory.get(key)
+        if response is not None:
+            self.hits += 1
+            return response
+        if not blocking:
+            return None
+
+        with self._lock:
+            cursor = self._db().execute(
+                "SELECT status, headers, body, expires_at FROM reference WHERE key = ?",
+                (key,),
+            )
+            row = cursor.fetchone()
+        if row is None or (row[3] is not None and row[3] <= time.time()):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        response = row[0], _message(json.loads(row[1])), bytes(row[2])
+        if row[3] is None:
+            self._memory[key] = response
+        return response
+
+    def put(self, url: str, status: int, headers, body: bytes) -> bool:
+        """Store a response if its URL and status are cacheable.
+
+        Returns:
+            Whether the response was stored
+        """
+        key = self._key(url)
+        if key is None or status not in self.statuses:
+            return False
+
+        day = datetime.strptime(key.rsplit("/", 1)[1], "%Y-%m-%d").date()
+        today = self.today()
+        if day < today:
+            expires_at = None
+        else:
+            ttl = self.today_ttl if day == today else self.future_ttl
+            if ttl is None:
+                return False
+            expires_at = time.time() + ttl
+
+        with self._lock:
+            db = self._db()
+            with db:
+                db.execute(
+                    "INSERT OR REPLACE INTO reference VALUES (?, ?, ?, ?, ?)",
+                    (key, status, json.dumps(dict(headers or {})), body, expires_at),
+                )
+        if expires_at is None:
+            self._memory[key] = status, _message(dict(headers or {})), body
+        return True
+
+    def __contains__(self, url: str) -> bool:
+        key = self._key(url)
+        if key is None:
+            return False
+        if key in self._memory:
+            return True
+        with self._lock:
+            cursor = self._db().execute(
+                "SELECT expires_at FROM reference WHERE key = ?", (key,)
+            )
+            row = cursor.fetchone()
+        return row is not None and (row[0] is None or row[0] > time.time())
+
+    def clear(self) -> None:
+        """Remove every cached response, for all processes sharing the file."""
+        with self._lock:
+            db = self._db()
+            with db:
+                db.execute("DELETE FROM reference")
+            self._memory.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+            self._connection = None
+
+    def _key(self, url: str) -> Optional[str]:
+        parts = urlsplit(url)
+        if parts.query or not REFERENCE_PATH.match(parts.path):
+            return None
+        return f"{parts.netloc}{parts.path}"
+
+    def _db(self) -> sqlite3.Connection:
+        # Connections must not be shared with a forked child; reopen there
+        if self._connection is None or self._pid != os.getpid():
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            if self.path != ":memory:":
+                connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS reference ("
+                "key TEXT PRIMARY KEY, status INTEGER, headers TEXT, body BLOB, "
+                "expires_at REAL)"
+            )
+            connection.commit()
+            self._connection = connection
+            self._pid = os.getpid()
+            self._memory.clear()
+        return self._connection
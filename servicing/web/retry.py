@@ -0,0 +1,149 @@
+import random
+import socket
+import time
+from email.utils import parsedate_to_datetime
+from http.client import HTTPException
+from typing import Iterable, Mapping, Optional, Type
+from urllib.error import URLError
+
+DEFAULT_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+DEFAULT_RETRY_EXCEPTIONS = (
+    ConnectionError,
+    TimeoutError,
+    socket.timeout,
+    HTTPException,
+    URLError,
+)
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class RetryPolicy:
+    """Decides whether and when a failed request should be sent again.
+
+    Delays grow exponentially with "full jitter" (a random delay between zero
+    and the exponential cap) so that many clients recovering from the same
+    outage do not retry in lockstep. A `Retry-After` header sent by the server
+    takes precedence over the computed delay.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_retries: int = 3,
+        statuses: Optional[Mapping[int, int]] = None,
+        exceptions: Optional[Mapping[Type[BaseException], int]] = None,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        max_total_time: Optional[float] = 60.0,
+        respect_retry_after: bool = True,
+        methods: Iterable[str] = SAFE_METHODS,
+    ):
+        """
+        Args:
+            max_retries: Default number of retries for the default statuses and
+                exceptions
+            statuses: Number of retries allowed per response status
+            exceptions: Number of retries allowed per exception type (matched
+                with isinstance, the most specific type wins)
+            backoff_base: Delay cap in seconds for the first retry; doubles
+                with every further retry
+            backoff_max: Upper bound of the exponential delay cap
+            max_total_time: Seconds, counted from the first attempt, after
+                which no further retry is started (None for no limit)
+            respect_retry_after: Wait as long as the Retry-After header asks
+            methods: HTTP methods retried without being marked idempotent
+        """
+        self.statuses = dict(
+            statuses
+            if statuses is not None
+            else {s: max_retries for s in DEFAULT_RETRY_STATUSES}
+        )
+        self.exceptions = dict(
+            exceptions
+            if exceptions is not None
+            else {e: max_retries for e in DEFAULT_RETRY_EXCEPTIONS}
+        )
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_total_time = max_total_time
+        self.respect_retry_after = respect_retry_after
+        self.methods = frozenset(m.upper() for m in methods)
+
+    def allows(self, method: str, idempotent: Optional[bool] = None) -> bool:
+        """Whether a request may be retried at all.
+
+        Args:
+            method: The HTTP method
+            idempotent: Explicit marking of the request; None falls back to
+                the method
+        """
+        if idempotent is not None:
+            return idempotent
+        return method.upper() in self.methods
+
+    def delay_after_status(
+        self, status: int, headers, attempt: int, started: float
+    ) -> Optional[float]:
+        """Seconds to wait before retrying a response, or None to return it.
+
+        Args:
+            status: The response status
+            headers: The response headers
+            attempt: Number of retries already made
+            started: time.monotonic() of the first attempt
+        """
+        if attempt >= self.statuses.get(status, 0):
+            return None
+        retry_after = None
+        if self.respect_retry_after and headers is not None:
+            retry_after = self.parse_retry_after(headers.get("Retry-After"))
+        delay = self.backoff(attempt) if retry_after is None else retry_after
+        return self._within_budget(delay, started)
+
+    def delay_after_error(
+        self, error: BaseException, attempt: int, started: float
+    ) -> Optional[float]:
+        """Seconds to wait before retrying after an exception, or None to raise it.
+
+        Args:
+            error: The exception raised while sending the request
+            attempt: Number of retries already made
+            started: time.monotonic() of the first attempt
+        """
+        if attempt >= self._retries_for_error(error):
+            return None
+        return self._within_budget(self.backoff(attempt), started)
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential delay for the given retry number."""
+        cap = min(self.backoff_max, self.backoff_base * (2**attempt))
+        return random.uniform(0, cap)
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Parse a Retry-After header given either in seconds or as an HTTP date."""
+        if not value:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            return None
+        return max(0.0, retry_at.timestamp() - time.time())
+
+    def _retries_for_error(self, error: BaseException) -> int:
+        for cls in type(error).__mro__:
+            if cls in self.exceptions:
+                return self.exceptions[cls]
+        return 0
+
+    def _within_budget(self, delay: float, started: float) -> Optional[float]:
+        if self.max_total_time is None:
+            return delay
+        if time.monotonic() - started + delay > self.max_total_time:
+            return None
+        return delay
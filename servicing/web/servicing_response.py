@@ -1,18 +1,56 @@
+import json
 import logging
-from typing import Optional
+from typing import Any, Callable, Optional
 from ..errors import ServicingApiError
 
+_logger = logging.getLogger(__name__)
+
+_UNPARSED = object()
+
 
 class ServicingResponse(object):
+    """A response from the Servicing API.
+
+    The raw body is kept as bytes and only parsed as JSON the first time the
+    data is accessed, so callers that only look at `status` never pay for it.
+    """
+
+    __slots__ = ("method", "url", "headers", "status", "_body", "_data", "_loads")
+
     def __init__(
-        self, *, method: str, url: str, data: Optional[dict], headers: dict, status: int
+        self,
+        *,
+        method: str,
+        url: str,
+        data: Optional[Any] = _UNPARSED,
+        headers: dict,
+        status: int,
+        body: Optional[bytes] = None,
+        loads: Callable[[bytes], Any] = json.loads,
     ):
         self.method = method
         self.url = url
-        self.data = data
         self.headers = headers
         self.status = status
-        self.__logger = logging.getLogger(__name__)
+        self._body = body
+        self._data = data
+        self._loads = loads
+
+    @property
+    def body(self) -> Optional[bytes]:
+        """The raw response body."""
+        return self._body
+
+    @property
+    def data(self) -> Optional[Any]:
+        """The response body parsed as JSON (None if the body was empty)."""
+        if self._data is _UNPARSED:
+            self._data = self._loads(self._body) if self._body else None
+        return self._data
+
+    @data.setter
+    def data(self, value: Optional[Any]):
+        self._data = value
 
     def __str__(self):
         """Return the Response data if object is converted to a string."""
@@ -28,8 +66,8 @@ class ServicingResponse(object):
 
     def validate(self):
         """Check if the response from Servicing API was successful."""
-        if self.__logger.level <= logging.DEBUG:
-            self.__logger.debug(
+        if _logger.isEnabledFor(logging.DEBUG):
+            _logger.debug(
                 "Received the following response - "
                 f"status: {self.status}, "
                 f"headers: {dict(self.headers)}, "
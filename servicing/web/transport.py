@@ -0,0 +1,241 @@
+import io
+import threading
+from abc import ABCMeta, abstractmethod
+from http.client import HTTPMessage
+from ssl import SSLContext
+from typing import Any, Callable, Mapping, Optional, Tuple
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from ..errors import ServicingClientError
+from .connection_pool import ConnectionPool
+
+Response = Tuple[int, Mapping[str, str], bytes]
+
+# The body is a file-like object with read(amt) and close()
+StreamResponse = Tuple[int, Mapping[str, str], Any]
+
+
+class Transport(metaclass=ABCMeta):
+    """Sends the requests prepared by a client over the network (or not).
+
+    Implementations must be safe to call from several threads at once, since
+    `ServicingClient.batch` and hedged requests share the client's transport.
+    """
+
+    @abstractmethod
+    def send(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes],
+        headers: Mapping[str, str],
+        *,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+    ) -> Response:
+        """Send one request and read its whole response.
+
+        Error statuses are returned, not raised; only failures to get any
+        response raise.
+
+        Returns:
+            A (status, headers, body) tuple, where headers is a
+            case-insensitive mapping
+        """
+
+    def open(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes],
+        headers: Mapping[str, str],
+        *,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+    ) -> StreamResponse:
+        """Send one request and return as soon as its response head arrives,
+        for `api_stream` and the `iter_*` methods.
+
+        The caller reads the body and must close it. Error statuses are
+        returned, not raised.
+
+        Returns:
+            A (status, headers, body) tuple, where body is a file-like object
+
+        Raises:
+            ServicingClientError if the transport cannot stream responses
+        """
+        raise ServicingClientError(
+            f"{self.__class__.__name__} cannot stream responses; "
+            f"use a transport that implements open()"
+        )
+
+    def close(self) -> None:
+        """Release the connections held by the transport."""
+
+    def __repr__(self):
+        return f"<servicing.{self.__class__.__name__}>"
+
+
+class UrllibTransport(Transport):
+    """Opens a new connection with urllib for every request."""
+
+    def __init__(self, *, ssl: Optional[SSLContext] = None):
+        self.ssl = ssl
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes],
+        headers: Mapping[str, str],
+        *,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+    ) -> Response:
+        req = Request(method=method, url=url, data=body, headers=dict(headers))
+        try:
+            resp = urlopen(req, context=self.ssl, timeout=read_timeout)
+        except HTTPError as e:
+            return e.code, e.headers, e.read()
+        return resp.status, resp.headers, resp.read()
+
+    def open(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes],
+        headers: Mapping[str, str],
+        *,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+    ) -> StreamResponse:
+        req = Request(method=method, url=url, data=body, headers=dict(headers))
+        try:
+            resp = urlopen(req, context=self.ssl, timeout=read_timeout)
+        except HTTPError as e:
+            return e.code, e.headers, e
+        return resp.status, resp.headers, resp
+
+
+class PooledTransport(Transport):
+    """Sends requests over the persistent http.client connections of a
+    ConnectionPool."""
+
+    def __init__(self, pool: ConnectionPool):
+        self.pool = pool
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes],
+        headers: Mapping[str, str],
+        *,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+    ) -> Response:
+        return self.pool.urlopen(
+            method,
+            url,
+            body=body,
+            headers=headers,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+        )
+
+    def open(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes],
+        headers: Mapping[str, str],
+        *,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+    ) -> StreamResponse:
+        resp = self.pool.open(
+            method,
+            url,
+            body=body,
+            headers=headers,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+        )
+        return resp.status, resp.headers, resp
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+Handler = Callable[[str, str, Optional[bytes], Mapping[str, str]], Response]
+
+
+class InMemoryTransport(Transport):
+    """Answers requests by calling a function instead of using the network.
+
+    Measures the overhead of the client itself (request building,
+    serialization, validation and dispatch) and runs tests without sockets.
+    """
+
+    def __init__(
+        self,
+        handler: Optional[Handler] = None,
+        *,
+        status: int = 200,
+        body: bytes = b"{}",
+        headers: Optional[Mapping[str, str]] = None,
+    ):
+        """
+        Args:
+            handler: Called with (method, url, body, headers) to answer each
+                request; by default every request gets `status`, `headers`
+                and `body`
+        """
+        self.handler = handler
+        self.response = status, _message(headers or {}), body
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes],
+        headers: Mapping[str, str],
+        *,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+    ) -> Response:
+        with self._lock:
+            self.requests += 1
+        if self.handler is None:
+            return self.response
+        status, response_headers, response_body = self.handler(
+            method, url, body, headers
+        )
+        return status, _message(response_headers), response_body
+
+    def open(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes],
+        headers: Mapping[str, str],
+        *,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+    ) -> StreamResponse:
+        status, response_headers, response_body = self.send(method, url, body, headers)
+        return status, response_headers, io.BytesIO(response_body)
+
+
+def _message(headers: Mapping[str, str]) -> HTTPMessage:
+    """Make response headers case-insensitive, like those read from a socket."""
+    if isinstance(headers, HTTPMessage):
+        return headers
+    message = HTTPMessage()
+    for name, value in headers.items():
+        message[name] = value
+    return message
@@ -194,6 +194,12 @@ setup(
     setup_requires=["pytest-runner"],
     test_suite="tests",
     tests_require=tests_require,
+    extras_require={
+        "h2": ["h2"],
+        "numpy": ["numpy"],
+        "orjson": ["orjson"],
+        "ujson": ["ujson"],
+    },
     cmdclass={
         "upload": UploadCommand,
         "validate": ValidateCommand,
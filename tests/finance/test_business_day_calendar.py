@@ -0,0 +1,108 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from servicing import AsyncServicingClient, ServicingClient
+from servicing.errors import ServicingClientError
+from servicing.finance import BusinessDayCalendar
+from servicing.web.base_client import BaseClient
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# New Year's Day 2020 was a Wednesday
+CALENDAR = BusinessDayCalendar.from_holidays(
+    ["2020-01-01", "2020-01-20"], start="2019-12-20", end="2020-01-31"
+)
+
+
+class BusinessDayCalendarTests(unittest.TestCase):
+    def test_lookups(self):
+        self.assertFalse(CALENDAR.is_business_day("2020-01-01"))
+        self.assertFalse(CALENDAR.is_business_day(date(2020, 1, 4)))
+        self.assertTrue(CALENDAR.is_business_day("2020-01-02"))
+        self.assertEqual(date(2020, 1, 2), CALENDAR.next_business_day("2020-01-01"))
+        self.assertEqual(date(2020, 1, 2), CALENDAR.previous_business_day("2020-01-02"))
+        self.assertEqual(date(2020, 1, 6), CALENDAR.next_business_day("2020-01-04"))
+        self.assertEqual(date(2019, 12, 31), CALENDAR.previous_business_day("2020-01-01"))
+
+    def test_add_business_days(self):
+        self.assertEqual(date(2020, 1, 2), CALENDAR.add_business_days("2019-12-31", 1))
+        self.assertEqual(date(2020, 1, 6), CALENDAR.add_business_days("2020-01-04", 1))
+        self.assertEqual(date(2020, 1, 3), CALENDAR.add_business_days("2020-01-04", -1))
+        self.assertEqual(date(2020, 1, 21), CALENDAR.add_business_days("2020-01-17", 1))
+        self.assertEqual(date(2020, 1, 6), CALENDAR.add_business_days("2020-01-04", 0))
+
+    def test_outside_the_calendar(self):
+        self.assertFalse(CALENDAR.covers("2020-02-01"))
+        with self.assertRaises(ServicingClientError):
+            CALENDAR.next_business_day("2020-02-01")
+        with self.assertRaises(ServicingClientError):
+            CALENDAR.add_business_days("2020-01-30", 5)
+
+    def test_arrays_match_the_scalar_lookups(self):
+        days = [date(2019, 12, 23) + timedelta(days=n) for n in range(35)]
+        for array_method, method in (
+            (CALENDAR.is_business_day_array, CALENDAR.is_business_day),
+            (CALENDAR.next_business_day_array, CALENDAR.next_business_day),
+            (CALENDAR.previous_business_day_array, CALENDAR.previous_business_day),
+        ):
+            expected = [method(d) for d in days]
+            actual = array_method(days)
+            if np is not None:
+                actual = actual.tolist()
+            self.assertEqual(expected, actual)
+
+        days = days[3:-3]
+        expected = [CALENDAR.add_business_days(d, -2) for d in days]
+        actual = CALENDAR.add_business_days_array(days, -2)
+        self.assertEqual(expected, actual if np is None else actual.tolist())
+
+    def test_file_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "holidays.json")
+            CALENDAR.to_file(path)
+            calendar = BusinessDayCalendar.from_file(path)
+        self.assertEqual(CALENDAR.business_days("2019-12-20", "2020-01-31"),
+                         calendar.business_days("2019-12-20", "2020-01-31"))
+
+    def test_from_client(self):
+        client = ServicingClient(base_url="http://localhost:8888")
+        answers = {}
+        for d in (date(2019, 12, 30) + timedelta(days=n) for n in range(7)):
+            answers[d.isoformat()] = CALENDAR.next_business_day(d).isoformat()
+
+        def send(method, url, body, headers, deadline):
+            day = url.rsplit("/", 1)[1]
+            return 200, {}, f'{{"date": "{answers[day]}"}}'.encode()
+
+        with patch.object(BaseClient, "_BaseClient__perform_urllib_http_request", side_effect=send):
+            calendar = BusinessDayCalendar.from_client(client, start="2019-12-30", end="2020-01-05")
+
+        self.assertEqual(date(2020, 1, 6), calendar.end)
+        self.assertEqual(CALENDAR.business_days("2019-12-30", "2020-01-06"),
+                         calendar.business_days("2019-12-30", "2020-01-06"))
+
+
+class ClientCalendarTests(unittest.TestCase):
+    def test_served_from_the_calendar(self):
+        client = ServicingClient(base_url="http://localhost:8888", calendar=CALENDAR)
+        with patch.object(BaseClient, "_BaseClient__perform_urllib_http_request") as send:
+            self.assertEqual("2020-01-02", client.next_business_day(date="2020-01-01")["date"])
+            self.assertEqual("2020-01-02", client.previous_business_day(date="2020-01-02")["date"])
+        send.assert_not_called()
+
+    def test_async_served_from_the_calendar(self):
+        client = AsyncServicingClient(base_url="http://localhost:8888", calendar=CALENDAR)
+        loop = asyncio.new_event_loop()
+        try:
+            resp = loop.run_until_complete(client.next_business_day(date="2020-01-18"))
+        finally:
+            loop.close()
+        self.assertEqual(200, resp.status)
+        self.assertEqual("2020-01-21", resp["date"])
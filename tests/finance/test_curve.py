@@ -0,0 +1,58 @@
+import math
+import unittest
+
+from servicing.errors import ServicingClientError
+from servicing.finance import BenchmarkRateStore, Curve, CurveCache, RateSeries
+from servicing.finance.curve import FAMILIES
+from servicing.web.classes.enums import BenchmarkName
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def as_list(values):
+    return values if np is None else values.tolist()
+
+
+class CurveTests(unittest.TestCase):
+    def test_linear(self):
+        curve = Curve([1, 2, 5], [0.01, 0.02, 0.05])
+        self.assertAlmostEqual(0.015, curve.rate(1.5))
+        self.assertEqual(0.01, curve.rate(0.5))
+        self.assertEqual(0.05, curve.rate(30))
+
+    def test_log_linear_keeps_forward_rates_constant(self):
+        curve = Curve([1, 2], [0.01, 0.02], interpolation="log_linear")
+        df1, df2 = curve.discount_factor(1), curve.discount_factor(2)
+        self.assertAlmostEqual(math.sqrt(df1 * df2), curve.discount_factor(1.5))
+
+    def test_vectorized_matches_scalar(self):
+        maturities = [0.1, 1, 1.3, 2, 3.7, 5, 7]
+        for interpolation in ("linear", "log_linear"):
+            curve = Curve([1, 2, 5], [0.01, 0.02, 0.05], interpolation=interpolation)
+            for expected, actual in zip([curve.rate(t) for t in maturities], as_list(curve.rates(maturities))):
+                self.assertAlmostEqual(expected, actual)
+            for expected, actual in zip(
+                [curve.discount_factor(t) for t in maturities], as_list(curve.discount_factors(maturities))
+            ):
+                self.assertAlmostEqual(expected, actual)
+
+    def test_unknown_interpolation(self):
+        with self.assertRaises(ServicingClientError):
+            Curve([1], [0.01], interpolation="cubic")
+
+
+class CurveCacheTests(unittest.TestCase):
+    def test_curves_are_built_from_the_store_and_cached(self):
+        store = BenchmarkRateStore()
+        for name in FAMILIES["US_TREASURY_CMT"]:
+            store[name] = RateSeries.from_fixings([("2020-01-02", 0.015)])
+
+        cache = CurveCache(store)
+        curve = cache.get("US_TREASURY_CMT", "2020-01-03")
+        self.assertIs(curve, cache.get("US_TREASURY_CMT", "2020-01-03"))
+        self.assertEqual(7, len(curve.tenors))
+        self.assertEqual(0.015, curve.rate(3))
+        self.assertNotIn(BenchmarkName.LIBOR_1_MONTH, FAMILIES["US_TREASURY_CMT"])
@@ -0,0 +1,111 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+from unittest.mock import patch
+
+from servicing import ServicingClient
+from servicing.errors import ServicingApiError, ServicingClientError
+from servicing.finance import BenchmarkRateStore, RateSeries
+from servicing.web.base_client import BaseClient
+from servicing.web.classes.enums import BenchmarkName
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+FIXINGS = [("2020-01-02", 0.0155), ("2020-01-03", 0.0154), ("2020-01-06", 0.0155)]
+
+
+class RateSeriesTests(unittest.TestCase):
+    def test_as_of(self):
+        series = RateSeries.from_fixings(FIXINGS)
+        self.assertEqual(3, len(series))
+        self.assertEqual(0.0154, series.as_of("2020-01-05"))
+        self.assertEqual(0.0155, series.as_of(date(2020, 1, 6)))
+        with self.assertRaises(ServicingClientError):
+            series.as_of("2020-01-01")
+
+    def test_as_of_array(self):
+        series = RateSeries.from_fixings(FIXINGS)
+        dates = ["2020-01-02", "2020-01-04", "2020-01-10"]
+        rates = series.as_of_array(dates)
+        if np is not None:
+            rates = rates.tolist()
+        self.assertEqual([0.0155, 0.0154, 0.0155], rates)
+
+    def test_save_and_load(self):
+        series = RateSeries.from_fixings(FIXINGS)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "SOFR.rates")
+            series.save(path)
+            for mmap in (False, True):
+                loaded = RateSeries.load(path, mmap=mmap)
+                self.assertEqual(list(series.fixings()), list(loaded.fixings()))
+                self.assertEqual(0.0154, loaded.as_of("2020-01-05"))
+                del loaded
+
+
+class BenchmarkRateStoreTests(unittest.TestCase):
+    def test_prefetch(self):
+        client = ServicingClient(base_url="http://localhost:8888")
+
+        def send(method, url, body, headers, deadline):
+            day = url.rsplit("/", 1)[1]
+            if day == "2020-01-01":
+                return 404, {}, b'{"error": "no fixing"}'
+            return 200, {}, f'{{"name": "SOFR", "date": "{day}", "rate": "0.015"}}'.encode()
+
+        with tempfile.TemporaryDirectory() as directory:
+            store = BenchmarkRateStore(directory)
+            with patch.object(BaseClient, "_BaseClient__perform_urllib_http_request", side_effect=send) as http:
+                sent = store.prefetch(client, [BenchmarkName.SOFR], start="2019-12-30", end="2020-01-05")
+                self.assertEqual(5, sent)
+                self.assertEqual(0, store.prefetch(client, [BenchmarkName.SOFR], start="2020-01-02", end="2020-01-03"))
+            self.assertEqual(5, http.call_count)
+            self.assertEqual(0.015, store.as_of(BenchmarkName.SOFR, "2020-01-01"))
+
+            reloaded = BenchmarkRateStore(directory, mmap=True)
+            self.assertEqual(4, len(reloaded[BenchmarkName.SOFR]))
+            del reloaded
+
+    def test_prefetch_remembers_dates_without_a_fixing_of_their_own(self):
+        client = ServicingClient(base_url="http://localhost:8888")
+
+        def send(method, url, body, headers, deadline):
+            day = url.rsplit("/", 1)[1]
+            if day == "2019-12-30":
+                return 404, {}, b'{"error": "no fixing"}'
+            if day == "2020-01-01":
+                day = "2019-12-31"
+            return 200, {}, f'{{"name": "SOFR", "date": "{day}", "rate": "0.015"}}'.encode()
+
+        with tempfile.TemporaryDirectory() as directory:
+            with patch.object(BaseClient, "_BaseClient__perform_urllib_http_request", side_effect=send) as http:
+                store = BenchmarkRateStore(directory)
+                self.assertEqual(5, store.prefetch(client, [BenchmarkName.SOFR], start="2019-12-30", end="2020-01-03"))
+                self.assertEqual(0, store.prefetch(client, [BenchmarkName.SOFR], start="2019-12-30", end="2020-01-03"))
+                reloaded = BenchmarkRateStore(directory)
+                self.assertEqual(0, reloaded.prefetch(client, [BenchmarkName.SOFR], start="2019-12-30", end="2020-01-03"))
+            self.assertEqual(5, http.call_count)
+            self.assertEqual(3, len(reloaded[BenchmarkName.SOFR]))
+
+    def test_prefetch_keeps_the_fixings_fetched_before_an_error(self):
+        client = ServicingClient(base_url="http://localhost:8888")
+
+        def send(method, url, body, headers, deadline):
+            day = url.rsplit("/", 1)[1]
+            if day == "2020-01-02":
+                return 400, {}, b'{"error": "bad request"}'
+            return 200, {}, f'{{"name": "SOFR", "date": "{day}", "rate": "0.015"}}'.encode()
+
+        with tempfile.TemporaryDirectory() as directory:
+            store = BenchmarkRateStore(directory)
+            with patch.object(BaseClient, "_BaseClient__perform_urllib_http_request", side_effect=send) as http:
+                for _ in range(2):
+                    with self.assertRaises(ServicingApiError):
+                        store.prefetch(client, [BenchmarkName.SOFR], start="2019-12-30", end="2020-01-03")
+            # Only the failed date is asked for again
+            self.assertEqual(6, http.call_count)
+            self.assertEqual(4, len(BenchmarkRateStore(directory)[BenchmarkName.SOFR]))
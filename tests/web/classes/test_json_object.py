@@ -0,0 +1,121 @@
+import copy
+import pickle
+import unittest
+
+from servicing.errors import ServicingObjectFormationError
+from servicing.web.classes import JsonObject, JsonValidator
+from servicing.web.classes.loan import FixedPayment
+from servicing.web.classes.money import Money
+from servicing.web.codec import StdlibJsonCodec
+
+
+class Parent(JsonObject):
+    attributes = {"b", "a", "items"}
+
+    def __init__(self, a=None, b=None, items=None):
+        self.a = a
+        self.b = b
+        self.items = items
+
+    @JsonValidator("b is required")
+    def b_present(self):
+        return self.b is not None
+
+    @JsonValidator("a is required")
+    def a_present(self):
+        return self.a is not None
+
+
+class Child(Parent):
+    @JsonValidator("a must not be 0")
+    def a_not_zero(self):
+        return self.a != 0
+
+
+class Dynamic(JsonObject):
+    @property
+    def attributes(self):
+        return {"y", "x"}
+
+    def __init__(self):
+        self.x = 1
+        self.y = ""
+
+
+class JsonObjectTests(unittest.TestCase):
+    def test_validators_run_in_name_order(self):
+        with self.assertRaisesRegex(ServicingObjectFormationError, "a is required"):
+            Parent().to_dict()
+        with self.assertRaisesRegex(ServicingObjectFormationError, "a must not be 0"):
+            Child(a=0).to_dict()
+
+    def test_sorted_non_empty_attributes(self):
+        value = Parent(a=[Money("1")], b="x", items=[]).to_dict()
+        self.assertEqual(["a", "b"], list(value))
+        self.assertEqual([{"amount": "1", "currency": "USD"}], value["a"])
+
+    def test_attributes_property(self):
+        self.assertEqual({"x": 1}, Dynamic().to_dict())
+
+    def test_slots_follow_the_attributes(self):
+        self.assertEqual(("a", "b", "items"), Parent.__slots__)
+        self.assertEqual((), Child.__slots__)
+        for obj in (Money("1"), Child(a=1)):
+            self.assertFalse(hasattr(obj, "__dict__"))
+        with self.assertRaises(AttributeError):
+            Money("1").amount_in_cents = 100
+        self.assertEqual("<servicing.Money: {'amount': '1', 'currency': 'USD'}>", repr(Money("1")))
+        self.assertTrue(hasattr(Dynamic(), "__dict__"))
+
+    def test_cached_dict_is_rebuilt_after_assignment(self):
+        money = Money("1")
+        value = money.to_dict()
+        value["amount"] = "2"
+        self.assertEqual({"amount": "1", "currency": "USD"}, money.to_dict())
+        self.assertEqual(b'{"amount": "1", "currency": "USD"}', money.to_json())
+        money.amount = "3"
+        self.assertEqual({"amount": "3", "currency": "USD"}, money.to_dict())
+        self.assertEqual(b'{"amount": "3", "currency": "USD"}', money.to_json(StdlibJsonCodec()))
+
+    def test_nested_assignment_clears_the_parent(self):
+        amount = Money("1")
+        payment = FixedPayment(amount=amount)
+        payment.to_json()
+        amount.amount = "5"
+        self.assertEqual({"amount": "5", "currency": "USD"}, payment.to_dict()["amount"])
+        payment.amount = Money("6")
+        amount.amount = "7"
+        self.assertEqual("6", payment.to_dict()["amount"]["amount"])
+
+    def test_non_null_attributes_are_a_copy(self):
+        amount = Money("1")
+        payment = FixedPayment(amount=amount)
+        payment.to_dict()
+        payment.get_non_null_attributes()["amount"]["amount"] = "2"
+        self.assertEqual({"amount": "1", "currency": "USD"}, amount.to_dict())
+        self.assertEqual({"amount": "1", "currency": "USD"}, payment.to_dict()["amount"])
+
+    def test_lists_are_not_cached(self):
+        parent = Parent(a=[Money("1")], b="x")
+        parent.to_dict()
+        parent.a.append(Money("2"))
+        self.assertEqual(2, len(parent.to_dict()["a"]))
+        holder = Parent(a=parent, b="y")
+        holder.to_dict()
+        parent.a.append(Money("3"))
+        self.assertEqual(3, len(holder.to_dict()["a"]["a"]))
+        with self.assertRaisesRegex(ServicingObjectFormationError, "a is required"):
+            parent.a = None
+            parent.to_json()
+
+    def test_copy_and_pickle(self):
+        payment = FixedPayment(amount=Money("1"))
+        payment.to_json()
+        for clone in (copy.copy(payment), copy.deepcopy(payment), pickle.loads(pickle.dumps(payment))):
+            self.assertEqual(payment.to_dict(), clone.to_dict())
+        clone = copy.deepcopy(payment)
+        clone.amount.amount = "2"
+        self.assertEqual("2", clone.to_dict()["amount"]["amount"])
+        self.assertEqual("1", payment.to_dict()["amount"]["amount"])
+        dynamic = pickle.loads(pickle.dumps(Dynamic()))
+        self.assertEqual({"x": 1}, dynamic.to_dict())
@@ -0,0 +1,137 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+from datetime import date, datetime
+from decimal import Decimal
+from unittest.mock import patch
+from uuid import uuid4
+
+from servicing.errors import ServicingBatchFormationError
+from servicing.web.async_client import AsyncServicingClient
+from servicing.web.async_connection_pool import AsyncConnectionPool
+from servicing.web.classes.money import Money
+from servicing.web.classes.payment import Payment
+from servicing.web.classes.transaction_batch import DrawBatch, MiscFeeBatch, PaymentBatch
+from servicing.web.client import ServicingClient
+from servicing.web.transport import InMemoryTransport
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+LOAN_ID = "cac761d1-9666-4c8e-8128-f3227b9ef6fe"
+
+
+class TransactionBatchTests(unittest.TestCase):
+    def test_bodies_match_the_model_objects(self):
+        batch = PaymentBatch(loan_ids=[LOAN_ID, uuid4()], dates=["2020-05-28", date(2020, 6, 1)],
+                             amounts=["5000.00", Decimal("10.50")])
+        self.assertEqual({}, batch.errors)
+        self.assertEqual(Payment(date="2020-05-28", amount=Money("5000.00")).to_dict(), batch.body(0))
+        self.assertEqual({"amount": {"amount": "10.50", "currency": "USD"}, "date": "2020-06-01"}, batch.body(1))
+
+    def test_per_row_errors(self):
+        for numpy in (np, None):
+            with patch("servicing.web.classes.transaction_batch.np", numpy):
+                batch = DrawBatch(loan_ids=[LOAN_ID, "nope", None, LOAN_ID.upper()],
+                                  dates=["2020-05-28", "2020", None, "2020-02-30"],
+                                  amounts=[1.5, "x", None, 2], currency=["USD", "USD", "", "EUR"])
+            self.assertEqual({
+                1: ["loan_id is not valid: 'nope'", "date is not valid: '2020'", "amount is not valid: 'x'"],
+                2: ["loan_id is required", "date is required", "amount is required", "currency is required"],
+                3: ["date is not valid: '2020-02-30'"],
+            }, batch.errors)
+            self.assertEqual({"amount": {"amount": "1.50", "currency": "USD"}, "date": "2020-05-28"}, batch.body(0))
+            with self.assertRaisesRegex(ServicingBatchFormationError, "3 invalid rows: row 1: loan_id"):
+                batch.calls()
+
+    def test_datetimes_with_a_time_of_day_are_rejected(self):
+        for numpy in (np, None):
+            with patch("servicing.web.classes.transaction_batch.np", numpy):
+                batch = PaymentBatch(loan_ids=[LOAN_ID] * 3, amounts=[1] * 3,
+                                     dates=[datetime(2020, 1, 1), datetime(2020, 1, 1, 10), "2020-01-01T10:00"])
+            self.assertEqual([1, 2], sorted(batch.errors))
+            self.assertEqual("2020-01-01", batch.body(0)["date"])
+
+    def test_columns_must_have_the_same_length(self):
+        with self.assertRaises(ValueError):
+            MiscFeeBatch(loan_ids=[LOAN_ID], dates=[], amounts=[])
+
+    @unittest.skipIf(np is None, "needs numpy")
+    def test_numpy_columns(self):
+        batch = PaymentBatch(
+            loan_ids=np.array([LOAN_ID] * 3),
+            dates=np.array(["2020-05-28", "NaT", "2020-06-01"], dtype="datetime64[D]"),
+            amounts=np.array([1.005, 2.5, np.nan]),
+        )
+        self.assertEqual({1: ["date is required"], 2: ["amount is required"]}, batch.errors)
+        self.assertEqual({"amount": {"amount": "1.00", "currency": "USD"}, "date": "2020-05-28"}, batch.body(0))
+
+        batch = DrawBatch(
+            loan_ids=[LOAN_ID] * 2,
+            dates=np.array(["2020-05-28T00:00", "2020-05-28T10:00"], dtype="datetime64[s]"),
+            amounts=np.array([1.005, 2.5], dtype=np.float32),
+        )
+        self.assertEqual([1], list(batch.errors))
+        self.assertEqual({"amount": {"amount": "1.00", "currency": "USD"}, "date": "2020-05-28"}, batch.body(0))
+
+    def test_submit(self):
+        def echo(method, url, body, headers):
+            return 201, {}, json.dumps({"url": url, "body": json.loads(body)}).encode()
+
+        client = ServicingClient(base_url="http://localhost:8888", transport=InMemoryTransport(echo))
+        batch = MiscFeeBatch(loan_ids=[LOAN_ID] * 20, dates=["2020-05-28"] * 20, amounts=range(20))
+        results = list(client.submit(batch))
+        self.assertEqual(list(range(20)), [r.index for r in results])
+        self.assertTrue(all(r.ok for r in results))
+        self.assertEqual(f"http://localhost:8888/v1/private/loan/{LOAN_ID}/fee", results[3].response["url"])
+        self.assertEqual({"amount": {"amount": "3", "currency": "USD"}, "date": "2020-05-28"},
+                         results[3].response["body"])
+
+    def test_async_submit(self):
+        def echo(method, url, body, headers):
+            status = 400 if b'"amount": "13"' in body else 201
+            return status, {}, json.dumps({"url": url, "body": json.loads(body)}).encode()
+
+        client = AsyncServicingClient(base_url="http://localhost:8888", transport=InMemoryTransport(echo))
+        batch = PaymentBatch(loan_ids=[LOAN_ID] * 20, dates=["2020-05-28"] * 20, amounts=range(20))
+        loop = asyncio.new_event_loop()
+        try:
+            results = loop.run_until_complete(self._collect(client.submit(batch, deadline=5)))
+        finally:
+            loop.close()
+        self.assertEqual(list(range(20)), [r.index for r in results])
+        self.assertEqual([13], [r.index for r in results if not r.ok])
+        self.assertEqual(f"http://localhost:8888/v1/private/loan/{LOAN_ID}/payment", results[3].response["url"])
+
+    def test_async_submit_keeps_at_most_max_connections_in_flight(self):
+        lock = threading.Lock()
+        in_flight = [0, 0]
+
+        def slow(method, url, body, headers):
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight)
+            time.sleep(0.01)
+            with lock:
+                in_flight[0] -= 1
+            return 201, {}, b"{}"
+
+        client = AsyncServicingClient(base_url="http://localhost:8888", transport=InMemoryTransport(slow),
+                                      pool=AsyncConnectionPool(max_connections=3))
+        batch = DrawBatch(loan_ids=[LOAN_ID] * 20, dates=["2020-05-28"] * 20, amounts=range(20))
+        loop = asyncio.new_event_loop()
+        try:
+            results = loop.run_until_complete(self._collect(client.submit(batch, ordered=False)))
+        finally:
+            loop.close()
+        self.assertEqual(list(range(20)), sorted(r.index for r in results))
+        self.assertTrue(all(r.ok for r in results))
+        self.assertLessEqual(in_flight[1], 3)
+
+    @staticmethod
+    async def _collect(results):
+        return [result async for result in results]
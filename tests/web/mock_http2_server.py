@@ -0,0 +1,100 @@
+import json
+import socket
+import socketserver
+import threading
+
+from h2.config import H2Configuration
+from h2.connection import H2Connection
+from h2.events import ConnectionTerminated, DataReceived, RequestReceived, StreamEnded
+
+
+class Http2Handler(socketserver.BaseRequestHandler):
+    """Answers every request with a JSON echo of it over cleartext HTTP/2,
+    after `server.delay` seconds. Streams are answered concurrently."""
+
+    def handle(self):
+        self.server.connections += 1
+        self.conn = H2Connection(config=H2Configuration(client_side=False, header_encoding="utf-8"))
+        self.lock = threading.Lock()
+        self.requests = {}
+        with self.lock:
+            self.conn.initiate_connection()
+            self.request.sendall(self.conn.data_to_send())
+
+        while True:
+            try:
+                data = self.request.recv(65536)
+            except OSError:
+                return
+            if not data:
+                return
+            with self.lock:
+                for event in self.conn.receive_data(data):
+                    if isinstance(event, RequestReceived):
+                        self.requests[event.stream_id] = (dict(event.headers), [])
+                    elif isinstance(event, DataReceived):
+                        self.requests[event.stream_id][1].append(event.data)
+                        if not self.server.stall_uploads:
+                            self.conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                    elif isinstance(event, StreamEnded):
+                        self.respond_later(event.stream_id)
+                    elif isinstance(event, ConnectionTerminated):
+                        return
+                self.request.sendall(self.conn.data_to_send())
+
+    def respond_later(self, stream_id):
+        if self.server.delay:
+            threading.Timer(self.server.delay, self.respond, (stream_id,)).start()
+        else:
+            self.respond(stream_id, locked=True)
+
+    def respond(self, stream_id, locked=False):
+        headers, chunks = self.requests.pop(stream_id)
+        path = headers[":path"]
+        status = 404 if path.endswith("/missing") else 200
+        body = json.dumps({
+            "method": headers[":method"],
+            "path": path,
+            "authorization": headers.get("authorization"),
+            "body": b"".join(chunks).decode("utf-8"),
+        }).encode("utf-8")
+        response_headers = [(":status", str(status)), ("content-type", "application/json"),
+                            ("content-length", str(len(body)))]
+        if not locked:
+            self.lock.acquire()
+        try:
+            self.conn.send_headers(stream_id, response_headers)
+            self.conn.send_data(stream_id, body, end_stream=True)
+            self.request.sendall(self.conn.data_to_send())
+        except OSError:
+            pass
+        finally:
+            if not locked:
+                self.lock.release()
+
+
+class Http2Server(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, delay=0.0, stall_uploads=False):
+        super().__init__(("127.0.0.1", 0), Http2Handler)
+        self.delay = delay
+        self.stall_uploads = stall_uploads
+        self.connections = 0
+        self.url = f"http://127.0.0.1:{self.server_address[1]}"
+        self.thread = threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        self.server_close()
+        self.thread.join()
+
+    def get_request(self):
+        sock, address = super().get_request()
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock, address
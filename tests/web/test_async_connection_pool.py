@@ -0,0 +1,81 @@
+import asyncio
+import json
+from http.client import RemoteDisconnected
+import threading
+import unittest
+
+from servicing.web.async_connection_pool import AsyncConnectionPool
+from tests.web.mock_servicing_api_server import MockServerThread
+from tests.web.test_connection_pool import KeepAliveHandler
+
+
+class AsyncConnectionPoolTests(unittest.TestCase):
+    def setUp(self):
+        KeepAliveHandler.connections = 0
+        self.server_started = threading.Event()
+        self.thread = MockServerThread(self, KeepAliveHandler)
+        self.thread.start()
+        self.server_started.wait()
+        self.loop = asyncio.new_event_loop()
+        self.pool = AsyncConnectionPool(max_connections=1)
+
+    def tearDown(self):
+        self.pool.close()
+        self.loop.run_until_complete(asyncio.sleep(0))
+        self.loop.close()
+        self.thread.stop()
+
+    def test_reuses_connections(self):
+        async def run():
+            return await asyncio.gather(
+                *(self.pool.urlopen("GET", f"{self.server_url}/v1/public/status") for _ in range(3))
+            )
+
+        for status, _, body in self.loop.run_until_complete(run()):
+            self.assertEqual(200, status)
+            self.assertEqual({"status": "OK"}, json.loads(body))
+
+        self.assertEqual(1, KeepAliveHandler.connections)
+        self.assertEqual(1, self.pool.num_idle(self.server_url))
+
+    def test_does_not_pool_closed_connections(self):
+        status, _, _ = self.loop.run_until_complete(
+            self.pool.urlopen("GET", f"{self.server_url}/v1/public/close")
+        )
+        self.assertEqual(200, status)
+        self.assertEqual(0, self.pool.num_idle())
+
+    def test_skips_interim_responses(self):
+        status, headers, body = self.loop.run_until_complete(
+            self.pool.urlopen("GET", f"{self.server_url}/v1/public/continue")
+        )
+        self.assertEqual(200, status)
+        self.assertEqual({"status": "OK"}, json.loads(body))
+
+    def test_rejects_line_breaks_in_headers(self):
+        with self.assertRaises(ValueError):
+            self.loop.run_until_complete(
+                self.pool.urlopen("GET", f"{self.server_url}/v1/public/status", headers={"X-Id": "1\r\nX-Evil: 1"})
+            )
+
+    def test_resends_only_idempotent_requests(self):
+        url = f"{self.server_url}/v1/public/status"
+        self.loop.run_until_complete(self.pool.urlopen("GET", url))
+        send = self.pool._send
+        methods = []
+
+        async def disconnect_once(conn, key, method, *args):
+            methods.append(method)
+            if len(methods) == 1:
+                raise RemoteDisconnected("Remote end closed connection without response")
+            return await send(conn, key, method, *args)
+
+        self.pool._send = disconnect_once
+        with self.assertRaises(RemoteDisconnected):
+            self.loop.run_until_complete(self.pool.urlopen("POST", url, body=b"{}"))
+        self.assertEqual(["POST"], methods)
+
+        self.loop.run_until_complete(self.pool.urlopen("GET", url))
+        methods.clear()
+        self.assertEqual(200, self.loop.run_until_complete(self.pool.urlopen("GET", url))[0])
+        self.assertEqual(["GET", "GET"], methods)
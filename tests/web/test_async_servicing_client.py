@@ -0,0 +1,63 @@
+import asyncio
+import unittest
+from uuid import uuid4
+
+from servicing import AsyncServicingClient
+from servicing.errors import ServicingInvalidPathParamError
+from tests.web.mock_servicing_api_server import setup_mock_servicing_api_server, cleanup_mock_servicing_api_server
+
+
+class AsyncServicingClientTests(unittest.TestCase):
+
+    def setUp(self):
+        setup_mock_servicing_api_server(self)
+        self.loop = asyncio.new_event_loop()
+
+        self.client = AsyncServicingClient(
+            token="1234",
+            base_url="http://localhost:8888",
+        )
+
+    def tearDown(self):
+        self.client.close()
+        self.loop.close()
+        cleanup_mock_servicing_api_server(self)
+
+    def test_api_calls_return_a_response(self):
+        self.client.token = "status"
+        resp = self.loop.run_until_complete(self.client.status())
+        self.assertEqual(200, resp.status)
+        self.assertTrue(resp["status"] == "OK")
+
+    def test_login(self):
+        resp = self.loop.run_until_complete(
+            self.client.login(email="support@loan-street.com", password="not-a-valid-password")
+        )
+        self.assertEqual(200, resp.status)
+        self.assertGreater(len(resp['token']), 0)
+
+    def test_concurrent_calls(self):
+        self.client.token = "status"
+
+        async def run():
+            return await asyncio.gather(*(self.client.status() for _ in range(10)))
+
+        responses = self.loop.run_until_complete(run())
+        self.assertEqual([200] * 10, [r.status for r in responses])
+
+    def test_resource_clients_are_coroutines(self):
+        self.assertTrue(asyncio.iscoroutinefunction(self.client.loan.get))
+        self.assertTrue(asyncio.iscoroutinefunction(self.client.institution.list_loans))
+
+        coro = self.client.loan.get(loan_id="not-a-uuid")
+        with self.assertRaises(ServicingInvalidPathParamError):
+            self.loop.run_until_complete(coro)
+
+    def test_iter_transactions(self):
+        self.client.token = "loans"
+
+        async def run():
+            return [t async for t in self.client.loan.iter_transactions(loan_id=uuid4())]
+
+        transactions = self.loop.run_until_complete(run())
+        self.assertEqual(2, len(transactions))
@@ -0,0 +1,56 @@
+import threading
+import time
+import unittest
+
+from servicing.errors import ServicingApiError
+from servicing.web.batch import BatchExecutor
+from servicing.web.servicing_response import ServicingResponse
+
+
+def get(*, value: int):
+    if value < 0:
+        raise ValueError(value)
+    time.sleep(0.001 * (value % 3))
+    return value * 2
+
+
+class BatchExecutorTests(unittest.TestCase):
+    def setUp(self):
+        self.executor = BatchExecutor(max_workers=4)
+
+    def test_results_are_in_input_order(self):
+        results = list(self.executor.run(get, ({"value": i} for i in range(50))))
+        self.assertEqual(list(range(50)), [r.index for r in results])
+        self.assertEqual([i * 2 for i in range(50)], [r.response for r in results])
+
+    def test_results_as_completed(self):
+        results = list(self.executor.run(get, ({"value": i} for i in range(50)), ordered=False))
+        self.assertEqual(list(range(50)), sorted(r.index for r in results))
+
+    def test_failures_are_collected_per_item(self):
+        results = list(self.executor.run(get, [{"value": 1}, {"value": -1}, {"value": 2}]))
+        self.assertEqual([True, False, True], [r.ok for r in results])
+        self.assertIsInstance(results[1].error, ValueError)
+        self.assertEqual({"value": -1}, results[1].kwargs)
+
+    def test_validate_reports_unsuccessful_responses(self):
+        def call():
+            return ServicingResponse(method="GET", url="/", data=None, headers={}, status=500)
+
+        [result] = self.executor.run(call, [{}], validate=True)
+        self.assertIsInstance(result.error, ServicingApiError)
+
+    def test_concurrency_is_bounded(self):
+        lock = threading.Lock()
+        running = [0, 0]
+
+        def call():
+            with lock:
+                running[0] += 1
+                running[1] = max(running)
+            time.sleep(0.005)
+            with lock:
+                running[0] -= 1
+
+        list(self.executor.run(call, ({} for _ in range(20))))
+        self.assertLessEqual(running[1], 4)
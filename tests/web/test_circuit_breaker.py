@@ -0,0 +1,118 @@
+import time
+import unittest
+from unittest.mock import patch
+
+from servicing.errors import ServicingCircuitOpenError, ServicingTimeoutError
+from servicing.util import path_template
+from servicing.web.base_client import BaseClient
+from servicing.web.circuit_breaker import CircuitBreaker, CircuitState
+from servicing.web.deadline import Deadline
+from servicing.web.transport import InMemoryTransport
+
+
+class CircuitBreakerTests(unittest.TestCase):
+    def setUp(self):
+        self.breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=10)
+        self.endpoint = "/v1/private/loan/{id}/payment"
+
+    def test_opens_after_consecutive_failures(self):
+        self.breaker.record(self.endpoint, 503)
+        self.breaker.record(self.endpoint, 200)
+        self.breaker.record(self.endpoint, 503)
+        self.assertEqual(CircuitState.CLOSED, self.breaker.state(self.endpoint))
+
+        self.breaker.record(self.endpoint)
+        self.assertEqual(CircuitState.OPEN, self.breaker.state(self.endpoint))
+        with self.assertRaises(ServicingCircuitOpenError):
+            self.breaker.before_request(self.endpoint)
+
+        self.breaker.before_request("/v1/public/benchmark/SOFR/{date}")
+
+    def test_half_open_trial_closes_or_reopens(self):
+        self.breaker.record(self.endpoint, 500)
+        self.breaker.record(self.endpoint, 500)
+
+        with patch("servicing.web.circuit_breaker.time.monotonic", return_value=1e12):
+            self.assertEqual(CircuitState.HALF_OPEN, self.breaker.state(self.endpoint))
+            self.breaker.before_request(self.endpoint)
+            with self.assertRaises(ServicingCircuitOpenError):
+                self.breaker.before_request(self.endpoint)
+            self.breaker.record(self.endpoint, 500)
+            self.assertEqual(CircuitState.OPEN, self.breaker.state(self.endpoint))
+
+        with patch("servicing.web.circuit_breaker.time.monotonic", return_value=2e12):
+            self.breaker.before_request(self.endpoint)
+            self.breaker.record(self.endpoint, 201)
+            self.assertEqual({self.endpoint: CircuitState.CLOSED}, self.breaker.states())
+
+    def test_released_trial_can_be_taken_again(self):
+        self.breaker.record(self.endpoint, 500)
+        self.breaker.record(self.endpoint, 500)
+
+        with patch("servicing.web.circuit_breaker.time.monotonic", return_value=1e12):
+            self.breaker.before_request(self.endpoint)
+            self.breaker.release(self.endpoint)
+            self.assertEqual(CircuitState.HALF_OPEN, self.breaker.state(self.endpoint))
+            self.breaker.before_request(self.endpoint)
+
+
+class BaseClientCircuitBreakerTests(unittest.TestCase):
+    def test_fails_fast_per_endpoint_family(self):
+        client = BaseClient(base_url="http://localhost:8888", circuit_breaker=CircuitBreaker(failure_threshold=1))
+        with patch.object(
+            BaseClient, "_BaseClient__perform_urllib_http_request", return_value=(503, {}, b"")
+        ) as send:
+            client.api_call(method="GET", path="/v1/private/loan/cac761d1-9666-4c8e-8128-f3227b9ef6fe")
+            with self.assertRaises(ServicingCircuitOpenError):
+                client.api_call(method="GET", path="/v1/private/loan/01bf113e-4648-4859-8a2a-42bebb411a83")
+            client.api_call(method="GET", path="/v1/public/status")
+        self.assertEqual(2, send.call_count)
+        self.assertEqual(CircuitState.OPEN, client.circuit_breaker.state("/v1/private/loan/{id}"))
+
+    def test_half_open_timeout_reopens_the_circuit(self):
+        responses = iter([503, None, 200])
+
+        def handler(method, url, body, headers):
+            status = next(responses)
+            if status is None:
+                time.sleep(0.15)
+                raise TimeoutError("timed out")
+            return status, {}, b"{}"
+
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.05)
+        client = BaseClient(base_url="http://localhost:8888", circuit_breaker=breaker,
+                            transport=InMemoryTransport(handler))
+        client.api_call(method="GET", path="/v1/public/status")
+        time.sleep(0.06)
+        with self.assertRaises(ServicingTimeoutError):
+            client.api_call(method="GET", path="/v1/public/status", deadline=0.1)
+        self.assertEqual(CircuitState.OPEN, breaker.state("/v1/public/status"))
+        time.sleep(0.06)
+        self.assertEqual(200, client.api_call(method="GET", path="/v1/public/status").status)
+        self.assertEqual(CircuitState.CLOSED, breaker.state("/v1/public/status"))
+
+    def test_expired_deadline_leaves_the_circuit_closed(self):
+        sent = []
+
+        def handler(method, url, body, headers):
+            sent.append(url)
+            return 200, {}, b"{}"
+
+        breaker = CircuitBreaker(failure_threshold=2)
+        client = BaseClient(base_url="http://localhost:8888", circuit_breaker=breaker,
+                            transport=InMemoryTransport(handler))
+        for _ in range(2):
+            with self.assertRaises(ServicingTimeoutError):
+                client.api_call(method="GET", path="/v1/public/status", deadline=Deadline(0))
+        self.assertEqual([], sent)
+        self.assertEqual(CircuitState.CLOSED, breaker.state("/v1/public/status"))
+        self.assertEqual(200, client.api_call(method="GET", path="/v1/public/status").status)
+
+
+class PathTemplateTests(unittest.TestCase):
+    def test_path_template(self):
+        self.assertEqual(
+            "/v1/private/loan/{id}/invoice/{n}",
+            path_template("/v1/private/loan/cac761d1-9666-4c8e-8128-f3227b9ef6fe/invoice/3?view=BASIC"),
+        )
+        self.assertEqual("/v1/public/benchmark/SOFR/{date}", path_template("/v1/public/benchmark/SOFR/2020-01-02"))
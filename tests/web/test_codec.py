@@ -0,0 +1,40 @@
+import importlib.util
+import unittest
+from decimal import Decimal
+from uuid import UUID
+
+from servicing.errors import ServicingClientError
+from servicing.web.base_client import BaseClient
+from servicing.web.codec import StdlibJsonCodec, get_codec
+
+LOAN_ID = UUID("cac761d1-9666-4c8e-8128-f3227b9ef6fe")
+
+
+class CodecTests(unittest.TestCase):
+    def assert_round_trip(self, codec):
+        body = codec.dumps({"loan_id": LOAN_ID, "amount": Decimal("5000.10")})
+        self.assertIsInstance(body, bytes)
+        self.assertEqual({"loan_id": str(LOAN_ID), "amount": "5000.10"}, codec.loads(body))
+
+    def test_stdlib(self):
+        self.assert_round_trip(get_codec("json"))
+
+    @unittest.skipUnless(importlib.util.find_spec("orjson"), "orjson is not installed")
+    def test_orjson(self):
+        self.assert_round_trip(get_codec("orjson"))
+
+    @unittest.skipUnless(importlib.util.find_spec("ujson"), "ujson is not installed")
+    def test_ujson(self):
+        self.assert_round_trip(get_codec("ujson"))
+
+    def test_auto_picks_an_installed_codec(self):
+        self.assert_round_trip(get_codec("auto"))
+
+    def test_unknown_codec(self):
+        with self.assertRaises(ServicingClientError):
+            get_codec("yaml")
+
+    def test_client_codec(self):
+        self.assertIsInstance(BaseClient().codec, StdlibJsonCodec)
+        codec = StdlibJsonCodec()
+        self.assertIs(codec, BaseClient(codec=codec).codec)
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+import unittest
+from unittest.mock import patch
+
+from servicing.errors import ServicingTimeoutError
+from servicing.web.base_client import BaseClient
+from servicing.web.concurrency import AdaptiveConcurrencyLimiter
+
+LOAN_PATH = "/v1/private/loan/cac761d1-9666-4c8e-8128-f3227b9ef6fe"
+
+
+def complete(limiter, n, latency=0.01, status=200):
+    for _ in range(n):
+        limiter.acquire()
+        limiter.release(latency, status)
+
+
+class AdaptiveConcurrencyLimiterTests(unittest.TestCase):
+    def test_additive_increase(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, window=10)
+        complete(limiter, 30)
+        self.assertEqual(7, limiter.limit)
+        self.assertEqual([5, 6, 7], [s.limit for s in limiter.history])
+
+    def test_multiplicative_decrease_on_errors(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8, window=10)
+        complete(limiter, 9)
+        complete(limiter, 1, status=429)
+        self.assertEqual(4, limiter.limit)
+        self.assertEqual(0.1, limiter.history[-1].error_rate)
+
+    def test_multiplicative_decrease_on_latency(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8, window=10)
+        complete(limiter, 10, latency=0.01)
+        complete(limiter, 10, latency=0.05)
+        self.assertEqual([9, 4], [s.limit for s in limiter.history])
+
+    def test_steady_heavy_tail_keeps_the_limit(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8, window=20)
+        for _ in range(5):
+            complete(limiter, 18, latency=0.01)
+            complete(limiter, 2, latency=0.2)
+        self.assertEqual([9, 10, 11, 12, 13], [s.limit for s in limiter.history])
+
+    def test_limit_bounds(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, min_limit=2, max_limit=3, window=1)
+        complete(limiter, 5)
+        self.assertEqual(3, limiter.limit)
+        complete(limiter, 5, status=503)
+        self.assertEqual(2, limiter.limit)
+
+    def test_waits_for_a_slot(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+        limiter.acquire()
+        acquired = threading.Event()
+        thread = threading.Thread(target=lambda: (limiter.acquire(), acquired.set()))
+        thread.start()
+        self.assertFalse(acquired.wait(0.05))
+        limiter.release(0.01, 200)
+        self.assertTrue(acquired.wait(1))
+        thread.join()
+
+    def test_acquire_times_out(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+        limiter.acquire()
+        with self.assertRaises(ServicingTimeoutError):
+            limiter.acquire(0.01)
+
+        async def run():
+            with self.assertRaises(ServicingTimeoutError):
+                await limiter.acquire_async(0.01)
+
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(run())
+        finally:
+            loop.close()
+        self.assertEqual(1, limiter.in_flight)
+
+    def test_async_waits_for_a_slot(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+
+        async def run():
+            await limiter.acquire_async()
+            waiter = asyncio.ensure_future(limiter.acquire_async())
+            await asyncio.sleep(0.01)
+            self.assertFalse(waiter.done())
+            limiter.release(0.01, 200)
+            await asyncio.wait_for(waiter, 1)
+
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(run())
+        finally:
+            loop.close()
+        self.assertEqual(1, limiter.in_flight)
+
+    def test_client_records_each_request(self):
+        limiter = AdaptiveConcurrencyLimiter(window=2)
+        client = BaseClient(base_url="http://localhost:8888", concurrency_limiter=limiter)
+        responses = [(200, {}, b"{}"), (500, {}, b"{}")]
+        with patch.object(BaseClient, "_BaseClient__perform_urllib_http_request", side_effect=responses):
+            client.api_call(method="GET", path=LOAN_PATH)
+            client.api_call(method="POST", path=LOAN_PATH)
+        self.assertEqual(0, limiter.in_flight)
+        self.assertEqual(0.5, limiter.history[-1].error_rate)
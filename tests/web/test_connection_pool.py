@@ -0,0 +1,174 @@
+import json
+import os
+import shutil
+import socket
+import ssl
+import subprocess
+import tempfile
+import threading
+import unittest
+from http.client import RemoteDisconnected
+from http.server import HTTPServer
+from socketserver import ThreadingMixIn
+
+from servicing.web.connection_pool import ConnectionPool
+from servicing.web.dns_cache import DnsCache
+from tests.web.mock_servicing_api_server import MockHandler, MockServerThread
+
+
+class KeepAliveHandler(MockHandler):
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        KeepAliveHandler.connections += 1
+
+    def _handle(self):
+        body = json.dumps({"status": "OK"}).encode("utf-8")
+        if self.path.endswith("/continue"):
+            self.send_response_only(100)
+            self.end_headers()
+        self.send_response(200)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(body)))
+        if self.path.endswith("/close"):
+            self.send_header("connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class ConnectionPoolTests(unittest.TestCase):
+    def setUp(self):
+        KeepAliveHandler.connections = 0
+        self.server_started = threading.Event()
+        self.thread = MockServerThread(self, KeepAliveHandler)
+        self.thread.start()
+        self.server_started.wait()
+        self.pool = ConnectionPool(maxsize=2)
+
+    def tearDown(self):
+        self.pool.close()
+        self.thread.stop()
+
+    def test_reuses_connections(self):
+        for _ in range(3):
+            status, _, body = self.pool.urlopen(
+                "GET", f"{self.server_url}/v1/public/status"
+            )
+            self.assertEqual(200, status)
+            self.assertEqual({"status": "OK"}, json.loads(body))
+
+        self.assertEqual(1, KeepAliveHandler.connections)
+        self.assertEqual(1, self.pool.num_idle(self.server_url))
+
+    def test_does_not_pool_closed_connections(self):
+        status, _, _ = self.pool.urlopen("GET", f"{self.server_url}/v1/public/close")
+        self.assertEqual(200, status)
+        self.assertEqual(0, self.pool.num_idle())
+
+    def test_evicts_idle_connections(self):
+        self.pool.idle_timeout = 0
+        self.pool.urlopen("GET", f"{self.server_url}/v1/public/status")
+        self.pool.urlopen("GET", f"{self.server_url}/v1/public/status")
+        self.assertEqual(2, KeepAliveHandler.connections)
+
+    def test_reconnects_stale_connections(self):
+        self.pool.urlopen("GET", f"{self.server_url}/v1/public/status")
+        key = next(iter(self.pool._idle))
+        conn, _ = self.pool._idle[key][0]
+        conn.sock.close()
+
+        status, _, _ = self.pool.urlopen("GET", f"{self.server_url}/v1/public/status")
+        self.assertEqual(200, status)
+
+    def test_resends_only_idempotent_requests(self):
+        self.pool.urlopen("GET", f"{self.server_url}/v1/public/status")
+        send = self.pool._send
+        methods = []
+
+        def disconnect_once(conn, method, *args):
+            methods.append(method)
+            if len(methods) == 1:
+                raise RemoteDisconnected("Remote end closed connection without response")
+            return send(conn, method, *args)
+
+        self.pool._send = disconnect_once
+        with self.assertRaises(RemoteDisconnected):
+            self.pool.urlopen("POST", f"{self.server_url}/v1/private/loan", body=b"{}")
+        self.assertEqual(["POST"], methods)
+
+        self.pool.urlopen("GET", f"{self.server_url}/v1/public/status")
+        methods.clear()
+        status, _, _ = self.pool.urlopen("GET", f"{self.server_url}/v1/public/status")
+        self.assertEqual(200, status)
+        self.assertEqual(["GET", "GET"], methods)
+
+    def test_warm_up(self):
+        self.assertEqual(1, self.pool.warm_up(self.server_url, 1))
+        self.assertEqual(1, self.pool.warm_up(self.server_url, 1))
+        self.pool.urlopen("GET", f"{self.server_url}/v1/public/status")
+        self.assertEqual(1, KeepAliveHandler.connections)
+        self.assertEqual(2, self.pool.warm_up(self.server_url))
+
+    def test_dns_cache(self):
+        lookups = []
+
+        def resolver(*args):
+            lookups.append(args[:2])
+            return socket.getaddrinfo(*args)
+
+        self.pool.dns_cache = DnsCache(resolver=resolver)
+        self.pool.idle_timeout = 0
+        self.pool.urlopen("GET", f"{self.server_url}/v1/public/status")
+        self.pool.urlopen("GET", f"{self.server_url}/v1/public/status")
+        self.assertEqual(2, KeepAliveHandler.connections)
+        self.assertEqual([("localhost", 8888)], lookups)
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+@unittest.skipIf(shutil.which("openssl") is None, "needs openssl to create a certificate")
+class TlsSessionTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.cert = os.path.join(cls.directory, "cert.pem")
+        key = os.path.join(cls.directory, "key.pem")
+        subprocess.run(
+            ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1", "-keyout", key,
+             "-out", cls.cert, "-subj", "/CN=localhost", "-addext", "subjectAltName=DNS:localhost"],
+            check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cls.cert, key)
+        cls.server = ThreadingHTTPServer(("localhost", 0), KeepAliveHandler)
+        cls.server.socket = context.wrap_socket(cls.server.socket, server_side=True)
+        cls.url = f"https://localhost:{cls.server.server_address[1]}"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, args=(0.05,))
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.thread.join()
+        shutil.rmtree(cls.directory)
+
+    def test_new_connections_resume_the_tls_session(self):
+        pool = ConnectionPool(ssl=ssl.create_default_context(cafile=self.cert), maxsize=3, idle_timeout=0)
+        try:
+            reused = []
+            for _ in range(3):
+                response = pool.open("GET", f"{self.url}/v1/public/status")
+                reused.append(response._conn.sock.session_reused)
+                response.read()
+                response.close()
+            self.assertEqual([False, True, True], reused)
+
+            pool.idle_timeout = None
+            self.assertEqual(3, pool.warm_up(self.url))
+            self.assertTrue(all(conn.sock.session_reused for conn, _ in next(iter(pool._idle.values()))))
+        finally:
+            pool.close()
@@ -0,0 +1,114 @@
+import socket
+import time
+import unittest
+from email.message import Message
+from unittest.mock import patch
+
+from servicing.errors import ServicingTimeoutError
+from servicing.web.base_client import BaseClient
+from servicing.web.batch import BatchExecutor
+from servicing.web.connection_pool import ConnectionPool
+from servicing.web.deadline import Deadline
+from servicing.web.retry import RetryPolicy
+
+LOAN_PATH = "/v1/private/loan/cac761d1-9666-4c8e-8128-f3227b9ef6fe"
+
+
+def retry_after(seconds):
+    message = Message()
+    message["Retry-After"] = str(seconds)
+    return message
+
+
+class RecordingPool:
+    def __init__(self):
+        self.timeouts = []
+
+    def urlopen(self, method, url, body=None, headers=None, *, connect_timeout=None, read_timeout=None):
+        self.timeouts.append((connect_timeout, read_timeout))
+        return 200, {}, b"{}"
+
+    def close(self):
+        pass
+
+
+class DeadlineTests(unittest.TestCase):
+    def test_cap(self):
+        deadline = Deadline(1)
+        self.assertEqual(0.5, deadline.cap(0.5))
+        self.assertLessEqual(deadline.cap(60), 1)
+        self.assertLessEqual(deadline.cap(None), 1)
+        self.assertIs(deadline, Deadline.coerce(deadline))
+        self.assertIsNone(Deadline.coerce(None))
+
+    def test_expired(self):
+        deadline = Deadline(0)
+        self.assertTrue(deadline.expired)
+        self.assertEqual(0, deadline.remaining())
+        with self.assertRaises(ServicingTimeoutError):
+            deadline.cap(1)
+
+
+class ClientDeadlineTests(unittest.TestCase):
+    def test_timeouts_are_capped_by_the_deadline(self):
+        pool = RecordingPool()
+        client = BaseClient(base_url="http://localhost:8888", pool=pool, connect_timeout=3, read_timeout=30)
+        client.api_call(method="GET", path=LOAN_PATH)
+        client.api_call(method="GET", path=LOAN_PATH, deadline=5)
+        self.assertEqual((3, 30), pool.timeouts[0])
+        self.assertEqual(3, pool.timeouts[1][0])
+        self.assertLessEqual(pool.timeouts[1][1], 5)
+
+    def test_expired_deadline_sends_nothing(self):
+        pool = RecordingPool()
+        client = BaseClient(base_url="http://localhost:8888", pool=pool)
+        with self.assertRaises(ServicingTimeoutError):
+            client.api_call(method="GET", path=LOAN_PATH, deadline=Deadline(0))
+        self.assertEqual([], pool.timeouts)
+
+    @patch("servicing.web.base_client.time.sleep")
+    def test_no_retry_past_the_deadline(self, sleep):
+        client = BaseClient(base_url="http://localhost:8888", retry_policy=RetryPolicy())
+        responses = [(503, retry_after(1), b""), (503, retry_after(10), b""), (200, {}, b"{}")]
+        with patch.object(BaseClient, "_BaseClient__perform_urllib_http_request", side_effect=responses) as send:
+            resp = client.api_call(method="GET", path=LOAN_PATH, deadline=5)
+        self.assertEqual(503, resp.status)
+        self.assertEqual(2, send.call_count)
+        sleep.assert_called_once_with(1)
+
+    def test_hung_server_times_out(self):
+        server = socket.socket()
+        server.bind(("127.0.0.1", 0))
+        server.listen(1)
+        port = server.getsockname()[1]
+        pool = ConnectionPool()
+        client = BaseClient(base_url=f"http://127.0.0.1:{port}", pool=pool)
+        try:
+            started = time.monotonic()
+            with self.assertRaises(ServicingTimeoutError):
+                client.api_call(method="GET", path=LOAN_PATH, deadline=0.2)
+            self.assertLess(time.monotonic() - started, 2)
+        finally:
+            client.close()
+            server.close()
+
+
+class BatchDeadlineTests(unittest.TestCase):
+    def test_calls_share_the_deadline(self):
+        seen = []
+
+        def call(n, deadline):
+            seen.append(deadline)
+            time.sleep(0.05)
+            return n
+
+        deadline = Deadline(0.12)
+        results = list(
+            BatchExecutor(max_workers=1).run(call, ({"n": n} for n in range(10)), deadline=deadline)
+        )
+        self.assertEqual(10, len(results))
+        self.assertTrue(all(d is deadline for d in seen))
+        self.assertLess(len(seen), 10)
+        self.assertTrue(results[0].ok)
+        self.assertIsInstance(results[-1].error, ServicingTimeoutError)
+        self.assertEqual({"n": 9}, results[-1].kwargs)
@@ -0,0 +1,42 @@
+import socket
+import unittest
+from unittest.mock import patch
+
+from servicing.errors import ServicingClientError
+from servicing.web.base_client import BaseClient
+from servicing.web.dns_cache import DnsCache
+
+
+class CountingResolver:
+    def __init__(self, address="127.0.0.1"):
+        self.address = address
+        self.calls = 0
+
+    def __call__(self, host, port, family, type):
+        self.calls += 1
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (self.address, port))]
+
+
+class DnsCacheTests(unittest.TestCase):
+    def test_lookups_are_reused_until_the_ttl(self):
+        resolver = CountingResolver()
+        cache = DnsCache(ttl=60, resolver=resolver)
+        cache.resolve("api.example.com", 443)
+        cache.resolve("api.example.com", 443)
+        self.assertEqual(1, resolver.calls)
+        with patch("servicing.web.dns_cache.time.monotonic", return_value=10 ** 9):
+            cache.resolve("api.example.com", 443)
+        self.assertEqual(2, resolver.calls)
+
+    def test_unreachable_addresses_are_forgotten(self):
+        resolver = CountingResolver()
+        cache = DnsCache(resolver=resolver)
+        with patch("servicing.web.dns_cache.socket.create_connection", side_effect=ConnectionRefusedError):
+            with self.assertRaises(ConnectionRefusedError):
+                cache.create_connection(("api.example.com", 443), 1)
+        cache.resolve("api.example.com", 443)
+        self.assertEqual(2, resolver.calls)
+
+    def test_warm_up_needs_a_pool(self):
+        with self.assertRaises(ServicingClientError):
+            BaseClient().warm_up(4)
@@ -0,0 +1,129 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from servicing.web.async_base_client import AsyncBaseClient
+from servicing.web.base_client import BaseClient
+from servicing.web.client import ServicingClient
+from servicing.web.hedging import HedgingPolicy
+
+LOAN_PATH = "/v1/private/loan/cac761d1-9666-4c8e-8128-f3227b9ef6fe"
+
+
+class HedgingPolicyTests(unittest.TestCase):
+    def test_delay_follows_the_observed_percentile(self):
+        policy = HedgingPolicy(min_samples=10)
+        self.assertIsNone(policy.hedge_delay("/a"))
+        for n in range(100):
+            policy.record("/a", n / 1000, False)
+        self.assertEqual(0.095, policy.hedge_delay("/a"))
+        self.assertIsNone(policy.hedge_delay("/b"))
+
+    def test_budget(self):
+        policy = HedgingPolicy(delay=0.01, budget=0.1)
+        hedged = 0
+        for _ in range(100):
+            policy.hedge_delay("/a")
+            hedged += policy.try_hedge()
+        self.assertEqual(10, hedged)
+
+    def test_only_gets(self):
+        policy = HedgingPolicy(endpoints={"/v1/private/loan/{id}"})
+        self.assertTrue(policy.applies("GET", "/v1/private/loan/{id}"))
+        self.assertFalse(policy.applies("POST", "/v1/private/loan/{id}"))
+        self.assertFalse(policy.applies("GET", "/v1/private/user"))
+
+
+class SlowThenFast:
+    def __init__(self):
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def response(self):
+        with self.lock:
+            self.calls += 1
+            first = self.calls == 1
+        body = b'{"copy": "first"}' if first else b'{"copy": "hedge"}'
+        return first, (200, {}, body)
+
+
+class ClientHedgingTests(unittest.TestCase):
+    def test_hedge_wins(self):
+        policy = HedgingPolicy(delay=0.02, budget=1.0)
+        client = BaseClient(base_url="http://localhost:8888", hedging_policy=policy)
+        server = SlowThenFast()
+
+        def send(method, url, body, headers, deadline):
+            first, response = server.response()
+            if first:
+                time.sleep(0.5)
+            return response
+
+        with patch.object(BaseClient, "_BaseClient__perform_urllib_http_request", side_effect=send):
+            started = time.monotonic()
+            resp = client.api_call(method="GET", path=LOAN_PATH)
+            elapsed = time.monotonic() - started
+        client.close()
+
+        self.assertEqual("hedge", resp["copy"])
+        self.assertLess(elapsed, 0.4)
+        self.assertEqual((1, 1), (policy.hedges, policy.hedge_wins))
+
+    def test_busy_hedging_threads_do_not_cap_requests_in_flight(self):
+        policy = HedgingPolicy(delay=1.0, max_workers=2)
+        client = BaseClient(base_url="http://localhost:8888", hedging_policy=policy)
+        lock = threading.Lock()
+        in_flight = [0, 0]
+
+        def send(method, url, body, headers, deadline):
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight)
+            time.sleep(0.2)
+            with lock:
+                in_flight[0] -= 1
+            return 200, {}, b"{}"
+
+        with patch.object(BaseClient, "_BaseClient__perform_urllib_http_request", side_effect=send):
+            threads = [
+                threading.Thread(target=client.api_call, kwargs={"method": "GET", "path": LOAN_PATH})
+                for _ in range(6)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        client.close()
+
+        self.assertEqual(6, in_flight[1])
+
+    def test_servicing_client_sizes_the_hedging_threads(self):
+        policy = HedgingPolicy()
+        client = ServicingClient(base_url="http://localhost:8888", max_workers=4, hedging_policy=policy)
+        client.close()
+        self.assertEqual(8, policy.max_workers)
+
+    def test_async_hedge_wins(self):
+        policy = HedgingPolicy(delay=0.02, budget=1.0)
+        client = AsyncBaseClient(base_url="http://localhost:8888", hedging_policy=policy)
+        server = SlowThenFast()
+
+        async def send(method, url, body, headers, deadline):
+            first, response = server.response()
+            if first:
+                await asyncio.sleep(5)
+            return response
+
+        loop = asyncio.new_event_loop()
+        try:
+            with patch.object(AsyncBaseClient, "_AsyncBaseClient__perform_http_request", side_effect=send):
+                resp = loop.run_until_complete(
+                    asyncio.wait_for(client.api_call(method="GET", path=LOAN_PATH), 1)
+                )
+        finally:
+            loop.close()
+
+        self.assertEqual("hedge", resp["copy"])
+        self.assertEqual(1, policy.hedge_wins)
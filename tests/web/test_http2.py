@@ -0,0 +1,83 @@
+import asyncio
+import json
+import socket
+import threading
+import unittest
+
+from servicing.errors import ServicingApiError
+from servicing.web.async_base_client import AsyncBaseClient
+from servicing.web.base_client import BaseClient
+
+try:
+    from servicing.web.http2 import Http2Transport
+    from tests.web.mock_http2_server import Http2Server
+except ImportError:  # pragma: no cover
+    Http2Server = None
+
+LOAN_PATH = "/v1/private/loan/cac761d1-9666-4c8e-8128-f3227b9ef6fe"
+
+
+@unittest.skipIf(Http2Server is None, "needs the h2 package")
+class Http2TransportTests(unittest.TestCase):
+    def setUp(self):
+        self.server = Http2Server(delay=0.05).__enter__()
+        self.transport = Http2Transport()
+        self.client = BaseClient(token="xoxb-123", base_url=self.server.url, transport=self.transport)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.__exit__()
+
+    def test_request_and_body(self):
+        resp = self.client.api_call(method="POST", path=LOAN_PATH, data={"amount": "10.00"})
+        self.assertEqual(200, resp.status)
+        self.assertEqual("POST", resp["method"])
+        self.assertEqual("Bearer xoxb-123", resp["authorization"])
+        self.assertEqual({"amount": "10.00"}, json.loads(resp["body"]))
+        self.assertEqual("application/json", resp.headers["Content-Type"])
+
+    def test_error_status(self):
+        with self.assertRaises(ServicingApiError):
+            self.client.api_call(method="GET", path="/v1/private/missing").validate()
+
+    def test_concurrent_requests_share_one_connection(self):
+        results = []
+
+        def call():
+            results.append(self.client.api_call(method="GET", path=LOAN_PATH).status)
+
+        threads = [threading.Thread(target=call) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([200] * 20, results)
+        self.assertEqual(1, self.server.connections)
+        self.assertEqual(1, self.transport.num_connections())
+
+    def test_reconnects_after_the_connection_is_lost(self):
+        self.client.api_call(method="GET", path=LOAN_PATH)
+        self.transport.close()
+        self.assertEqual(200, self.client.api_call(method="GET", path=LOAN_PATH).status)
+        self.assertEqual(2, self.server.connections)
+
+    def test_stalled_upload_times_out(self):
+        self.server.stall_uploads = True
+        with self.assertRaises(socket.timeout):
+            self.transport.send("POST", self.server.url + LOAN_PATH, b"x" * 200000, {}, read_timeout=0.2)
+        self.server.stall_uploads = False
+        self.assertEqual(200, self.client.api_call(method="GET", path=LOAN_PATH).status)
+
+    def test_async_client(self):
+        client = AsyncBaseClient(base_url=self.server.url, transport=self.transport)
+
+        async def run():
+            return await asyncio.gather(*(client.api_call(method="GET", path=LOAN_PATH) for _ in range(5)))
+
+        loop = asyncio.new_event_loop()
+        try:
+            responses = loop.run_until_complete(run())
+        finally:
+            loop.close()
+        self.assertEqual([LOAN_PATH] * 5, [r["path"] for r in responses])
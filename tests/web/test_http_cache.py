@@ -0,0 +1,75 @@
+import unittest
+from email.message import Message
+from unittest.mock import patch
+
+from servicing.web.base_client import BaseClient
+from servicing.web.http_cache import HttpCache
+
+LOAN_PATH = "/v1/private/loan/cac761d1-9666-4c8e-8128-f3227b9ef6fe"
+
+
+def headers(**values):
+    message = Message()
+    for k, v in values.items():
+        message[k.replace("_", "-")] = v
+    return message
+
+
+class HttpCacheTests(unittest.TestCase):
+    def test_revalidates_with_validators(self):
+        cache = HttpCache()
+        request_headers = {"Authorization": "Bearer 1234"}
+        entry, fresh = cache.before_request("https://host/a", request_headers, "/a")
+        self.assertIsNone(entry)
+        cache.after_response("https://host/a", request_headers, entry, 200, headers(ETag='"v1"'), b"{}")
+
+        request_headers = {"Authorization": "Bearer 1234"}
+        entry, fresh = cache.before_request("https://host/a", request_headers, "/a")
+        self.assertFalse(fresh)
+        self.assertEqual('"v1"', request_headers["If-None-Match"])
+
+        status, _, body = cache.after_response("https://host/a", request_headers, entry, 304, headers(), b"")
+        self.assertEqual((200, b"{}"), (status, body))
+        self.assertEqual(1, cache.revalidations)
+
+    def test_entries_are_per_token(self):
+        cache = HttpCache()
+        cache.after_response("https://host/a", {"Authorization": "Bearer a"}, None, 200, headers(ETag="1"), b"{}")
+        self.assertEqual((None, False), cache.before_request("https://host/a", {"Authorization": "Bearer b"}, "/a"))
+
+    def test_ttl_overrides(self):
+        cache = HttpCache(ttl_overrides={"/a": 60})
+        cache.after_response("https://host/a", {}, None, 200, headers(Last_Modified="x"), b"{}")
+        entry, fresh = cache.before_request("https://host/a", {}, "/a")
+        self.assertTrue(fresh)
+        entry, fresh = cache.before_request("https://host/a", {}, "/b")
+        self.assertFalse(fresh)
+
+    def test_size_based_lru_eviction(self):
+        cache = HttpCache(max_bytes=10)
+        for name in "abc":
+            cache.after_response(f"https://host/{name}", {}, None, 200, headers(ETag=name), b"1234")
+        self.assertEqual(2, len(cache))
+        self.assertEqual(8, cache.size)
+        self.assertEqual((None, False), cache.before_request("https://host/a", {}, "/a"))
+
+    def test_only_validated_responses_are_stored(self):
+        cache = HttpCache()
+        cache.after_response("https://host/a", {}, None, 200, headers(), b"{}")
+        cache.after_response("https://host/b", {}, None, 200, headers(ETag="1", Cache_Control="no-store"), b"{}")
+        cache.after_response("https://host/c", {}, None, 500, headers(ETag="1"), b"{}")
+        self.assertEqual(0, len(cache))
+
+
+class BaseClientHttpCacheTests(unittest.TestCase):
+    def test_serves_not_modified_from_cache(self):
+        client = BaseClient(base_url="http://localhost:8888", http_cache=HttpCache())
+        responses = [(200, headers(ETag='"v1"'), b'{"loan_id": "1"}'), (304, headers(ETag='"v1"'), b"")]
+        with patch.object(BaseClient, "_BaseClient__perform_urllib_http_request", side_effect=responses) as send:
+            first = client.api_call(method="GET", path=LOAN_PATH)
+            second = client.api_call(method="GET", path=LOAN_PATH)
+
+        self.assertEqual(200, second.status)
+        self.assertEqual(first.data, second.data)
+        request_headers = send.call_args[0][3]
+        self.assertEqual('"v1"', request_headers["If-None-Match"])
@@ -0,0 +1,55 @@
+import json
+import unittest
+
+from servicing.errors import ServicingClientError
+from servicing.web.json_stream import JsonArrayParser
+
+
+class JsonArrayParserTests(unittest.TestCase):
+    def parse(self, body: bytes, chunk_size: int):
+        parser = JsonArrayParser()
+        items = []
+        for i in range(0, len(body), chunk_size):
+            items.extend(parser.feed(body[i:i + chunk_size]))
+        parser.close()
+        return items
+
+    def test_yields_each_element(self):
+        expected = [{"loan_id": i, "name": "Café [1], {2}"} for i in range(20)] + [12345, "x", None]
+        body = json.dumps(expected, ensure_ascii=False).encode("utf-8")
+        for chunk_size in (1, 2, 7, 64, len(body)):
+            self.assertEqual(expected, self.parse(body, chunk_size))
+
+    def test_tokens_split_anywhere(self):
+        expected = [True, False, None, -1.5e-3, 10.25, "\u00e9\U0001f600", {"a": [float("inf"), -12]}]
+        body = json.dumps(expected).encode("utf-8")
+        for chunk_size in (1, 2, 3, 5):
+            self.assertEqual(expected, self.parse(body, chunk_size))
+
+    def test_malformed_element_is_reported_at_once(self):
+        for body in (b'[{"a": 1} {"b": 2}', b'[{"a" 1}, ', b'[tru, 1', b'["\\x", ', b'[{"a": 1, "b" x'):
+            parser = JsonArrayParser()
+            with self.assertRaises(ServicingClientError):
+                parser.feed(body)
+
+    def test_element_size_is_capped(self):
+        parser = JsonArrayParser(max_element_size=100)
+        self.assertEqual(["x" * 90], parser.feed(b'["' + b"x" * 90 + b'", '))
+        with self.assertRaisesRegex(ServicingClientError, "exceeds 100 characters"):
+            parser.feed(b'"' + b"y" * 120)
+
+    def test_empty_array(self):
+        self.assertEqual([], self.parse(b" [ ] ", 1))
+
+    def test_elements_are_returned_before_the_array_ends(self):
+        parser = JsonArrayParser()
+        self.assertEqual([{"a": 1}], parser.feed(b'[{"a": 1}, {"a"'))
+        self.assertEqual([{"a": 2}], parser.feed(b': 2}]'))
+
+    def test_truncated_body(self):
+        with self.assertRaises(ServicingClientError):
+            self.parse(b'[{"a": 1}, {"a"', 4)
+
+    def test_not_an_array(self):
+        with self.assertRaises(ServicingClientError):
+            self.parse(b'{"a": 1}', 4)
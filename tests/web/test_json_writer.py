@@ -0,0 +1,76 @@
+import unittest
+from decimal import Decimal
+from uuid import UUID
+
+from servicing.errors import ServicingObjectFormationError
+from servicing.web.classes.enums import BenchmarkName, Compounding, DayCount, Frequency
+from servicing.web.classes.institution import Address, Institution
+from servicing.web.classes.loan import FixedPayment, Loan, Periods
+from servicing.web.classes.money import Money
+from servicing.web.codec import StdlibJsonCodec
+from servicing.web.json_writer import JsonWriter
+
+LOAN_ID = UUID("cac761d1-9666-4c8e-8128-f3227b9ef6fe")
+
+
+def loan():
+    return Loan(agent_id=LOAN_ID, borrower_id=LOAN_ID, lender_id=LOAN_ID, annual_rate=0.0475,
+                benchmark=BenchmarkName.LIBOR_1_MONTH, commitment=Money(Decimal("1000000.00")),
+                compounding=Compounding.SIMPLE, day_count=DayCount.ACTUAL_360,
+                fixed_payment=FixedPayment(amount=Money("10000")), max_num_draws=3,
+                origination_date="2020-05-27", periods=Periods(count=120, frequency=Frequency.MONTHLY),
+                time_zone_id="America/New_York")
+
+
+class JsonWriterTests(unittest.TestCase):
+    def setUp(self):
+        self.writer = JsonWriter()
+        self.codec = StdlibJsonCodec()
+
+    def assert_same_bytes(self, value, data):
+        self.assertEqual(self.codec.dumps(data), self.writer.dumps(value))
+
+    def test_models_match_the_stdlib_codec(self):
+        institution = Institution(name="Café \"Crédit\" \U0001f4b0\n",
+                                  address=Address(street_one="1 Main", street_two="", city="NY", state="NY", zip="1"))
+        for obj in (loan(), institution, Money("5000.00")):
+            self.assert_same_bytes(obj, obj.to_dict())
+            self.assertEqual(self.codec.dumps(obj.to_dict()), obj.to_json())
+
+    def test_values_match_the_stdlib_codec(self):
+        data = {
+            "ints": [0, -1, 10 ** 30, True, False, None],
+            "floats": [0.1, 1e-07, 1e22, -0.0, float("nan"), float("inf"), float("-inf")],
+            "ids": (LOAN_ID, Decimal("1.10")),
+            1: {},
+            2.5: [],
+            None: "",
+            False: {"nested": [Money("1")]},
+        }
+        expected = dict(data, **{"ids": [str(LOAN_ID), "1.10"]})
+        expected[False] = {"nested": [Money("1").to_dict()]}
+        self.assert_same_bytes(data, expected)
+
+    def test_write_appends_to_a_buffer(self):
+        out = bytearray(b"[")
+        self.writer.write(Money("1"), out)
+        out += b", "
+        self.writer.write(Money("2"), out)
+        out += b"]"
+        self.assertEqual(self.codec.dumps([Money("1").to_dict(), Money("2").to_dict()]), bytes(out))
+
+    def test_errors(self):
+        with self.assertRaises(ServicingObjectFormationError):
+            self.writer.dumps(FixedPayment(amount=None))
+        with self.assertRaises(TypeError):
+            self.writer.dumps({"a": object()})
+        with self.assertRaises(TypeError):
+            self.writer.dumps({(1, 2): 1})
+
+    def test_cached_bytes_follow_assignments(self):
+        obj = loan()
+        body = obj.to_json()
+        self.assertIs(body, obj.to_json())
+        obj.periods.count = 60
+        self.assertEqual(self.codec.dumps(obj.to_dict()), obj.to_json())
+        self.assertIn(b'"count": 60', obj.to_json())
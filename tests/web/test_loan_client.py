@@ -64,3 +64,12 @@ class LoanClientTests(unittest.TestCase):
 
         _, kwargs = self.base_client.api_call.call_args
         self.assertEqual(kwargs["query_params"], {"type": TrackerType.DAILY_INTEREST_ACCRUAL.value})
+
+    def test_get_with_deadline(self):
+        loan_id = uuid4()
+
+        self.loan_client.get(loan_id=loan_id, deadline=5)
+        self.assertTrue(self.base_client.api_call.called)
+
+        _, kwargs = self.base_client.api_call.call_args
+        self.assertEqual(kwargs["deadline"], 5)
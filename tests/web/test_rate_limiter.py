@@ -0,0 +1,72 @@
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from servicing.errors import ServicingCircuitOpenError, ServicingTimeoutError
+from servicing.util import path_template
+from servicing.web.base_client import BaseClient
+from servicing.web.circuit_breaker import CircuitBreaker
+from servicing.web.deadline import Deadline
+from servicing.web.rate_limiter import RateLimiter, SharedTokenBucket, TokenBucket
+
+LOAN_PATH = "/v1/private/loan/cac761d1-9666-4c8e-8128-f3227b9ef6fe"
+
+
+class TokenBucketTests(unittest.TestCase):
+    def test_waits_instead_of_rejecting(self):
+        bucket = TokenBucket(rate=10, capacity=2)
+        self.assertEqual(0, bucket.reserve())
+        self.assertEqual(0, bucket.reserve())
+        self.assertAlmostEqual(0.1, bucket.reserve(), delta=0.01)
+        self.assertAlmostEqual(0.2, bucket.reserve(), delta=0.01)
+
+    def test_shared_bucket_is_shared_through_the_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = f"{directory}/client.bucket"
+            first = SharedTokenBucket(path, rate=10, capacity=1)
+            second = SharedTokenBucket(path, rate=10, capacity=1)
+            self.assertEqual(0, first.reserve())
+            self.assertAlmostEqual(0.1, second.reserve(), delta=0.01)
+            first.close()
+            second.close()
+
+
+class RateLimiterTests(unittest.TestCase):
+    def test_endpoint_limits(self):
+        limiter = RateLimiter(endpoints={"/a/{id}": (1, 1)})
+        self.assertEqual(0, limiter.reserve("/a/{id}"))
+        self.assertAlmostEqual(1, limiter.reserve("/a/{id}"), delta=0.01)
+        self.assertEqual(0, limiter.reserve("/b"))
+
+    def test_fails_fast_when_the_wait_outlasts_the_deadline(self):
+        limiter = RateLimiter((1, 1))
+        limiter.reserve("/a")
+        with patch("servicing.web.rate_limiter.time.sleep") as sleep:
+            with self.assertRaises(ServicingTimeoutError):
+                limiter.acquire("/a", Deadline(0.5))
+        sleep.assert_not_called()
+        # The refused request did not keep its token
+        self.assertAlmostEqual(1, limiter.reserve("/a", Deadline(5)), delta=0.01)
+
+    def test_client_waits_for_a_token(self):
+        client = BaseClient(base_url="http://localhost:8888", rate_limiter=RateLimiter((10, 1)))
+        with patch.object(BaseClient, "_BaseClient__perform_urllib_http_request", return_value=(200, {}, b"{}")), \
+                patch("servicing.web.rate_limiter.time.sleep") as sleep:
+            client.api_call(method="GET", path=LOAN_PATH)
+            client.api_call(method="GET", path=LOAN_PATH)
+        self.assertEqual(1, sleep.call_count)
+        self.assertAlmostEqual(0.1, sleep.call_args[0][0], delta=0.01)
+
+    def test_open_circuit_refuses_before_taking_a_token(self):
+        breaker = CircuitBreaker(failure_threshold=1)
+        limiter = RateLimiter((2, 1))
+        client = BaseClient(base_url="http://localhost:8888", rate_limiter=limiter, circuit_breaker=breaker)
+        with patch.object(BaseClient, "_BaseClient__perform_urllib_http_request", return_value=(503, {}, b"")), \
+                patch("servicing.web.rate_limiter.time.sleep") as sleep:
+            client.api_call(method="GET", path=LOAN_PATH)
+            sleep.reset_mock()
+            for _ in range(4):
+                with self.assertRaises(ServicingCircuitOpenError):
+                    client.api_call(method="GET", path=LOAN_PATH)
+        sleep.assert_not_called()
+        self.assertAlmostEqual(0.5, limiter.reserve(path_template(LOAN_PATH)), delta=0.01)
@@ -0,0 +1,114 @@
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+from datetime import date
+from unittest.mock import patch
+
+from servicing.web.async_client import AsyncServicingClient
+from servicing.web.base_client import BaseClient
+from servicing.web.classes.enums import BenchmarkName
+from servicing.web.client import ServicingClient
+from servicing.web.reference_cache import ReferenceCache
+from servicing.web.transport import InMemoryTransport
+
+BASE_URL = "http://localhost:8888/"
+SOFR_URL = BASE_URL + "v1/public/benchmark/SOFR/2020-06-01"
+TODAY = date(2020, 6, 10)
+
+
+class ReferenceCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "reference.sqlite3")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def cache(self, **kwargs):
+        cache = ReferenceCache(self.path, today=lambda: TODAY, **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_past_dates_are_shared_through_the_file(self):
+        self.assertTrue(self.cache().put(SOFR_URL, 200, {"X": "1"}, b'{"rate": 1}'))
+
+        other = self.cache()
+        self.assertIn(SOFR_URL, other)
+        status, headers, body = other.get(SOFR_URL)
+        self.assertEqual((200, b'{"rate": 1}'), (status, body))
+        self.assertEqual("1", headers["x"])
+
+    def test_today_and_future_dates_need_a_ttl(self):
+        cache = self.cache()
+        today = BASE_URL + "v1/public/finance/next-business-day/2020-06-10"
+        future = BASE_URL + "v1/public/finance/next-business-day/2020-06-11"
+        self.assertFalse(cache.put(today, 200, {}, b"{}"))
+        self.assertFalse(cache.put(future, 200, {}, b"{}"))
+
+        cache = self.cache(today_ttl=60, future_ttl=0)
+        self.assertTrue(cache.put(today, 200, {}, b"{}"))
+        self.assertTrue(cache.put(future, 200, {}, b"{}"))
+        self.assertIsNotNone(cache.get(today))
+        self.assertIsNone(cache.get(future))
+
+    def test_only_reference_urls_and_statuses(self):
+        cache = self.cache()
+        self.assertFalse(cache.put(BASE_URL + "v1/public/status", 200, {}, b"{}"))
+        self.assertFalse(cache.put(SOFR_URL + "?x=1", 200, {}, b"{}"))
+        self.assertFalse(cache.put(SOFR_URL, 404, {}, b"{}"))
+        self.assertTrue(self.cache(statuses=(200, 404)).put(SOFR_URL, 404, {}, b"{}"))
+
+    def test_client_serves_cached_lookups(self):
+        client = ServicingClient(base_url=BASE_URL, reference_cache=self.cache())
+        response = (200, {}, b'{"rate": "0.01"}')
+        with patch.object(
+            BaseClient, "_BaseClient__perform_urllib_http_request", return_value=response
+        ) as send:
+            for _ in range(3):
+                rate = client.get_benchmark_rate(
+                    benchmark_name=BenchmarkName.SOFR, date="2020-06-01"
+                )
+                self.assertEqual("0.01", rate["rate"])
+        self.assertEqual(1, send.call_count)
+
+    def test_async_client_reads_the_database_off_the_event_loop(self):
+        self.cache().put(SOFR_URL, 200, {"Content-Type": "application/json"}, b'{"rate": "0.01"}')
+        cache = self.cache()
+        db, threads = cache._db, []
+
+        def recording_db():
+            threads.append(threading.current_thread())
+            return db()
+
+        cache._db = recording_db
+        transport = InMemoryTransport()
+        client = AsyncServicingClient(base_url=BASE_URL, reference_cache=cache, transport=transport)
+        loop = asyncio.new_event_loop()
+        try:
+            rate = loop.run_until_complete(
+                client.get_benchmark_rate(benchmark_name=BenchmarkName.SOFR, date="2020-06-01")
+            )
+        finally:
+            loop.close()
+        self.assertEqual("0.01", rate["rate"])
+        self.assertEqual("application/json", rate.headers["content-type"])
+        self.assertEqual(0, transport.requests)
+        self.assertTrue(threads)
+        self.assertNotIn(threading.current_thread(), threads)
+
+    def test_warm_reference_cache(self):
+        client = ServicingClient(base_url=BASE_URL, reference_cache=self.cache())
+        response = (200, {}, b'{"date": "2020-06-01"}')
+        with patch.object(
+            BaseClient, "_BaseClient__perform_urllib_http_request", return_value=response
+        ) as send:
+            kwargs = dict(
+                start=date(2020, 6, 1),
+                end=date(2020, 6, 2),
+                benchmark_names=[BenchmarkName.SOFR, BenchmarkName.PRIME],
+            )
+            self.assertEqual(8, client.warm_reference_cache(**kwargs))
+            self.assertEqual(8, client.warm_reference_cache(**kwargs))
+        self.assertEqual(8, send.call_count)
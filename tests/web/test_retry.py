@@ -0,0 +1,85 @@
+import time
+import unittest
+from email.message import Message
+from unittest.mock import patch
+
+from servicing.web.base_client import BaseClient
+from servicing.web.retry import RetryPolicy
+
+
+def headers(**values):
+    message = Message()
+    for k, v in values.items():
+        message[k.replace("_", "-")] = v
+    return message
+
+
+class RetryPolicyTests(unittest.TestCase):
+    def test_safe_methods_are_retried_by_default(self):
+        policy = RetryPolicy()
+        self.assertTrue(policy.allows("GET"))
+        self.assertFalse(policy.allows("POST"))
+        self.assertTrue(policy.allows("POST", idempotent=True))
+        self.assertFalse(policy.allows("GET", idempotent=False))
+
+    def test_full_jitter_backoff_is_capped(self):
+        policy = RetryPolicy(backoff_base=1, backoff_max=4)
+        for attempt in range(10):
+            self.assertLessEqual(policy.backoff(attempt), min(4, 2 ** attempt))
+
+    def test_retry_after_takes_precedence(self):
+        policy = RetryPolicy()
+        self.assertEqual(7, policy.delay_after_status(429, headers(Retry_After="7"), 0, time.monotonic()))
+
+    def test_retry_after_http_date(self):
+        self.assertEqual(0, RetryPolicy.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"))
+
+    def test_per_status_rules(self):
+        policy = RetryPolicy(statuses={503: 1})
+        self.assertIsNotNone(policy.delay_after_status(503, headers(), 0, time.monotonic()))
+        self.assertIsNone(policy.delay_after_status(503, headers(), 1, time.monotonic()))
+        self.assertIsNone(policy.delay_after_status(500, headers(), 0, time.monotonic()))
+
+    def test_per_exception_rules(self):
+        policy = RetryPolicy(exceptions={ConnectionError: 2, ConnectionRefusedError: 0})
+        self.assertIsNotNone(policy.delay_after_error(ConnectionResetError(), 1, time.monotonic()))
+        self.assertIsNone(policy.delay_after_error(ConnectionRefusedError(), 0, time.monotonic()))
+        self.assertIsNone(policy.delay_after_error(ValueError(), 0, time.monotonic()))
+
+    def test_total_budget(self):
+        policy = RetryPolicy(max_total_time=5)
+        self.assertIsNone(policy.delay_after_status(503, headers(Retry_After="10"), 0, time.monotonic()))
+
+
+@patch("servicing.web.base_client.time.sleep")
+class BaseClientRetryTests(unittest.TestCase):
+    def setUp(self):
+        self.client = BaseClient(base_url="http://localhost:8888", retry_policy=RetryPolicy())
+
+    def send(self, *responses):
+        return patch.object(
+            BaseClient, "_BaseClient__perform_urllib_http_request", side_effect=list(responses)
+        )
+
+    def test_retries_get_until_success(self, sleep):
+        with self.send((503, headers(), b""), ConnectionResetError(), (200, headers(), b'{"ok": true}')) as send:
+            resp = self.client.api_call(method="GET", path="/v1/public/status")
+        self.assertEqual(200, resp.status)
+        self.assertEqual(3, send.call_count)
+        self.assertEqual(2, sleep.call_count)
+
+    def test_returns_last_response_when_retries_are_exhausted(self, sleep):
+        with self.send(*[(503, headers(), b"")] * 4) as send:
+            resp = self.client.api_call(method="GET", path="/v1/public/status")
+        self.assertEqual(503, resp.status)
+        self.assertEqual(4, send.call_count)
+
+    def test_post_is_not_retried_unless_idempotent(self, sleep):
+        with self.send((503, headers(), b""), (200, headers(), b"")) as send:
+            resp = self.client.api_call(method="POST", path="/v1/private/loan")
+        self.assertEqual(503, resp.status)
+        self.assertEqual(1, send.call_count)
+
+        with self.send((503, headers(), b""), (200, headers(), b"")) as send:
+            resp = self.client.api_call(method="POST", path="/v1/private/loan", idempotent=True)
+        self.assertEqual(200, resp.status)
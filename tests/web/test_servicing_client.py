@@ -1,5 +1,6 @@
 import re
 import unittest
+from uuid import uuid4
 
 from servicing import ServicingClient
 from tests.web.mock_servicing_api_server import setup_mock_servicing_api_server, cleanup_mock_servicing_api_server
@@ -35,3 +36,9 @@ class ServicingClientTests(unittest.TestCase):
         resp = self.client.login(email="support@loan-street.com", password="not-a-valid-password")
         self.assertEqual(200, resp.status)
         self.assertGreater(len(resp['token']), 0)
+
+    def test_iter_loans(self):
+        self.client.token = "loans"
+        loans = list(self.client.institution.iter_loans(institution_id=uuid4()))
+        self.assertEqual(2, len(loans))
+        self.assertEqual("01bf113e-4648-4859-8a2a-42bebb411a83", loans[1]["loan_id"])
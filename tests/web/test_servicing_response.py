@@ -25,4 +25,28 @@ class TestServicingResponse(unittest.TestCase):
         self.assertTrue(response.status == 200)
         self.assertTrue("status" in response.data)
         self.assertTrue(response["status"] == "OK")
-        self.assertTrue(response.get("status") == "OK")
\ No newline at end of file
+        self.assertTrue(response.get("status") == "OK")
+
+
+class TestLazyServicingResponse(unittest.TestCase):
+    def test_body_is_parsed_on_first_access(self):
+        response = ServicingResponse(
+            method="GET",
+            url="https://localhost:8443/v1/public/status",
+            headers={},
+            status=200,
+            body=b'{"status": "OK"}',
+        )
+
+        self.assertEqual(b'{"status": "OK"}', response.body)
+        self.assertIs(response.validate(), response)
+        self.assertEqual("OK", response["status"])
+        self.assertIs(response.data, response.data)
+
+    def test_empty_body(self):
+        response = ServicingResponse(method="GET", url="/", headers={}, status=204, body=b"")
+        self.assertIsNone(response.data)
+
+    def test_has_no_instance_dict(self):
+        response = ServicingResponse(method="GET", url="/", headers={}, status=204, body=b"")
+        self.assertFalse(hasattr(response, "__dict__"))
@@ -0,0 +1,97 @@
+import asyncio
+import json
+import unittest
+from uuid import uuid4
+
+from servicing.errors import ServicingClientError
+from servicing.web.async_base_client import AsyncBaseClient
+from servicing.web.base_client import BaseClient
+from servicing.web.client import ServicingClient
+from servicing.web.connection_pool import ConnectionPool
+from servicing.web.transport import InMemoryTransport, PooledTransport, Transport, UrllibTransport
+from tests.web.mock_servicing_api_server import cleanup_mock_servicing_api_server, setup_mock_servicing_api_server
+
+LOAN_PATH = "/v1/private/loan/cac761d1-9666-4c8e-8128-f3227b9ef6fe"
+
+
+class NetworkTransportTests(unittest.TestCase):
+    def setUp(self):
+        setup_mock_servicing_api_server(self)
+
+    def tearDown(self):
+        cleanup_mock_servicing_api_server(self)
+
+    def test_error_statuses_are_returned(self):
+        for transport in (UrllibTransport(), PooledTransport(ConnectionPool())):
+            status, headers, body = transport.send("GET", f"{self.server_url}/v1/private/user", None, {})
+            transport.close()
+            self.assertEqual(401, status)
+            self.assertEqual("application/json", headers["Content-Type"])
+
+    def test_streamed_error_statuses_are_returned(self):
+        for transport in (UrllibTransport(), PooledTransport(ConnectionPool())):
+            status, headers, body = transport.open("GET", f"{self.server_url}/v1/private/user", None, {})
+            body.read()
+            body.close()
+            transport.close()
+            self.assertEqual(401, status)
+
+    def test_default_transports(self):
+        self.assertIsInstance(BaseClient().transport, UrllibTransport)
+        self.assertIsInstance(ServicingClient().transport, PooledTransport)
+
+
+class InMemoryTransportTests(unittest.TestCase):
+    def test_static_response(self):
+        transport = InMemoryTransport(body=b'{"loan_id": "1"}', headers={"content-type": "application/json"})
+        client = BaseClient(base_url="http://localhost:8888", transport=transport)
+        resp = client.api_call(method="GET", path=LOAN_PATH)
+        self.assertEqual("1", resp["loan_id"])
+        self.assertEqual("application/json", resp.headers["Content-Type"])
+        self.assertEqual(1, transport.requests)
+
+    def test_handler(self):
+        def echo(method, url, body, headers):
+            return 201, {}, json.dumps({"method": method, "url": url, "body": json.loads(body)}).encode()
+
+        client = ServicingClient(base_url="http://localhost:8888", transport=InMemoryTransport(echo))
+        resp = client.api_call(method="POST", path="/v1/private/loan", data={"amount": "1.00"})
+        self.assertEqual(201, resp.status)
+        self.assertEqual({"method": "POST", "url": "http://localhost:8888/v1/private/loan",
+                          "body": {"amount": "1.00"}}, resp.data)
+
+    def test_many_calls_from_many_threads(self):
+        transport = InMemoryTransport()
+        client = ServicingClient(transport=transport, max_workers=8)
+        results = list(client.batch(client.loan.get, ({"loan_id": uuid4()} for _ in range(2000))))
+        self.assertTrue(all(r.ok for r in results))
+        self.assertEqual(2000, transport.requests)
+
+    def test_streams_go_through_the_transport(self):
+        transport = InMemoryTransport(body=b'[{"n": 1}, {"n": 2}]')
+        client = BaseClient(base_url="http://localhost:8888", transport=transport)
+        self.assertEqual([{"n": 1}, {"n": 2}], list(client.api_stream(path=LOAN_PATH, chunk_size=4)))
+
+        async_client = AsyncBaseClient(base_url="http://localhost:8888", transport=transport)
+
+        async def run():
+            return [item async for item in async_client.api_stream(path=LOAN_PATH, chunk_size=4)]
+
+        loop = asyncio.new_event_loop()
+        try:
+            self.assertEqual([{"n": 1}, {"n": 2}], loop.run_until_complete(run()))
+        finally:
+            loop.close()
+        self.assertEqual(2, transport.requests)
+
+
+class SendOnlyTransport(Transport):
+    def send(self, method, url, body, headers, *, connect_timeout=None, read_timeout=None):
+        return 200, {}, b"[]"
+
+
+class TransportTests(unittest.TestCase):
+    def test_transports_that_cannot_stream_say_so(self):
+        client = BaseClient(base_url="http://localhost:8888", transport=SendOnlyTransport())
+        with self.assertRaisesRegex(ServicingClientError, "SendOnlyTransport cannot stream"):
+            list(client.api_stream(path=LOAN_PATH))